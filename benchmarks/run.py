@@ -0,0 +1,319 @@
+"""
+目录扫描的基准测试
+
+在单独的进程中启动模拟服务器，用 dirsearchX 的 Fuzzer 扫描每个场景，统计请求速率、
+延迟、CPU 时间、内存峰值以及误报和漏报数量。结果可以保存为 JSON，与之前版本的结果比较：
+
+    python -m benchmarks.run -o new.json --baseline old.json
+
+`--` 之后的参数原样传给 dirsearchX，例如：
+
+    python -m benchmarks.run -s soft-404 -- --engine async -t 50
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from optparse import OptionParser
+from urllib.parse import unquote
+
+try:
+    import resource
+except ImportError:
+    # Windows 没有 resource 模块，不统计内存峰值
+    resource = None
+
+from benchmarks.server import SCENARIOS, is_existing, serve
+from lib.connection.requester import AsyncRequester, HTTP2Requester, Requester
+from lib.core.data import blacklists, options
+from lib.core.dictionary import Dictionary, get_blacklists
+from lib.core.fuzzer import AsyncFuzzer, Fuzzer
+from lib.core.settings import DEFAULT_HEADERS, SCRIPT_PATH, VERSION
+
+# 每个场景扫描的最长时间（单位：秒）
+SCAN_TIMEOUT = 600
+
+
+def percentile(values, q):
+    """
+    计算已排序列表的分位数
+
+    Args:
+        values (list): 已排序的数值
+        q (float): 0 到 1 之间的分位
+
+    Returns:
+        float: 分位数，列表为空时返回 0
+    """
+    if not values:
+        return 0
+
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+def get_peak_rss():
+    """
+    获取当前进程的内存峰值
+
+    Returns:
+        float: 内存峰值（MB），无法获取时返回 None
+    """
+    if not resource:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 的单位是 KB，macOS 是字节
+    return round(peak / 1024 ** (2 if sys.platform == "darwin" else 1), 1)
+
+
+def scan(url, arguments, result_queue):
+    """
+    在单独的进程中扫描一个场景，把统计结果放入 result_queue
+
+    Args:
+        url (str): 模拟服务器地址
+        arguments (list): 传给 dirsearchX 的命令行参数
+        result_queue (multiprocessing.Queue): 用于发回结果
+    """
+    from lib.core.options import parse_options
+
+    sys.argv = ["dirsearchX.py", "-u", url, *arguments]
+    options.update(parse_options())
+    options["headers"] = {**DEFAULT_HEADERS, **options["headers"]}
+    blacklists.update(get_blacklists())
+
+    paths = list(Dictionary(files=options["wordlists"]))
+    latencies = []
+    found = []
+    errors = []
+
+    def on_match(response):
+        latencies.append(response.elapsed)
+        found.append(response.full_path)
+
+    def on_not_found(response):
+        latencies.append(response.elapsed)
+
+    callbacks = {
+        "match_callbacks": (on_match,),
+        "not_found_callbacks": (on_not_found,),
+        "error_callbacks": (errors.append,),
+    }
+    start_time = time.perf_counter()
+    start_cpu = time.process_time()
+
+    if options["engine"] == "async":
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        requester = AsyncRequester()
+        requester.set_url(url)
+        fuzzer = AsyncFuzzer(requester, Dictionary(files=options["wordlists"]), **callbacks)
+        fuzzer.set_base_path("")
+        loop.run_until_complete(fuzzer.start())
+        loop.run_until_complete(requester.close())
+        loop.close()
+    else:
+        requester = HTTP2Requester() if options["http2"] else Requester()
+        requester.set_url(url)
+        fuzzer = Fuzzer(requester, Dictionary(files=options["wordlists"]), **callbacks)
+        fuzzer.set_base_path("")
+        fuzzer.start()
+        fuzzer.wait()
+
+    duration = time.perf_counter() - start_time
+    cpu_time = time.process_time() - start_cpu
+    expected = {path for path in paths if is_existing(path)}
+    found = {unquote(path) for path in found}
+    latencies.sort()
+
+    result_queue.put({
+        "engine": options["engine"],
+        "threads": options["thread_count"],
+        "paths": len(paths),
+        "responses": len(latencies),
+        "errors": len(errors),
+        "duration": round(duration, 3),
+        "requests_per_second": round(len(latencies) / duration, 1),
+        "latency_p50_ms": round(percentile(latencies, 0.5) * 1000, 2),
+        "latency_p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "cpu_time": round(cpu_time, 3),
+        "peak_rss_mb": get_peak_rss(),
+        "false_positives": len(found - expected),
+        "false_negatives": len(expected - found),
+    })
+
+
+def run_scenario(scenario, settings, arguments):
+    """
+    启动模拟服务器并扫描一个场景
+
+    Args:
+        scenario (str): 场景名称
+        settings (dict): 模拟服务器的参数
+        arguments (list): 传给 dirsearchX 的命令行参数
+
+    Returns:
+        dict: 统计结果
+    """
+    address_queue = multiprocessing.Queue()
+    result_queue = multiprocessing.Queue()
+    counters = multiprocessing.Array("q", 2)
+    server = multiprocessing.Process(
+        target=serve, args=(scenario, settings, address_queue, counters), daemon=True
+    )
+    server.start()
+
+    try:
+        url = address_queue.get(timeout=10)
+        scanner = multiprocessing.Process(target=scan, args=(url, arguments, result_queue))
+        scanner.start()
+
+        try:
+            result = result_queue.get(timeout=SCAN_TIMEOUT)
+        finally:
+            scanner.join(10)
+
+            if scanner.is_alive():
+                scanner.terminate()
+
+    finally:
+        server.terminate()
+        server.join()
+
+    return {
+        "scenario": scenario,
+        **result,
+        "server_requests": counters[0],
+        "throttled": counters[1],
+    }
+
+
+def print_results(results, baseline=None):
+    """
+    打印结果表格，提供了之前的结果时显示请求速率和 p99 延迟的变化
+
+    Args:
+        results (list): 本次的结果
+        baseline (dict): 之前保存的 JSON 结果
+    """
+    previous = {
+        (result["scenario"], result["engine"]): result
+        for result in (baseline or {}).get("results", [])
+    }
+    columns = (
+        "scenario", "requests_per_second", "latency_p50_ms", "latency_p99_ms",
+        "cpu_time", "peak_rss_mb", "false_positives", "false_negatives", "throttled",
+    )
+    widths = [max(len(column), 10) for column in columns]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+
+    for result in results:
+        line = "  ".join(
+            str(result[column]).ljust(width) for column, width in zip(columns, widths)
+        )
+        old = previous.get((result["scenario"], result["engine"]))
+
+        if old:
+            for column in ("requests_per_second", "latency_p99_ms"):
+                if old[column]:
+                    change = (result[column] - old[column]) / old[column] * 100
+                    line += f"  {column}: {change:+.1f}%"
+
+        print(line)
+
+
+def main():
+    parser = OptionParser(usage="python -m benchmarks.run [选项] [-- dirsearchX 参数]")
+    parser.add_option(
+        "-s",
+        "--scenarios",
+        dest="scenarios",
+        default=",".join(SCENARIOS),
+        help=f"要运行的场景，以逗号分隔(可用: {', '.join(SCENARIOS)})",
+    )
+    parser.add_option(
+        "-w",
+        "--wordlist",
+        dest="wordlist",
+        default=os.path.join(SCRIPT_PATH, "db", "simple_dicc.txt"),
+        help="字典文件，默认为 db/simple_dicc.txt",
+    )
+    parser.add_option(
+        "--limit", dest="limit", type="int", default=0, help="只使用字典的前 N 行"
+    )
+    parser.add_option(
+        "--delay", dest="delay", type="float", default=0.05, help="slow 场景的响应延迟(秒)"
+    )
+    parser.add_option(
+        "--body-size",
+        dest="body_size",
+        type="int",
+        default=512 * 1024,
+        help="large-body 场景的响应体大小(字节)",
+    )
+    parser.add_option(
+        "--rate-limit",
+        dest="rate_limit",
+        type="int",
+        default=100,
+        help="throttle 场景每秒允许的请求数",
+    )
+    parser.add_option("-o", "--output", dest="output", help="把结果保存为 JSON 文件")
+    parser.add_option("--baseline", dest="baseline", help="与之前保存的 JSON 结果比较")
+    opt, arguments = parser.parse_args()
+
+    scenarios = [scenario.strip() for scenario in opt.scenarios.split(",")]
+
+    for scenario in scenarios:
+        if scenario not in SCENARIOS:
+            parser.error(f"Unknown scenario: {scenario}")
+
+    wordlist = opt.wordlist
+
+    if opt.limit:
+        with open(opt.wordlist, errors="ignore") as fd:
+            lines = [line for _, line in zip(range(opt.limit), fd)]
+
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as fd:
+            fd.writelines(lines)
+            wordlist = fd.name
+
+    settings = {"delay": opt.delay, "body_size": opt.body_size, "rate_limit": opt.rate_limit}
+    arguments = ["-w", wordlist, "-q", "--checkpoint-interval", "0", *arguments]
+    results = []
+
+    try:
+        for scenario in scenarios:
+            results.append(run_scenario(scenario, settings, arguments))
+    finally:
+        if wordlist != opt.wordlist:
+            os.remove(wordlist)
+
+    baseline = None
+
+    if opt.baseline:
+        with open(opt.baseline) as fd:
+            baseline = json.load(fd)
+
+    print_results(results, baseline)
+
+    if opt.output:
+        with open(opt.output, "w") as fd:
+            json.dump({
+                "version": VERSION,
+                "python": platform.python_version(),
+                "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "settings": settings,
+                "arguments": arguments[2:],
+                "results": results,
+            }, fd, indent=4)
+
+
+if __name__ == "__main__":
+    main()
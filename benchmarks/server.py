@@ -0,0 +1,164 @@
+import random
+import threading
+import time
+import zlib
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse
+
+# 模拟服务器支持的场景
+SCENARIOS = (
+    "static-404",
+    "soft-404",
+    "wildcard-redirect",
+    "slow",
+    "large-body",
+    "throttle",
+)
+
+# 每多少个路径中约有一个真实存在
+EXISTING_RATIO = 50
+
+
+def is_existing(path):
+    """
+    判断路径在模拟服务器上是否存在，服务器和统计误报/漏报时使用同一个规则
+
+    Args:
+        path (str): 不带开头斜杠的路径
+
+    Returns:
+        bool: 路径存在时返回 True
+    """
+    return zlib.crc32(path.encode()) % EXISTING_RATIO == 0
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """
+    模拟目标网站，存在的路径返回各不相同的 200 页面，其余路径按场景返回：
+
+    - static-404         固定内容的 404
+    - soft-404           200，内容包含路径和随机令牌
+    - wildcard-redirect  302 重定向到包含路径的登录页
+    - slow               延迟 `delay` 秒后返回 404
+    - large-body         `body_size` 字节的 404
+    - throttle           超过每秒 `rate_limit` 个请求时返回 429，其余同 static-404
+    """
+
+    protocol_version = "HTTP/1.1"
+    # 响应头和响应体分两次写入，关闭 Nagle 算法避免每个响应额外等待延迟确认
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        path = unquote(urlparse(self.path).path).lstrip("/")
+        headers = {"content-type": "text/html"}
+
+        with server.lock:
+            server.counters[0] += 1
+
+        if server.scenario == "throttle" and not server.acquire():
+            with server.lock:
+                server.counters[1] += 1
+
+            self.reply(429, b"Too Many Requests", {"retry-after": "1"})
+            return
+
+        if server.scenario == "slow":
+            time.sleep(server.settings["delay"])
+
+        if is_existing(path):
+            body = f"<html><h1>{path}</h1><p>{zlib.crc32(path.encode())}</p></html>"
+            self.reply(200, body.encode(), headers)
+
+        elif server.scenario == "soft-404":
+            token = random.getrandbits(64)
+            body = f"<html><p>Sorry, /{path} could not be found.</p><!-- {token:x} --></html>"
+            self.reply(200, body.encode(), headers)
+
+        elif server.scenario == "wildcard-redirect":
+            self.reply(302, b"", {"location": f"/login?next=/{path}"})
+
+        elif server.scenario == "large-body":
+            self.reply(404, b"x" * server.settings["body_size"], headers)
+
+        else:
+            self.reply(404, b"<html><p>Not Found</p></html>", headers)
+
+    do_HEAD = do_GET
+
+    def reply(self, status, body, headers):
+        self.send_response(status)
+
+        for name, value in headers.items():
+            self.send_header(name, value)
+
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockServer(ThreadingHTTPServer):
+    """
+    基准测试使用的本地 HTTP 服务器
+
+    Args:
+        scenario (str): 场景名称，见 SCENARIOS
+        port (int): 监听端口，为 0 时由系统分配
+        delay (float): slow 场景的响应延迟（秒）
+        body_size (int): large-body 场景的响应体大小（字节）
+        rate_limit (int): throttle 场景每秒允许的请求数
+        counters: 长度为 2 的可变序列，记录请求数和返回 429 的次数，
+            可以传入 multiprocessing.Array 供其他进程读取
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self, scenario, port=0, delay=0.05, body_size=512 * 1024, rate_limit=100, counters=None
+    ):
+        super().__init__(("127.0.0.1", port), MockHandler)
+        self.scenario = scenario
+        self.settings = {"delay": delay, "body_size": body_size, "rate_limit": rate_limit}
+        self.lock = threading.Lock()
+        self.counters = [0, 0] if counters is None else counters
+        self._window = 0
+        self._window_count = 0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+
+    def acquire(self):
+        """
+        throttle 场景按秒计数，当前一秒的请求数未超过限制时返回 True
+        """
+        with self.lock:
+            window = int(time.monotonic())
+
+            if window != self._window:
+                self._window = window
+                self._window_count = 0
+
+            self._window_count += 1
+            return self._window_count <= self.settings["rate_limit"]
+
+
+def serve(scenario, settings, address_queue, counters):
+    """
+    在单独的进程中运行模拟服务器，扫描占用的 CPU 和内存不会被服务器影响
+
+    Args:
+        scenario (str): 场景名称
+        settings (dict): MockServer 的其他参数
+        address_queue (multiprocessing.Queue): 用于发回服务器地址
+        counters (multiprocessing.Array): 请求数和 429 数，供主进程读取
+    """
+    server = MockServer(scenario, counters=counters, **settings)
+    address_queue.put(server.url)
+    server.serve_forever()
@@ -609,9 +609,17 @@ def run():
     # 更新全局选项配置
     options.update(parse_options())
 
+    # 报告写到标准输出时，终端输出改为标准错误，避免混入报告
+    if options["output_file"] == "-":
+        sys.stdout = sys.stderr
+
     # 初始化并运行主控制器
     Controller()
 
+    # 工作节点只负责协调节点分配的目录扫描
+    if options["worker"]:
+        return
+
     # 执行JavaScript文件查找和分析
     print(set_color(f"[{current_time}] 执行JavaScript文件查找和分析 ", fore="blue"))
     jsfind()
@@ -1,6 +1,218 @@
+import itertools
+import socket
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
 from socket import getaddrinfo
 
-_dns_cache = {}
+from lib.core.data import options
+from lib.core.logger import logger
+from lib.core.settings import DNS_NEGATIVE_TTL
+from lib.core.stats import stats
+
+
+class DNSCache:
+    """
+    线程安全的 DNS 缓存，按主机名保存 TCP 地址，端口在返回时填入。
+
+    - 解析成功的结果保存 `--dns-ttl` 秒（0 表示不过期），解析失败保存 DNS_NEGATIVE_TTL 秒，
+      期间再次查询直接抛出同样的异常
+    - 多个线程同时查询同一个未缓存的主机时只解析一次，其他线程等待结果
+    - 启用 `--dns-rotate` 时每次查询轮换地址顺序，新建的连接依次使用负载均衡后面的不同地址
+    - `--ip` 指定的地址优先于解析结果，且不会过期，与解析结果一样只用于 TCP 查询
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 主机名 -> (过期时间, 地址列表或解析异常)
+        self._entries = {}
+        # 正在解析的主机名 -> 解析完成时触发的事件
+        self._pending = {}
+        self._overrides = {}
+        self._counter = itertools.count()
+
+    def override(self, host, port, addr):
+        """
+        把主机和端口固定解析到指定地址
+
+        Args:
+            host (str): 主机名
+            port (int): 端口
+            addr (str): IP 地址
+        """
+        self._overrides[host, port] = getaddrinfo(addr, port, 0, socket.SOCK_STREAM)
+
+    def clear(self):
+        """清空解析结果（不包括固定的地址）"""
+        with self._lock:
+            self._entries.clear()
+
+    def resolve(self, host):
+        """
+        获取主机的 TCP 地址，缓存中没有或已过期时解析
+
+        Args:
+            host (str): 主机名
+
+        Returns:
+            list: getaddrinfo 格式的地址列表，端口为 0
+
+        Raises:
+            socket.gaierror: 解析失败时抛出（包括缓存的失败结果）
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(host)
+
+                if entry and (entry[0] is None or entry[0] > time.monotonic()):
+                    stats.count("dns_cache_hits")
+                    result = entry[1]
+                    break
+
+                event = self._pending.get(host)
+                is_owner = event is None
+
+                if is_owner:
+                    event = self._pending[host] = threading.Event()
+
+            if is_owner:
+                result = self._lookup(host, event)
+                break
+
+            # 其他线程正在解析同一个主机，解析完成后重新读取缓存
+            event.wait()
+
+        if isinstance(result, socket.gaierror):
+            raise socket.gaierror(*result.args)
+
+        return result
+
+    def _lookup(self, host, event):
+        """
+        解析主机并缓存结果，完成后唤醒等待同一主机的线程
+
+        Args:
+            host (str): 主机名
+            event (threading.Event): 该主机的解析完成事件
+
+        Returns:
+            list | socket.gaierror: 地址列表或解析异常
+        """
+        stats.count("dns_cache_misses")
+        start_time = time.perf_counter()
+        result = None
+
+        try:
+            try:
+                result = getaddrinfo(host, 0, 0, socket.SOCK_STREAM)
+                ttl = options["dns_ttl"]
+            except socket.gaierror as e:
+                result = e
+                ttl = DNS_NEGATIVE_TTL
+
+            elapsed = time.perf_counter() - start_time
+            stats.record("dns", elapsed)
+            logger.debug(f"Resolved {host} in {elapsed * 1000:.1f}ms: {result}")
+
+        finally:
+            # 其他异常（如主机名无法编码）不缓存，但同样要唤醒等待的线程
+            with self._lock:
+                if result is not None:
+                    self._entries[host] = (time.monotonic() + ttl if ttl else None, result)
+
+                del self._pending[host]
+
+            event.set()
+
+        return result
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        """
+        socket.getaddrinfo 的替代品，参数和返回值相同。只缓存 TCP 连接使用的查询，
+        其他查询（UDP、带 flags 或端口为服务名）直接交给 socket.getaddrinfo。
+        """
+        # anyio 会先把主机名编码为 bytes
+        if isinstance(host, bytes):
+            host = host.decode()
+
+        if isinstance(port, str) and port.isdigit():
+            port = int(port)
+        elif port is None:
+            port = 0
+
+        if (
+            flags
+            or not isinstance(port, int)
+            or type not in (0, socket.SOCK_STREAM)
+            or proto not in (0, socket.IPPROTO_TCP)
+        ):
+            return getaddrinfo(host, port, family, type, proto, flags)
+
+        if (host, port) in self._overrides:
+            return [info for info in self._overrides[host, port] if not family or info[0] == family]
+
+        result = [
+            (family_, type_, proto_, canonname, (sockaddr[0], port, *sockaddr[2:]))
+            for family_, type_, proto_, canonname, sockaddr in self.resolve(host)
+            if not family or family_ == family
+        ]
+
+        if options["dns_rotate"]:
+            result = rotate_addresses(result, next(self._counter))
+
+        return result
+
+    def resolve_all(self, hosts, workers):
+        """
+        并行解析多个主机并缓存结果，解析失败的主机同样会被缓存
+
+        Args:
+            hosts (iterable): 主机名
+            workers (int): 最多同时进行的解析数量
+        """
+        hosts = {host for host in hosts if host}
+
+        if not hosts:
+            return
+
+        def resolve(host):
+            try:
+                self.resolve(host)
+            except socket.gaierror:
+                pass
+
+        with ThreadPoolExecutor(max_workers=max(min(workers, len(hosts)), 1)) as executor:
+            for _ in executor.map(resolve, hosts):
+                pass
+
+
+def rotate_addresses(result, index):
+    """
+    按地址轮换 getaddrinfo 的结果顺序，同一地址的多个条目保持相邻
+
+    Args:
+        result (list): getaddrinfo 的结果
+        index (int): 轮换次数
+
+    Returns:
+        list: 第 index % 地址数量 个地址排在最前面的结果
+    """
+    addresses = list(dict.fromkeys(info[4][0] for info in result))
+
+    if len(addresses) < 2:
+        return result
+
+    shift = index % len(addresses)
+    order = {
+        address: (position - shift) % len(addresses)
+        for position, address in enumerate(addresses)
+    }
+    return sorted(result, key=lambda info: order[info[4][0]])
+
+
+# 全局 DNS 缓存实例
+dns_cache = DNSCache()
 
 
 def cache_dns(domain, port, addr):
@@ -11,7 +223,7 @@ def cache_dns(domain, port, addr):
     :param port: 端口号
     :param addr: 地址
     """
-    _dns_cache[domain, port] = getaddrinfo(addr, port)
+    dns_cache.override(domain, port, addr)
 
 
 def cached_getaddrinfo(*args, **kwargs):
@@ -19,12 +231,4 @@ def cached_getaddrinfo(*args, **kwargs):
     socket.getaddrinfo 的替代品，它们是一样的，但功能是这样
     是否缓存答案以提升性能
     """
-
-    # 提取主机名和端口用于缓存键
-    host, port = args[:2]
-    # 检查缓存中是否已存在该主机和端口的解析结果
-    if (host, port) not in _dns_cache:
-        _dns_cache[host, port] = getaddrinfo(*args, **kwargs)
-
-    return _dns_cache[host, port]
-
+    return dns_cache.getaddrinfo(*args, **kwargs)
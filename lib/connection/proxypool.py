@@ -0,0 +1,201 @@
+import asyncio
+import random
+import threading
+import time
+
+from lib.core.logger import logger
+from lib.core.settings import (
+    PROXY_EWMA_WEIGHT,
+    PROXY_FAILURE_THRESHOLD,
+    PROXY_QUARANTINE_MAX,
+    PROXY_QUARANTINE_TIME,
+    PROXY_WAIT_INTERVAL,
+)
+from lib.core.stats import stats
+
+
+class ProxyState:
+    """
+    单个代理的健康状态
+
+    Attributes:
+        proxy (str): 代理地址
+        in_flight (int): 正在使用该代理的请求数
+        latency (float): 成功请求耗时的指数移动平均（秒），没有成功过时为 None
+        success_rate (float): 成功率的指数移动平均，0 到 1 之间
+        failures (int): 连续失败次数
+        quarantined_until (float): 暂停使用的结束时间（time.monotonic），0 表示未暂停
+    """
+
+    __slots__ = ("proxy", "in_flight", "latency", "success_rate", "failures", "quarantined_until")
+
+    def __init__(self, proxy):
+        self.proxy = proxy
+        self.in_flight = 0
+        self.latency = None
+        self.success_rate = 1.0
+        self.failures = 0
+        self.quarantined_until = 0
+
+
+class ProxyPool:
+    """
+    线程安全的代理池，按代理的延迟和成功率加权选择代理，连续失败的代理暂停使用，
+    暂停时间随连续失败次数指数增长，恢复后一次成功即重新计数。
+
+    - 权重为成功率除以平均延迟，还没有成功过的代理使用当前最低的延迟，保证新代理有机会被选中
+    - 所有代理都在暂停时选择最早恢复的代理，不会因为目标本身的错误停止扫描
+    - `--proxy-connections` 限制每个代理同时在途的请求数，所有代理都已满时等待其他请求完成
+    """
+
+    def __init__(self, proxies=(), max_in_flight=0):
+        self._states = {}
+        self._condition = threading.Condition()
+        self.max_in_flight = 0
+        self.set_proxies(proxies, max_in_flight)
+
+    def __len__(self):
+        return len(self._states)
+
+    def set_proxies(self, proxies, max_in_flight=0):
+        """
+        设置代理列表，已有代理的健康状态保留
+
+        Args:
+            proxies (list): 代理地址
+            max_in_flight (int): 每个代理同时在途的最大请求数，0 表示不限制
+        """
+        with self._condition:
+            self._states = {
+                proxy: self._states.get(proxy) or ProxyState(proxy)
+                for proxy in dict.fromkeys(proxies)
+            }
+            self.max_in_flight = max_in_flight
+            self._condition.notify_all()
+
+    def _get_weight(self, state, default_latency):
+        return state.success_rate / max(state.latency or default_latency, 0.001)
+
+    def _choose(self, exclude=None):
+        """
+        选择一个代理并占用它的槽位，需要持有锁
+
+        Args:
+            exclude (str): 尽量不选择的代理，重试时不再使用刚刚失败的代理
+
+        Returns:
+            str: 选中的代理地址，所有代理都已满时返回 None
+        """
+        now = time.monotonic()
+        healthy = [state for state in self._states.values() if state.quarantined_until <= now]
+        # 正常的代理都已满时等待，而不是使用暂停中的代理
+        states = (
+            [state for state in healthy if state.proxy != exclude]
+            or healthy
+            or [min(self._states.values(), key=lambda state: state.quarantined_until)]
+        )
+        available = [
+            state
+            for state in states
+            if not self.max_in_flight or state.in_flight < self.max_in_flight
+        ]
+
+        if not available:
+            return None
+
+        latencies = [state.latency for state in available if state.latency]
+        default_latency = min(latencies) if latencies else 1
+        weights = [self._get_weight(state, default_latency) or 0.001 for state in available]
+        state = random.choices(available, weights)[0]
+        state.in_flight += 1
+        return state.proxy
+
+    def acquire(self, exclude=None):
+        """
+        选择一个代理，所有代理都已满时阻塞当前线程直到有请求完成
+
+        Args:
+            exclude (str): 尽量不选择的代理
+
+        Returns:
+            str: 代理地址，代理池为空时返回 None
+        """
+        with self._condition:
+            while self._states:
+                proxy = self._choose(exclude)
+
+                if proxy:
+                    return proxy
+
+                self._condition.wait()
+
+        return None
+
+    async def acquire_async(self, exclude=None):
+        """
+        选择一个代理，所有代理都已满时在事件循环中等待，不阻塞其他协程
+
+        Args:
+            exclude (str): 尽量不选择的代理
+
+        Returns:
+            str: 代理地址，代理池为空时返回 None
+        """
+        while True:
+            with self._condition:
+                if not self._states:
+                    return None
+
+                proxy = self._choose(exclude)
+
+            if proxy:
+                return proxy
+
+            await asyncio.sleep(PROXY_WAIT_INTERVAL)
+
+    def release(self, proxy, elapsed=None):
+        """
+        释放代理的槽位并记录请求结果
+
+        Args:
+            proxy (str): acquire 返回的代理地址
+            elapsed (float): 成功请求的耗时（秒），请求失败时为 None
+        """
+        with self._condition:
+            state = self._states.get(proxy)
+
+            if not state:
+                return
+
+            state.in_flight -= 1
+            success = elapsed is not None
+            state.success_rate += PROXY_EWMA_WEIGHT * (success - state.success_rate)
+
+            if success:
+                state.failures = 0
+                state.quarantined_until = 0
+                state.latency = (
+                    elapsed
+                    if state.latency is None
+                    else state.latency + PROXY_EWMA_WEIGHT * (elapsed - state.latency)
+                )
+            else:
+                state.failures += 1
+                stats.count("proxy_failures")
+
+                if state.failures >= PROXY_FAILURE_THRESHOLD:
+                    duration = min(
+                        PROXY_QUARANTINE_TIME * 2 ** (state.failures - PROXY_FAILURE_THRESHOLD),
+                        PROXY_QUARANTINE_MAX,
+                    )
+                    state.quarantined_until = time.monotonic() + duration
+                    stats.count("proxy_quarantines")
+                    logger.info(
+                        f"Proxy {proxy} quarantined for {duration}s after {state.failures} failures"
+                    )
+
+            self._condition.notify()
+
+
+# 全局代理池实例，所有请求发送器共用代理的健康状态和在途请求数
+proxy_pool = ProxyPool()
@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import time
+
+from lib.core.settings import RATE_WINDOW, RATE_WINDOW_SLOTS
+
+
+class TokenBucket:
+    """
+    线程安全的令牌桶限速器
+
+    每秒以 rate 的速度向桶中补充令牌，桶容量为 burst。每个请求通过 reserve() 预订一个令牌，
+    令牌不足时返回需要等待的秒数，调用方按该时间休眠一次即可，无需轮询或为每个请求创建定时器。
+
+    Args:
+        rate (float): 每秒允许的请求数，支持小数；0 表示不限速
+        burst (int, optional): 桶容量，即允许的最大突发请求数，默认为 max(1, rate)
+    """
+
+    def __init__(self, rate=0, burst=None):
+        self.rate = float(rate or 0)
+        self.capacity = float(burst or max(1, self.rate))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        预订一个令牌
+
+        令牌数允许变为负数，后续请求会依次排在前面的预订之后，从而保证整体速率平滑。
+
+        Returns:
+            float: 获得令牌前需要等待的秒数，0 表示可以立即发送
+        """
+        if self.rate <= 0:
+            return 0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._last) * self.rate
+            )
+            self._last = now
+            self._tokens -= 1
+
+            if self._tokens >= 0:
+                return 0
+
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """阻塞当前线程直到获得一个令牌"""
+        delay = self.reserve()
+
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """在事件循环中等待直到获得一个令牌，不阻塞其他协程"""
+        delay = self.reserve()
+
+        if delay:
+            await asyncio.sleep(delay)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+
+class RateMeter:
+    """
+    线程安全的滑动窗口速率统计器
+
+    将统计窗口划分为固定数量的时间槽，记录请求时只对当前槽计数，
+    计算速率时只汇总最近一个完整窗口内已结束的时间槽，内存占用固定。
+
+    Args:
+        window (float): 统计窗口长度（秒）
+        slots (int): 窗口划分的时间槽数量
+    """
+
+    def __init__(self, window=RATE_WINDOW, slots=RATE_WINDOW_SLOTS):
+        self._window = window
+        self._slots = slots
+        self._slot_width = window / slots
+        # 多保留一个槽用于当前尚未结束的时间段
+        self._counts = [0] * (slots + 1)
+        self._ticks = [0] * (slots + 1)
+        self._lock = threading.Lock()
+
+    def _tick(self):
+        return int(time.monotonic() / self._slot_width)
+
+    def hit(self):
+        """记录一次请求"""
+        tick = self._tick()
+        i = tick % len(self._counts)
+
+        with self._lock:
+            if self._ticks[i] != tick:
+                self._ticks[i] = tick
+                self._counts[i] = 0
+
+            self._counts[i] += 1
+
+    @property
+    def rate(self):
+        """
+        获取最近一个完整窗口内的请求速率
+
+        Returns:
+            int: 每秒请求数
+        """
+        tick = self._tick()
+
+        with self._lock:
+            total = sum(
+                count for count, tick_ in zip(self._counts, self._ticks)
+                if 0 < tick - tick_ <= self._slots
+            )
+
+        return round(total / self._window)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -5,34 +5,43 @@ import sys, argparse, validators, os, tldextract
 from colorama import init, Fore, Style
 from pyfiglet import Figlet
 
+import contextlib
 import http.client
 import socket
+import ssl
 import random
 import re
-import requests
 import threading
 import time
+import httpx
+import requests
 
 from requests.adapters import HTTPAdapter
 from requests.auth import AuthBase, HTTPBasicAuth, HTTPDigestAuth
+from requests.sessions import merge_hooks, merge_setting
+from requests.utils import get_netrc_auth
 from urllib3 import disable_warnings
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 from requests_ntlm import HttpNtlmAuth
 from urllib.parse import urlparse
 
 # 导入项目内部模块
 from lib.core.data import options
-from lib.core.decorators import cached
 from lib.core.exceptions import RequestException
 from lib.core.logger import logger
 from lib.core.settings import (
-    RATE_UPDATE_DELAY,
+    PROBE_RANGE_SIZE,
     READ_RESPONSE_ERROR_REGEX,
     SCRIPT_PATH,
     PROXY_SCHEMES,
 )
+from lib.core.stats import stats
 from lib.core.structures import CaseInsensitiveDict
 from lib.connection.dns import cached_getaddrinfo
-from lib.connection.response import Response
+from lib.connection.proxypool import proxy_pool
+from lib.connection.ratelimit import RateMeter, TokenBucket
+from lib.connection.response import AsyncResponse, Response
 from lib.utils.common import safequote
 from lib.utils.file import FileUtils
 from lib.utils.mimetype import guess_mimetype
@@ -62,32 +71,128 @@ class HTTPBearerAuth(AuthBase):
         return request
 
 
-class Requester:
+class HTTPXBearerAuth(httpx.Auth):
+    """
+    httpx 异步客户端使用的 Bearer Token 认证类
+
+    Args:
+        token (str): JWT 或其他类型的 Bearer Token
+    """
+
+    def __init__(self, token):
+        self.token = token
+
+    def auth_flow(self, request):
+        request.headers["Authorization"] = f"Bearer {self.token}"
+        yield request
+
+
+class TimedConnectionMixin:
+    """
+    记录 urllib3 新建连接的数量和 TCP 连接耗时，只在新建连接时调用，未启用统计时不记录
+    """
+
+    tcp_time = 0
+
+    def _new_conn(self):
+        start_time = time.perf_counter()
+        conn = super()._new_conn()
+        self.tcp_time = time.perf_counter() - start_time
+        stats.count("connections")
+        stats.record("connect", self.tcp_time)
+        return conn
+
+
+class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+    def connect(self):
+        start_time = time.perf_counter()
+        super().connect()
+        # 建立连接的总耗时减去 TCP 连接耗时即为 TLS 握手（和代理隧道）的耗时
+        stats.count("tls_handshakes")
+        stats.record("tls", time.perf_counter() - start_time - self.tcp_time)
+
+
+class TimedPoolMixin:
+    """
+    记录因连接池已满而被关闭的连接数量，这些连接下次需要重新建立（和 TLS 握手），
+    数量较多说明连接池小于实际的并发数
+    """
+
+    def _put_conn(self, conn):
+        if conn and self.pool is not None and self.pool.full():
+            stats.count("connections_discarded")
+
+        super()._put_conn(conn)
+
+
+class TimedHTTPConnectionPool(TimedPoolMixin, HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(TimedPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """
+    使用上面的连接类统计连接耗时的适配器，SOCKS 代理的连接不统计
+    """
+
+    pool_classes = {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = self.pool_classes
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+
+        if not proxy.lower().startswith("socks"):
+            manager.pool_classes_by_scheme = self.pool_classes
+
+        return manager
+
+
+class BaseRequester:
     """
-    HTTP 请求发送器类，用于构建和发送 HTTP 请求，并处理认证、代理等配置
+    HTTP 请求发送器基类，保存与底层 HTTP 库无关的请求配置与速率统计
 
     Attributes:
         _url (str): 目标 URL 基础路径
         _proxy_cred (str): 代理认证凭据
-        _rate (int): 当前请求速率计数
+        _rate_limiter (TokenBucket): 请求限速器
+        _rate_meter (RateMeter): 请求速率统计器
+        concurrency (int): 使用该请求发送器的线程（或协程）数量
+        pool_size (int): 每个主机保持的连接数量
         headers (CaseInsensitiveDict): HTTP 请求头字典
         agents (list): 用户代理列表
-        session (requests.Session): requests 库会话对象
     """
 
-    def __init__(self):
-        """初始化 Requester 实例"""
+    def __init__(self, concurrency=None, rate_limiter=None):
+        """
+        初始化请求发送器的公共配置
+
+        Args:
+            concurrency (int, optional): 同时发送请求的数量，默认为 `thread_count` 选项，
+                同时扫描多个目标时为调度器分配给每个目标的数量
+            rate_limiter (TokenBucket, optional): 共用的限速器，同时扫描多个目标时由调度器提供，
+                默认按 `--max-rate` 新建
+        """
         self._url = None
         self._proxy_cred = None
-        self._rate = 0
+        self._rate_limiter = rate_limiter or TokenBucket(options["max_rate"], options["rate_burst"])
+        self._rate_meter = RateMeter()
+        # 所有请求发送器共用全局代理池，已有代理的健康状态保留
+        proxy_pool.set_proxies(options["proxies"], options["proxy_connections"])
+        self.concurrency = concurrency or options["thread_count"]
+        # `--host-connections` 限制了同一主机的在途请求数，多出的连接不会被用到
+        self.pool_size = min(self.concurrency, options["host_connections"] or self.concurrency)
         self.headers = CaseInsensitiveDict(options["headers"])
         self.agents = []
-        self.session = requests.Session()
-        self.session.verify = False
-        self.session.cert = (
-            options["cert_file"],
-            options["key_file"],
-        )
 
         # 如果启用了随机 User-Agent，则加载用户代理列表
         if options["random_agents"]:
@@ -97,12 +202,6 @@ class Requester:
         if options["data"] and "content-type" not in self.headers:
             self.set_header("content-type", guess_mimetype(options["data"]))
 
-        # 配置 HTTP 和 HTTPS 协议适配器，设置最大连接池大小
-        for scheme in ("http://", "https://"):
-            self.session.mount(
-                scheme, HTTPAdapter(max_retries=0, pool_maxsize=options["thread_count"])
-            )
-
     def _fetch_agents(self):
         """从文件中读取并设置用户代理列表"""
         self.agents = FileUtils.get_lines(
@@ -128,6 +227,116 @@ class Requester:
         """
         self.headers[key] = value.lstrip()
 
+    def get_request_args(self, probe=None):
+        """
+        获取发送请求所用的方法、请求头、请求体和最多读取的响应体大小
+
+        Args:
+            probe (str, optional): 探测模式，head 或 range，默认发送完整请求
+
+        Returns:
+            tuple: (方法, 请求头, 请求体, 最多读取的响应体大小)，大小为 None 时由响应对象决定
+        """
+        if probe == "head":
+            return "HEAD", self.headers, None, 0
+
+        if probe == "range":
+            headers = CaseInsensitiveDict(self.headers)
+            headers["range"] = f"bytes=0-{PROBE_RANGE_SIZE - 1}"
+            return options["http_method"], headers, options["data"], PROBE_RANGE_SIZE
+
+        return options["http_method"], self.headers, options["data"], None
+
+    def set_proxy_auth(self, credential):
+        """
+        设置代理服务器认证凭据
+
+        Args:
+            credential (str): 代理认证凭据字符串
+        """
+        self._proxy_cred = credential
+
+    def get_proxy_url(self, proxy):
+        """
+        补全代理地址的协议前缀和认证凭据
+
+        Args:
+            proxy (str): 代理服务器地址
+
+        Returns:
+            str: 可直接使用的代理 URL
+        """
+        # 如果没有协议前缀，默认使用 http 协议
+        if not proxy.startswith(PROXY_SCHEMES):
+            proxy = f"http://{proxy}"
+            logger.debug(f"Proxy scheme added: {proxy}")
+
+        # 如果存在代理认证凭据并且 URL 中不含认证信息，则插入认证凭据
+        if self._proxy_cred and "@" not in proxy:
+            proxy = proxy.replace("://", f"://{self._proxy_cred}@", 1)
+            logger.debug(f"Proxy credentials added: {proxy}")
+
+        return proxy
+
+    @property
+    def rate(self):
+        """
+        获取最近一秒内的实际请求速率
+
+        Returns:
+            int: 当前每秒请求数量
+        """
+        return self._rate_meter.rate
+
+
+class Requester(BaseRequester):
+    """
+    基于 requests 的同步 HTTP 请求发送器，处理认证、代理等配置
+
+    每个目标和探测模式的请求只完整构建一次模板（合并会话的请求头、编码请求体、设置认证），
+    之后的请求复制模板并替换 URL。
+
+    Attributes:
+        session (requests.Session): requests 库会话对象
+        host_slots (threading.BoundedSemaphore): 同一主机共用的在途请求数限制，默认不限制
+        _templates (dict): 探测模式到预处理请求模板的映射，修改目标、请求头或认证后清空
+    """
+
+    def __init__(self, concurrency=None, rate_limiter=None):
+        """
+        初始化 Requester 实例
+
+        Args:
+            concurrency (int, optional): 同时发送请求的线程数量
+            rate_limiter (TokenBucket, optional): 共用的限速器
+        """
+        super().__init__(concurrency, rate_limiter)
+        self._templates = {}
+        # 代理地址到 Session.send 的 proxies 参数的映射
+        self._proxies = {}
+        self.host_slots = None
+        self.session = requests.Session()
+        self.session.verify = False
+        self.session.cert = (
+            options["cert_file"],
+            options["key_file"],
+        )
+
+        # 配置 HTTP 和 HTTPS 协议适配器，每个主机的连接池保留所有线程的连接，
+        # 连接池小于线程数时归还的连接会被关闭，下次需要重新建立连接和 TLS 握手
+        for scheme in ("http://", "https://"):
+            self.session.mount(
+                scheme, TimedHTTPAdapter(max_retries=0, pool_maxsize=self.pool_size)
+            )
+
+    def set_url(self, url):
+        super().set_url(url)
+        self._templates = {}
+
+    def set_header(self, key, value):
+        super().set_header(key, value)
+        self._templates = {}
+
     def set_auth(self, type, credential):
         """
         根据类型设置不同的认证方式
@@ -152,56 +361,104 @@ class Requester:
             else:
                 self.session.auth = HttpNtlmAuth(user, password)
 
-    def set_proxy(self, proxy):
+        self._templates = {}
+
+    def get_proxies(self, proxy):
         """
-        设置 HTTP 代理服务器
+        获取发送单个请求时使用的代理配置。代理随请求传给 Session.send，不修改会话共享的配置，
+        适配器为每个代理保留单独的连接池
 
         Args:
             proxy (str): 代理服务器地址
+
+        Returns:
+            dict: HTTP 和 HTTPS 协议使用的代理 URL
         """
-        if not proxy:
-            return
+        if proxy not in self._proxies:
+            proxy_url = self.get_proxy_url(proxy)
+            self._proxies[proxy] = {"http": proxy_url, "https": proxy_url}
 
-        logger.debug(f"Attempting to set proxy: {proxy}")
+        return self._proxies[proxy]
 
-        # 如果没有协议前缀，默认使用 http 协议
-        if not proxy.startswith(PROXY_SCHEMES):
-            proxy = f"http://{proxy}"
-            logger.debug(f"Proxy scheme added: {proxy}")
-
-        # 如果存在代理认证凭据并且 URL 中不含认证信息，则插入认证凭据
-        if self._proxy_cred and "@" not in proxy:
-            proxy = proxy.replace("://", f"://{self._proxy_cred}@", 1)
-            logger.debug(f"Proxy credentials added: {proxy}")
-
-        # 同时为 HTTP 和 HTTPS 设置代理
-        self.session.proxies = {
-            "http": proxy,
-            "https": proxy
-        }
+    def _build_template(self, url, method, headers, data):
+        """
+        构建预处理请求模板，与 Session.prepare_request 相同，但不包含会话中的 Cookie，
+        Cookie 会随响应变化，在每个请求中单独设置
 
-        logger.debug(f"Proxy set successfully for both HTTP and HTTPS: {proxy}")
+        Args:
+            url (str): 第一个请求的 URL
+            method (str): 请求方法
+            headers (CaseInsensitiveDict): 请求头
+            data (str): 请求体
 
-        # 对于 SOCKS4a 代理提供额外调试信息
-        if "socks4a" in proxy.lower():
-            logger.info(f"Using SOCKS4a proxy: {proxy}. Note: SOCKS4a may require additional configuration.")
+        Returns:
+            requests.PreparedRequest: 预处理请求模板
+        """
+        auth = self.session.auth
+
+        if self.session.trust_env and not auth:
+            auth = get_netrc_auth(url)
+
+        template = requests.PreparedRequest()
+        template.prepare(
+            method=method,
+            url=url,
+            headers=merge_setting(
+                headers, self.session.headers, dict_class=requests.structures.CaseInsensitiveDict
+            ),
+            data=data,
+            auth=auth,
+            hooks=merge_hooks({}, self.session.hooks),
+        )
+        return template
 
-    def set_proxy_auth(self, credential):
+    def build_request(self, url, probe=None):
         """
-        设置代理服务器认证凭据
+        构建发往 url 的预处理请求，URL 原样使用，避免路径被标准化
 
         Args:
-            credential (str): 代理认证凭据字符串
+            url (str): 已编码的完整 URL
+            probe (str, optional): 探测模式
+
+        Returns:
+            tuple: (方法, 预处理请求, 最多读取的响应体大小)
         """
-        self._proxy_cred = credential
+        method, headers, data, limit = self.get_request_args(probe)
+
+        # Digest 和 NTLM 认证需要为每个请求单独计算认证信息
+        if isinstance(self.session.auth, (type(None), HTTPBasicAuth, HTTPBearerAuth)):
+            template = self._templates.get(probe)
+
+            if not template:
+                template = self._templates[probe] = self._build_template(
+                    url, method, headers, data
+                )
+
+            prepped = template.copy()
+            prepped.url = url
+
+            # Cookie 的域名和路径要与本次请求的 URL 匹配，必须在设置 URL 之后计算
+            if self.session.cookies:
+                prepped.prepare_cookies(self.session.cookies)
+        else:
+            request = requests.Request(method, url, headers=headers, data=data)
+            prepped = self.session.prepare_request(request)
+            prepped.url = url
+
+        # 如果启用了随机 User-Agent，则从中随机选取一个
+        if self.agents:
+            prepped.headers["user-agent"] = random.choice(self.agents)
 
-    def request(self, path, proxy=None):
+        return method, prepped, limit
+
+    def request(self, path, proxy=None, probe=None):
         """
         发送 HTTP 请求到指定路径
 
         Args:
             path (str): 请求路径（不应以 '/' 开头）
             proxy (str, optional): 指定使用的代理服务器
+            probe (str, optional): 探测模式，head 发送 HEAD 请求，range 只请求开头部分内容
 
         Returns:
             Response: 包含响应结果的对象
@@ -210,52 +467,50 @@ class Requester:
             RequestException: 当请求失败时抛出异常
         """
         # 控制请求频率不超过最大限制
-        while self.is_rate_exceeded():
-            time.sleep(0.1)
-
-        self.increase_rate()
+        self._rate_limiter.acquire()
+        self._rate_meter.hit()
 
         err_msg = None
 
         # 对特殊字符进行安全编码防止被错误转义
         url = safequote(self._url + path if self._url else path)
 
-        # 循环重试直到达到最大尝试次数
-        for _ in range(options["max_retries"] + 1):
+        used_proxy = None
+
+        # 循环重试直到达到最大尝试次数，每次尝试重新从代理池选择代理，
+        # 尽量不再使用上一次失败的代理
+        for attempt in range(options["max_retries"] + 1):
+            stats.count("retries" if attempt else "requests")
+            # 指定的代理（如 --replay-proxy）不经过代理池
+            used_proxy = proxy or proxy_pool.acquire(exclude=used_proxy)
+            elapsed = None
+
             try:
-                try:
-                    # 尝试选择一个代理服务器
-                    proxy = proxy or random.choice(options["proxies"])
-                    self.set_proxy(proxy)
-                except IndexError:
-                    pass
-
-                # 如果启用了随机 User-Agent，则从中随机选取一个
-                if self.agents:
-                    self.set_header("user-agent", random.choice(self.agents))
-
-                # 构建预处理请求避免 URL 路径被标准化
-                request = requests.Request(
-                    options["http_method"],
-                    url,
-                    headers=self.headers,
-                    data=options["data"],
-                )
-                prepped = self.session.prepare_request(request)
-                prepped.url = url
-
-                # 发送实际请求
-                response = self.session.send(
-                    prepped,
-                    allow_redirects=options["follow_redirects"],
-                    timeout=options["timeout"],
-                    stream=True,
-                )
+                method, prepped, limit = self.build_request(url, probe)
+                # 没有选中代理时不传 proxies，由 Session.send 按 HTTP(S)_PROXY、NO_PROXY 等环境变量决定
+                send_kwargs = {"proxies": self.get_proxies(used_proxy)} if used_proxy else {}
+
+                # 发送实际请求，读取完响应体后连接才会被释放
+                with self.host_slots or contextlib.nullcontext():
+                    start_time = time.monotonic()
+
+                    # 以 stream 方式发送时收到响应头即返回
+                    with stats.measure("ttfb"):
+                        response = self.session.send(
+                            prepped,
+                            allow_redirects=options["follow_redirects"],
+                            timeout=options["timeout"],
+                            stream=True,
+                            **send_kwargs,
+                        )
+
+                    with stats.measure("body"):
+                        response = Response(response, limit)
 
-                response = Response(response)
+                    response.elapsed = elapsed = time.monotonic() - start_time
 
                 # 构造日志消息记录请求详情
-                log_msg = f'"{options["http_method"]} {response.url}" {response.status} - {response.length}B'
+                log_msg = f'"{method} {response.url}" {response.status} - {response.length}B'
 
                 if response.redirect:
                     log_msg += f" - LOCATION: {response.redirect}"
@@ -276,14 +531,11 @@ class Requester:
                 elif "TooManyRedirects" in str(type(e)):
                     err_msg = f"Too many redirects: {url}"
                 elif "ProxyError" in str(type(e)):
-                    err_msg = f"Proxy error with {proxy}: {str(e)}"
-                    # 移除无效代理以防再次使用
-                    if proxy in options["proxies"] and len(options["proxies"]) > 1:
-                        options["proxies"].remove(proxy)
+                    err_msg = f"Proxy error with {used_proxy}: {str(e)}"
                 elif "InvalidURL" in str(type(e)):
                     err_msg = f"Invalid URL: {url}"
                 elif "InvalidProxyURL" in str(type(e)):
-                    err_msg = f"Invalid proxy URL: {proxy}"
+                    err_msg = f"Invalid proxy URL: {used_proxy}"
                 elif "ConnectionError" in str(type(e)):
                     err_msg = f"Connection failed to {urlparse(url).netloc}: {str(e)}"
                 elif re.search(READ_RESPONSE_ERROR_REGEX, str(e)):
@@ -291,40 +543,427 @@ class Requester:
                 elif "Timeout" in str(type(e)) or isinstance(e, (http.client.IncompleteRead, socket.timeout)):
                     err_msg = f"Request timeout after {options['timeout']}s: {url}"
                     # 特别提示 SOCKS4a 可能需要更长超时时间或额外配置
-                    if proxy and "socks4a" in proxy.lower():
+                    if used_proxy and "socks4a" in used_proxy.lower():
                         err_msg += " (SOCKS4a might require longer timeout or additional configuration)"
                 else:
                     err_msg = (
                         f"Request failed: {url} - {str(type(e))}: {str(e)}"
                     )
 
+            finally:
+                # 失败的请求降低代理的成功率，连续失败的代理会被暂停使用
+                if used_proxy and not proxy:
+                    proxy_pool.release(used_proxy, elapsed)
+
         raise RequestException(err_msg)
 
-    def is_rate_exceeded(self):
+
+class BaseHTTPXRequester(BaseRequester):
+    """
+    基于 httpx 的请求发送器基类，保存客户端、认证和 SSL 配置，启用 `--http2` 时客户端
+    通过 ALPN 协商 HTTP/2，服务器不支持时使用 HTTP/1.1
+
+    Attributes:
+        client_class (type): httpx.Client 或 httpx.AsyncClient
+        _auth (httpx.Auth): 认证对象
+        _sessions (dict): 代理地址到 httpx 客户端的映射（None 表示直连）
+    """
+
+    client_class = None
+
+    def __init__(self, concurrency=None, rate_limiter=None):
+        """
+        初始化请求发送器
+
+        Args:
+            concurrency (int, optional): 同时发送请求的数量
+            rate_limiter (TokenBucket, optional): 共用的限速器
         """
-        判断当前请求速率是否超过设定上限
+        super().__init__(concurrency, rate_limiter)
+        self._auth = None
+        self._sessions = {}
+        self._sessions_lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context()
+        self._ssl_context.check_hostname = False
+        self._ssl_context.verify_mode = ssl.CERT_NONE
+
+        if options["cert_file"]:
+            self._ssl_context.load_cert_chain(options["cert_file"], options["key_file"])
+
+    def _get_session(self, proxy=None):
+        """
+        获取（必要时创建）指定代理对应的客户端
+
+        每个代理使用独立的客户端，避免并发请求之间修改共享的代理配置。多个线程同时
+        创建客户端时只保留一个，否则各自的连接池会分别建立连接，HTTP/2 也无法复用连接
+
+        Args:
+            proxy (str, optional): 代理服务器地址
 
         Returns:
-            bool: True 表示已超出限制，False 表示未超出
+            httpx.Client | httpx.AsyncClient: 客户端对象
         """
-        return self._rate >= options["max_rate"] > 0
+        if proxy in self._sessions:
+            return self._sessions[proxy]
+
+        with self._sessions_lock:
+            if proxy not in self._sessions:
+                self._sessions[proxy] = self.client_class(
+                    verify=self._ssl_context,
+                    proxy=self.get_proxy_url(proxy) if proxy else None,
+                    http2=options["http2"],
+                    limits=httpx.Limits(
+                        max_connections=self.concurrency,
+                        max_keepalive_connections=self.pool_size,
+                    ),
+                    timeout=httpx.Timeout(options["timeout"]),
+                )
 
-    def decrease_rate(self):
-        """减少当前请求速率计数"""
-        self._rate -= 1
+        return self._sessions[proxy]
 
-    def increase_rate(self):
-        """增加当前请求速率计数并在一秒后自动减一"""
-        self._rate += 1
-        threading.Timer(1, self.decrease_rate).start()
+    @staticmethod
+    def _record_trace(started, event):
+        """
+        根据 httpx 的 trace 事件记录新建连接的数量、TCP 连接和 TLS 握手的耗时
 
-    @property
-    @cached(RATE_UPDATE_DELAY)
-    def rate(self):
+        Args:
+            started (dict): 事件名称到开始时间的映射，同一个请求的事件共用
+            event (str): 事件名称，如 connection.connect_tcp.started
         """
-        获取当前请求速率（带缓存）
+        name, _, state = event.rpartition(".")
+
+        if state == "started":
+            started[name] = time.perf_counter()
+        elif state == "complete" and name in started:
+            if name == "connection.connect_tcp":
+                stats.count("connections")
+                stats.record("connect", time.perf_counter() - started[name])
+            elif name == "connection.start_tls":
+                stats.count("tls_handshakes")
+                stats.record("tls", time.perf_counter() - started[name])
+
+    def set_auth(self, type, credential):
+        """
+        根据类型设置不同的认证方式
+
+        Args:
+            type (str): 认证类型（basic/digest/bearer/jwt/oath2）
+            credential (str): 认证凭据信息
+        """
+        if type in ("bearer", "jwt", "oath2"):
+            self._auth = HTTPXBearerAuth(credential)
+        else:
+            try:
+                user, password = credential.split(":", 1)
+            except ValueError:
+                user = credential
+                password = ""
+
+            # httpx 不支持的 NTLM 认证已在选项校验时拒绝
+            if type == "basic":
+                self._auth = httpx.BasicAuth(user, password)
+            else:
+                self._auth = httpx.DigestAuth(user, password)
+
+    def build_request(self, session, url, probe=None):
+        """
+        构建发往 url 的请求，直接指定请求目标，避免 httpx 对 URL 路径进行标准化
+
+        Args:
+            session (httpx.Client | httpx.AsyncClient): 发送请求的客户端
+            url (str): 已编码的完整 URL
+            probe (str, optional): 探测模式
 
         Returns:
-            int: 当前每秒请求数量
+            tuple: (方法, httpx.Request, 最多读取的响应体大小)
+        """
+        method, headers, data, limit = self.get_request_args(probe)
+        parsed = urlparse(url)
+        request = session.build_request(method, url, headers=headers, content=data)
+
+        # 只修改这个请求的请求头，共用的 self.headers 可能正在被其他线程使用
+        if self.agents:
+            request.headers["user-agent"] = random.choice(self.agents)
+        request.extensions["target"] = (
+            parsed.path + (f"?{parsed.query}" if parsed.query else "")
+        ).encode()
+
+        if stats.enabled:
+            request.extensions["trace"] = self._create_trace()
+
+        return method, request, limit
+
+    def get_error_message(self, e, url, proxy):
+        """
+        把 httpx 的异常转换为错误信息
+
+        Args:
+            e (Exception): 发送请求时抛出的异常
+            url (str): 请求的 URL
+            proxy (str): 使用的代理服务器
+
+        Returns:
+            str: 错误信息
+        """
+        netloc = urlparse(url).netloc
+
+        if isinstance(e, httpx.ProxyError):
+            return f"Proxy error with {proxy}: {str(e)}"
+        elif isinstance(e, httpx.TooManyRedirects):
+            return f"Too many redirects: {url}"
+        elif isinstance(e, (httpx.InvalidURL, httpx.UnsupportedProtocol)):
+            return f"Invalid URL: {url}"
+        elif isinstance(e, httpx.TimeoutException):
+            return f"Request timeout after {options['timeout']}s: {url}"
+        elif isinstance(e, httpx.ConnectError):
+            # httpx 会逐层包装底层异常，取最内层的原始异常判断错误类型
+            cause = e
+            while cause.__context__:
+                cause = cause.__context__
+
+            if isinstance(cause, socket.gaierror):
+                return f"DNS resolution failed for {netloc}: {str(e)}"
+            elif isinstance(cause, ssl.SSLError):
+                return f"SSL error connecting to {url}: {str(e)}"
+
+            return f"Connection failed to {netloc}: {str(e)}"
+        elif isinstance(e, (httpx.ReadError, httpx.RemoteProtocolError)):
+            return f"Failed to read response body: {url}"
+
+        return f"Request failed: {url} - {str(type(e))}: {str(e)}"
+
+    @staticmethod
+    def log_response(method, response):
+        """
+        记录请求的日志
+
+        Args:
+            method (str): 请求方法
+            response (BaseResponse): 响应对象
+        """
+        log_msg = f'"{method} {response.url}" {response.status} - {response.length}B'
+
+        if response.redirect:
+            log_msg += f" - LOCATION: {response.redirect}"
+
+        logger.info(log_msg)
+
+
+class HTTP2Requester(BaseHTTPXRequester):
+    """
+    基于 httpx 同步客户端的 HTTP 请求发送器，用于 `--http2`，返回与 Requester 相同的 Response
+
+    支持 HTTP/2 的服务器上所有线程的请求作为不同的流复用少量连接，
+    不支持的服务器（包括 http:// 目标）使用 HTTP/1.1 连接池
+
+    Attributes:
+        host_slots (threading.BoundedSemaphore): 同一主机共用的在途请求数限制，默认不限制
+    """
+
+    client_class = httpx.Client
+
+    def __init__(self, concurrency=None, rate_limiter=None):
+        """
+        初始化 HTTP2Requester 实例
+
+        Args:
+            concurrency (int, optional): 同时发送请求的线程数量
+            rate_limiter (TokenBucket, optional): 共用的限速器
+        """
+        super().__init__(concurrency, rate_limiter)
+        self.host_slots = None
+
+    @staticmethod
+    def _create_trace():
+        """
+        创建 httpx 的 trace 回调
+
+        Returns:
+            function: 以 (事件名称, 事件信息) 调用的回调
+        """
+        started = {}
+
+        def trace(event, info):
+            BaseHTTPXRequester._record_trace(started, event)
+
+        return trace
+
+    def request(self, path, proxy=None, probe=None):
+        """
+        发送 HTTP 请求到指定路径
+
+        Args:
+            path (str): 请求路径（不应以 '/' 开头）
+            proxy (str, optional): 指定使用的代理服务器
+            probe (str, optional): 探测模式，head 发送 HEAD 请求，range 只请求开头部分内容
+
+        Returns:
+            Response: 包含响应结果的对象
+
+        Raises:
+            RequestException: 当请求失败时抛出异常
         """
-        return self._rate
+        self._rate_limiter.acquire()
+        self._rate_meter.hit()
+
+        err_msg = None
+
+        # 对特殊字符进行安全编码防止被错误转义
+        url = safequote(self._url + path if self._url else path)
+        used_proxy = None
+
+        for attempt in range(options["max_retries"] + 1):
+            stats.count("retries" if attempt else "requests")
+            used_proxy = proxy or proxy_pool.acquire(exclude=used_proxy)
+            elapsed = None
+
+            try:
+                session = self._get_session(used_proxy)
+                method, request, limit = self.build_request(session, url, probe)
+
+                with self.host_slots or contextlib.nullcontext():
+                    start_time = time.monotonic()
+
+                    with stats.measure("ttfb"):
+                        xresponse = session.send(
+                            request,
+                            stream=True,
+                            auth=self._auth,
+                            follow_redirects=options["follow_redirects"],
+                        )
+
+                    if xresponse.http_version == "HTTP/2":
+                        stats.count("http2_responses")
+
+                    try:
+                        with stats.measure("body"):
+                            response = Response(xresponse, limit)
+                    finally:
+                        xresponse.close()
+
+                    response.elapsed = elapsed = time.monotonic() - start_time
+
+                self.log_response(method, response)
+
+                return response
+
+            except Exception as e:
+                logger.exception(e)
+                logger.debug(f"Detailed error information: {str(type(e))}: {str(e)}")
+
+                err_msg = self.get_error_message(e, url, used_proxy)
+
+            finally:
+                if used_proxy and not proxy:
+                    proxy_pool.release(used_proxy, elapsed)
+
+        raise RequestException(err_msg)
+
+    def close(self):
+        """关闭所有客户端及其连接池"""
+        for session in self._sessions.values():
+            session.close()
+
+        self._sessions.clear()
+
+
+class AsyncRequester(BaseHTTPXRequester):
+    """
+    基于 httpx 异步客户端的 HTTP 请求发送器，用于 `--engine async` 模式
+
+    单个事件循环内可同时挂起大量请求，不再受限于线程数量
+    """
+
+    client_class = httpx.AsyncClient
+
+    @staticmethod
+    def _create_trace():
+        """
+        创建 httpx 的 trace 回调，记录新建连接的数量、TCP 连接和 TLS 握手的耗时
+
+        Returns:
+            coroutine function: 以 (事件名称, 事件信息) 调用的回调
+        """
+        started = {}
+
+        async def trace(event, info):
+            BaseHTTPXRequester._record_trace(started, event)
+
+        return trace
+
+    async def request(self, path, proxy=None, probe=None):
+        """
+        异步发送 HTTP 请求到指定路径
+
+        Args:
+            path (str): 请求路径（不应以 '/' 开头）
+            proxy (str, optional): 指定使用的代理服务器
+            probe (str, optional): 探测模式，head 发送 HEAD 请求，range 只请求开头部分内容
+
+        Returns:
+            AsyncResponse: 包含响应结果的对象
+
+        Raises:
+            RequestException: 当请求失败时抛出异常
+        """
+        # 控制请求频率不超过最大限制，等待期间让出事件循环
+        await self._rate_limiter.acquire_async()
+        self._rate_meter.hit()
+
+        err_msg = None
+
+        # 对特殊字符进行安全编码防止被错误转义
+        url = safequote(self._url + path if self._url else path)
+        used_proxy = None
+
+        for attempt in range(options["max_retries"] + 1):
+            stats.count("retries" if attempt else "requests")
+            used_proxy = proxy or await proxy_pool.acquire_async(exclude=used_proxy)
+            elapsed = None
+
+            try:
+                session = self._get_session(used_proxy)
+                method, request, limit = self.build_request(session, url, probe)
+                start_time = time.monotonic()
+
+                with stats.measure("ttfb"):
+                    xresponse = await session.send(
+                        request,
+                        stream=True,
+                        auth=self._auth,
+                        follow_redirects=options["follow_redirects"],
+                    )
+
+                if xresponse.http_version == "HTTP/2":
+                    stats.count("http2_responses")
+
+                try:
+                    with stats.measure("body"):
+                        response = await AsyncResponse.create(xresponse, limit)
+                finally:
+                    await xresponse.aclose()
+
+                response.elapsed = elapsed = time.monotonic() - start_time
+
+                self.log_response(method, response)
+
+                return response
+
+            except Exception as e:
+                logger.exception(e)
+                logger.debug(f"Detailed error information: {str(type(e))}: {str(e)}")
+
+                err_msg = self.get_error_message(e, url, used_proxy)
+
+            finally:
+                if used_proxy and not proxy:
+                    proxy_pool.release(used_proxy, elapsed)
+
+        raise RequestException(err_msg)
+
+    async def close(self):
+        """关闭所有异步客户端及其连接池"""
+        for session in self._sessions.values():
+            await session.aclose()
+
+        self._sessions.clear()
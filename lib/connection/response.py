@@ -1,17 +1,24 @@
+import base64
+
+from requests.utils import get_encoding_from_headers
+
+from lib.core.data import options
 from lib.core.settings import (
     DEFAULT_ENCODING, ITER_CHUNK_SIZE,
     MAX_RESPONSE_SIZE, UNKNOWN,
 )
+from lib.core.stats import stats
+from lib.core.structures import CaseInsensitiveDict
 from lib.parse.url import clean_path, parse_path
 from lib.utils.common import is_binary
 
 
-class Response:
+class BaseResponse:
     """
-    响应类，用于封装HTTP响应信息
+    响应基类，封装与底层HTTP库无关的响应信息
 
     Args:
-        response: 原始HTTP响应对象
+        response: 原始HTTP响应对象（requests 或 httpx）
 
     Attributes:
         url: 响应的完整URL
@@ -21,37 +28,136 @@ class Response:
         headers: 响应头字典
         redirect: 重定向地址
         history: 重定向历史URL列表
-        content: 解码后的文本内容
-        body: 原始二进制内容
+        content: 解码后的文本内容，第一次访问时才解码
+        body: 原始二进制内容，状态码会被过滤时最多读取 `--excluded-body-size`
+        elapsed: 从发送请求到读取完响应体的耗时（秒），由请求发送器设置
     """
 
+    __slots__ = (
+        "url",
+        "full_path",
+        "path",
+        "status",
+        "headers",
+        "redirect",
+        "history",
+        "body",
+        "elapsed",
+        "_content",
+        "_encoding",
+    )
+
     def __init__(self, response):
         # 初始化基本响应信息
-        self.url = response.url
-        self.full_path = parse_path(response.url)
+        self.url = str(response.url)
+        self.full_path = parse_path(self.url)
         self.path = clean_path(self.full_path)
         self.status = response.status_code
         self.headers = response.headers
         self.redirect = self.headers.get("location") or ""
-        self.history = [res.url for res in response.history]
-        self.content = ""
+        self.history = [str(res.url) for res in response.history]
         self.body = b""
+        self.elapsed = 0
+        self._content = None
+        # 与 requests 相同，只根据响应头确定编码，httpx 在没有 charset 时默认使用 UTF-8，
+        # 不同的请求引擎得到的响应内容会不一致
+        self._encoding = get_encoding_from_headers(self.headers)
+
+    def to_dict(self):
+        """
+        转换为可以用 JSON 传输的字典，分布式扫描时工作节点用它把发现的响应发回协调节点
+
+        Returns:
+            dict: 响应信息，响应体以 base64 编码
+        """
+        return {
+            "url": self.url,
+            "status": self.status,
+            "headers": dict(self.headers),
+            "history": self.history,
+            "body": base64.b64encode(self.body).decode(),
+            "elapsed": self.elapsed,
+            "encoding": self._encoding,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        从 to_dict 生成的字典还原响应对象
+
+        Args:
+            data (dict): to_dict 的返回值
+
+        Returns:
+            BaseResponse: 还原的响应对象
+        """
+        self = cls.__new__(cls)
+        self.url = data["url"]
+        self.full_path = parse_path(self.url)
+        self.path = clean_path(self.full_path)
+        self.status = data["status"]
+        self.headers = CaseInsensitiveDict(data["headers"])
+        self.redirect = self.headers.get("location") or ""
+        self.history = data["history"]
+        self.body = base64.b64decode(data["body"])
+        self.elapsed = data["elapsed"]
+        self._content = None
+        self._encoding = data["encoding"]
+        return self
+
+    def _get_body_limit(self):
+        """
+        获取最多读取的响应体大小
+
+        Returns:
+            int: 状态码会被状态码过滤规则排除时为 `--excluded-body-size`，否则为 MAX_RESPONSE_SIZE
+        """
+        if self.status in options["exclude_status_codes"] or (
+            options["include_status_codes"]
+            and self.status not in options["include_status_codes"]
+        ):
+            return min(options["excluded_body_size"] * 1024, MAX_RESPONSE_SIZE)
+
+        return MAX_RESPONSE_SIZE
+
+    def _append_chunk(self, buffer, chunk, limit):
+        """
+        将读取到的数据块追加到缓冲区，并判断是否应停止继续读取
+
+        Args:
+            buffer (bytearray): 响应体缓冲区
+            chunk (bytes): 新读取的数据块
+            limit (int): 最多读取的字节数
+
+        Returns:
+            bool: 达到大小上限或检测到二进制内容时返回True
+        """
+        buffer += chunk
+
+        if len(buffer) >= limit:
+            del buffer[limit:]
+            return True
+
+        return "content-length" in self.headers and is_binary(chunk)
 
-        # 分块读取响应内容，避免内存溢出
-        for chunk in response.iter_content(chunk_size=ITER_CHUNK_SIZE):
-            self.body += chunk
+    @property
+    def content(self):
+        """
+        获取解码后的文本内容，第一次访问时才解码，二进制内容返回空字符串
 
-            # 当达到最大响应大小或检测到二进制内容时停止读取
-            if len(self.body) >= MAX_RESPONSE_SIZE or (
-                "content-length" in self.headers and is_binary(self.body)
-            ):
-                break
+        Returns:
+            str: 文本内容
+        """
+        if self._content is None:
+            with stats.measure("decode"):
+                if is_binary(self.body):
+                    self._content = ""
+                else:
+                    self._content = self.body.decode(
+                        self._encoding or DEFAULT_ENCODING, errors="ignore"
+                    )
 
-        # 如果不是二进制内容，则解码为文本
-        if not is_binary(self.body):
-            self.content = self.body.decode(
-                response.encoding or DEFAULT_ENCODING, errors="ignore"
-            )
+        return self._content
 
     @property
     def type(self):
@@ -104,3 +210,72 @@ class Response:
             other.redirect,
         )
 
+
+class Response(BaseResponse):
+    """
+    响应类，用于封装 requests 库（或 `--http2` 使用的 httpx 同步客户端）返回的HTTP响应信息
+
+    Args:
+        response: 原始 requests 或 httpx 响应对象
+        limit (int, optional): 最多读取的响应体大小，默认由 _get_body_limit 决定
+    """
+
+    __slots__ = ()
+
+    def __init__(self, response, limit=None):
+        super().__init__(response)
+
+        if limit is None:
+            limit = self._get_body_limit()
+
+        buffer = bytearray()
+        # requests 的响应使用 iter_content，httpx 的响应使用 iter_bytes
+        iter_chunks = getattr(response, "iter_content", None) or response.iter_bytes
+
+        # 分块读取响应内容到可变缓冲区，避免反复拼接 bytes 造成的复制
+        if limit:
+            for chunk in iter_chunks(chunk_size=min(ITER_CHUNK_SIZE, limit)):
+                # 当达到最大响应大小或检测到二进制内容时停止读取
+                if self._append_chunk(buffer, chunk, limit):
+                    break
+
+        # 释放未读完的响应占用的连接
+        response.close()
+        self.body = bytes(buffer)
+
+
+class AsyncResponse(BaseResponse):
+    """
+    异步响应类，用于封装 httpx 异步客户端返回的HTTP响应信息
+
+    由于 __init__ 不能是协程，需通过 AsyncResponse.create() 构造实例
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    async def create(cls, response, limit=None):
+        """
+        异步读取响应体并创建响应对象
+
+        Args:
+            response: 原始 httpx 响应对象（以 stream 方式发送）
+            limit (int, optional): 最多读取的响应体大小，默认由 _get_body_limit 决定
+
+        Returns:
+            AsyncResponse: 读取完成的响应对象
+        """
+        self = cls(response)
+
+        if limit is None:
+            limit = self._get_body_limit()
+
+        buffer = bytearray()
+
+        if limit:
+            async for chunk in response.aiter_bytes(chunk_size=min(ITER_CHUNK_SIZE, limit)):
+                if self._append_chunk(buffer, chunk, limit):
+                    break
+
+        self.body = bytes(buffer)
+        return self
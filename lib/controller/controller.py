@@ -1,12 +1,18 @@
+import asyncio
 import os
 import gc
+import signal
 import time
 import re
 
 from urllib.parse import urlparse
 
-from lib.connection.dns import cache_dns
-from lib.connection.requester import Requester
+from lib.connection.dns import cache_dns, dns_cache
+from lib.connection.requester import AsyncRequester, HTTP2Requester, Requester
+from lib.controller.distributed import Coordinator, run_worker
+from lib.controller.scheduler import TargetScheduler
+from lib.controller.session import SessionJournal
+from lib.controller.workers import WorkerPool
 from lib.core.data import blacklists, options
 from lib.core.decorators import locked
 from lib.core.dictionary import Dictionary, get_blacklists
@@ -18,7 +24,8 @@ from lib.core.exceptions import (
     QuitInterrupt,
     UnpicklingError,
 )
-from lib.core.fuzzer import Fuzzer
+from lib.core.filters import ResponseFilter
+from lib.core.fuzzer import AsyncFuzzer, Fuzzer
 from lib.core.logger import enable_logging, logger
 from lib.core.settings import (
     BANNER,
@@ -30,13 +37,19 @@ from lib.core.settings import (
     SCRIPT_PATH,
     STANDARD_PORTS,
     PAUSING_WAIT_TIMEOUT,
+    SCHEME_CACHE_FILE,
+    SCHEME_PROBE_THREADS,
     UNKNOWN,
+    VERDICT_CACHE_SIZE,
 )
+from lib.core.stats import stats
+from lib.core.structures import LRUCache
 from lib.parse.rawrequest import parse_raw
 from lib.parse.url import clean_path, parse_path
 from lib.reports.csv_report import CSVReport
 from lib.reports.html_report import HTMLReport
 from lib.reports.json_report import JSONReport
+from lib.reports.jsonl_report import JSONLinesReport
 from lib.reports.markdown_report import MarkdownReport
 from lib.reports.plain_text_report import PlainTextReport
 from lib.reports.simple_report import SimpleReport
@@ -44,8 +57,7 @@ from lib.reports.xml_report import XMLReport
 from lib.reports.sqlite_report import SQLiteReport
 from lib.utils.common import get_valid_filename, lstrip_once
 from lib.utils.file import FileUtils
-from lib.utils.pickle import pickle, unpickle
-from lib.utils.schemedet import detect_scheme
+from lib.utils.schemedet import detect_scheme, detect_schemes
 from lib.view.colors import set_color
 from lib.view.terminal import output
 
@@ -62,7 +74,12 @@ class Controller:
         初始化控制器实例。
 
         根据是否提供会话文件决定是从旧会话加载还是进行全新设置，并启动主运行循环。
+        以工作节点身份运行时只从协调节点领取扫描任务。
         """
+        if options["worker"]:
+            run_worker(options["worker"])
+            return
+
         if options["session_file"]:
             self._import(options["session_file"])
             self.old_session = True
@@ -70,7 +87,17 @@ class Controller:
             self.setup()
             self.old_session = False
 
-        self.run()
+        self.setup_stats()
+
+        try:
+            self.run()
+        finally:
+            # 等待写入线程把队列中的结果写完
+            if self.report:
+                self.report.close()
+
+            stats.stop_snapshots()
+            output.flush()
 
     def _import(self, session_file):
         """
@@ -83,17 +110,28 @@ class Controller:
             UnpicklingError: 当会话文件格式无效或版本过旧时抛出
         """
         try:
-            with open(session_file, "rb") as fd:
-                indict, last_output, opt = unpickle(fd)
-                options.update(opt)
-        except UnpicklingError:
+            indict, results, last_output, opt = SessionJournal.load(session_file)
+            options.update(opt)
+            # 继续使用本次指定的会话文件
+            options["session_file"] = session_file
+        except (OSError, UnpicklingError):
             output.error(
                 f"{session_file} is not a valid session file or it's in an old format"
             )
             exit(1)
 
         self.__dict__ = {**indict, **vars(self)}
+        self.results = results
+
+        if self.report:
+            self.report.open(self.results)
+
+        # 请求发送器不保存到会话中，恢复会话时重新创建
+        self.setup_requester()
+
         print(last_output)
+        # 之后保存的会话仍然包含恢复前的输出
+        output.buffer = last_output + "\n"
 
     def _export(self, session_file):
         """
@@ -102,14 +140,18 @@ class Controller:
         参数:
             session_file (str): 目标会话文件路径
         """
-        # Save written output
-        last_output = output.buffer.rstrip()
+        if self.session and self.session.path == session_file:
+            self.session.checkpoint(self, force=True)
+            self.session.close()
+            return
 
-        # Can't pickle Fuzzer class due to _thread.lock objects
-        del self.fuzzer
+        session = SessionJournal(session_file)
+        session.open(self)
+        session.close()
 
-        with open(session_file, "wb") as fd:
-            pickle((vars(self), last_output, options), fd)
+        # 会话已保存到用户指定的文件，不再需要定期保存的会话文件
+        if self.session:
+            self.session.discard()
 
     def setup(self):
         """
@@ -139,7 +181,7 @@ class Controller:
             if options["cookie"]:
                 options["headers"]["cookie"] = options["cookie"]
 
-        self.requester = Requester()
+        self.setup_requester()
         self.dictionary = Dictionary(files=options["wordlists"])
         self.results = []
         self.targets = options["urls"]
@@ -152,12 +194,6 @@ class Controller:
         self.errors = 0
         self.consecutive_errors = 0
 
-        if options["auth"]:
-            self.requester.set_auth(options["auth_type"], options["auth"])
-
-        if options["proxy_auth"]:
-            self.requester.set_proxy_auth(options["proxy_auth"])
-
         if options["log_file"]:
             options["log_file"] = FileUtils.get_abs_path(options["log_file"])
 
@@ -198,58 +234,115 @@ class Controller:
         if options["log_file"]:
             output.log_file(options["log_file"])
 
+    def setup_stats(self):
+        """
+        按 `--stats` 启用性能统计，指定了 `--stats-file` 时定期保存统计数据。
+        """
+        if not options["stats"]:
+            return
+
+        stats.enable()
+
+        if options["stats_file"]:
+            stats.start_snapshots(options["stats_file"], options["stats_interval"])
+
+    def setup_requester(self, concurrency=None, rate_limiter=None):
+        """
+        根据所选的请求引擎创建请求发送器，并配置认证信息。
+
+        参数:
+            concurrency (int): 同时发送请求的数量，决定每个主机保留的连接数，默认为 `thread_count` 选项
+            rate_limiter (TokenBucket): 多个目标共用的限速器，默认按 `--max-rate` 新建
+        """
+        if options["engine"] == "async":
+            self.requester = AsyncRequester(concurrency, rate_limiter)
+        elif options["http2"]:
+            self.requester = HTTP2Requester(concurrency, rate_limiter)
+        else:
+            self.requester = Requester(concurrency, rate_limiter)
+
+        if options["auth"]:
+            self.requester.set_auth(options["auth_type"], options["auth"])
+
+        if options["proxy_auth"]:
+            self.requester.set_proxy_auth(options["proxy_auth"])
+
+    def setup_event_loop(self):
+        """
+        为异步引擎创建事件循环，并将 Ctrl+C 交由事件循环处理以支持暂停菜单。
+        """
+        self.loop = asyncio.new_event_loop()
+        self.pause_future = None
+        asyncio.set_event_loop(self.loop)
+
+        try:
+            self.loop.add_signal_handler(signal.SIGINT, self.handle_async_pause)
+        except NotImplementedError:
+            # Windows 的事件循环不支持 add_signal_handler
+            signal.signal(signal.SIGINT, lambda *_: self.handle_async_pause())
+
+    def close_event_loop(self):
+        """
+        关闭异步客户端与事件循环，并恢复默认的 Ctrl+C 行为。
+        """
+        self.loop.run_until_complete(self.requester.close())
+        self.loop.close()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
     def run(self):
         """
-        主执行循环，依次处理所有目标URL。
+        主执行循环，处理所有目标URL。
 
-        每个目标都会被分配一个Fuzzer实例来执行实际的探测工作。根据不同的异常类型采取相应的错误处理策略。
+        默认依次扫描每个目标；`--parallel-targets` 大于 1 时交给 TargetScheduler 同时扫描多个目标。
         """
-        # match_callbacks and not_found_callbacks callback values:
-        #  - *args[0]: lib.connection.Response() object
-        #
-        # error_callbacks callback values:
-        #  - *args[0]: exception
-        match_callbacks = (
-            self.match_callback, self.reset_consecutive_errors
-        )
-        not_found_callbacks = (
-            self.update_progress_bar, self.reset_consecutive_errors
-        )
-        error_callbacks = (self.raise_error, self.append_error_log)
+        # 过滤规则只预处理一次，所有目标共用过滤器和判断结果缓存以累计命中次数
+        response_filter = ResponseFilter()
+        verdict_cache = LRUCache(VERDICT_CACHE_SIZE)
+        fuzzer_class = Fuzzer
 
-        while self.targets:
-            url = self.targets[0]
-            self.fuzzer = Fuzzer(
-                self.requester,
-                self.dictionary,
-                match_callbacks=match_callbacks,
-                not_found_callbacks=not_found_callbacks,
-                error_callbacks=error_callbacks,
-            )
+        if options["engine"] == "async":
+            fuzzer_class = AsyncFuzzer
+            self.setup_event_loop()
 
-            try:
-                self.set_target(url)
+        if options["coordinator"]:
+            self.coordinator = Coordinator(self, options["coordinator"])
 
-                if not self.directories:
-                    for subdir in options["subdirs"]:
-                        self.add_directory(self.base_path + subdir)
+        self.resolve_targets()
 
-                if not self.old_session:
-                    output.target(self.url)
+        if not self.old_session:
+            self.preflight_targets()
+
+        # 恢复的会话按原来的顺序继续扫描
+        is_parallel = (
+            options["parallel_targets"] > 1 and len(self.targets) > 1 and not self.old_session
+        )
+        self.session = None
 
-                self.start()
+        # 同时扫描多个目标时各目标的进度不保存
+        if options["checkpoint_interval"] and not is_parallel:
+            self.setup_session()
 
-            except (
-                InvalidURLException,
-                RequestException,
-                SkipTargetInterrupt,
-                KeyboardInterrupt,
-            ) as e:
-                self.directories.clear()
-                self.dictionary.reset()
+        if is_parallel:
+            try:
+                TargetScheduler(self, TargetController).run(
+                    fuzzer_class,
+                    response_filter=response_filter,
+                    verdict_cache=verdict_cache,
+                )
+            except QuitInterrupt as e:
+                output.error(e.args[0])
+                exit(0)
+
+            self.targets.clear()
 
-                if e.args:
-                    output.error(str(e))
+        while self.targets:
+            try:
+                self.scan_target(
+                    self.targets[0],
+                    fuzzer_class,
+                    response_filter=response_filter,
+                    verdict_cache=verdict_cache,
+                )
 
             except QuitInterrupt as e:
                 output.error(e.args[0])
@@ -257,16 +350,212 @@ class Controller:
 
             finally:
                 self.targets.pop(0)
+
+        if options["engine"] == "async":
+            self.close_event_loop()
+
+        if options["coordinator"]:
+            self.coordinator.close()
+
+        filter_stats = {
+            f"Filtered ({name})": str(count)
+            for name, count in response_filter.hits.most_common()
+        }
+
+        if verdict_cache.hits or verdict_cache.misses:
+            filter_stats["Verdict cache"] = (
+                f"{verdict_cache.hits} hits, {verdict_cache.misses} misses"
+            )
+
+        if filter_stats:
+            output.statistics(filter_stats)
+
+        if stats.enabled:
+            output.statistics(stats.summary())
+
         current_time = time.strftime("%H:%M:%S")
         message = set_color("Task Completed", fore="yellow", style="bright")
         output.warning(f"[{current_time}] {message}")
 
-        if options["session_file"]:
+        session_file = self.session.path if self.session else options["session_file"]
+
+        if self.session:
+            self.session.close()
+
+        if session_file:
             try:
-                os.remove(options["session_file"])
+                os.remove(session_file)
             except Exception:
                 output.error("Failed to delete old session file, remove it to free some space")
 
+    def resolve_targets(self):
+        """
+        扫描前并行解析所有目标的主机名，避免每个目标开始扫描时才依次解析。
+
+        使用代理或 `--ip` 时由代理解析或不需要解析，跳过。
+        """
+        if options["proxies"] or options["ip"]:
+            return
+
+        start_time = time.time()
+        hosts = set()
+
+        for url in self.targets:
+            try:
+                hosts.add(urlparse(url if "://" in url else f"//{url}").hostname)
+            except ValueError:
+                # 无效的目标在开始扫描时报告
+                pass
+
+        dns_cache.resolve_all(hosts, options["thread_count"])
+        logger.info(f"Resolved {len(hosts)} hosts in {time.time() - start_time:.2f}s")
+
+    def preflight_targets(self):
+        """
+        扫描前并行检测没有指定协议的目标使用 HTTP 还是 HTTPS，补全目标的协议，
+        并去掉无法连接的目标，不再为它们创建Fuzzer。检测结果缓存在 SCHEME_CACHE_FILE 中。
+
+        没有指定端口的目标与 set_target 的规则相同：443 端口是 HTTPS 时使用 HTTPS，
+        否则使用 80 端口的 HTTP。使用代理时直接连接的结果不能说明目标是否可达，
+        只检测没有协议的目标，不去掉任何目标。指定了 `--ip` 时检测该地址，
+        指定了 `--scheme` 时不检测。
+        """
+        if options["scheme"]:
+            return
+
+        is_proxied = bool(options["proxies"])
+        targets = {}
+        probes = {}
+
+        for url in self.targets:
+            try:
+                parsed = urlparse(url if "://" in url else f"//{url}")
+                scheme, host, port = parsed.scheme, parsed.hostname, parsed.port
+            except ValueError:
+                # 无效的目标在开始扫描时报告
+                continue
+
+            if not host or scheme not in ("", "http", "https") or scheme and is_proxied:
+                continue
+
+            targets[url] = (scheme, port)
+            probes[url] = (options["ip"] or host, port or STANDARD_PORTS.get(scheme, 443))
+
+        if not probes:
+            return
+
+        results = detect_schemes(probes.values(), SCHEME_PROBE_THREADS, SCHEME_CACHE_FILE)
+        fallbacks = {
+            url: (host, STANDARD_PORTS["http"])
+            for url, (host, port) in probes.items()
+            if targets[url] == ("", None) and results[host, port] != "https"
+        }
+
+        if fallbacks:
+            results.update(
+                detect_schemes(fallbacks.values(), SCHEME_PROBE_THREADS, SCHEME_CACHE_FILE)
+            )
+
+        reachable = []
+
+        for url in self.targets:
+            if url not in probes:
+                reachable.append(url)
+                continue
+
+            scheme = results[fallbacks.get(url, probes[url])]
+
+            if not scheme and not is_proxied:
+                logger.info(f"Skipped unreachable target: {url}")
+                continue
+
+            if not targets[url][0]:
+                # 无法判断协议时与 detect_scheme 相同，使用 HTTP
+                scheme = "https" if url not in fallbacks and scheme == "https" else "http"
+                url = f"{scheme}://{url}"
+
+            reachable.append(url)
+
+        if len(reachable) < len(self.targets):
+            output.warning(f"Skipped {len(self.targets) - len(reachable)} unreachable targets")
+
+        # 目标列表与 options["urls"] 是同一个对象
+        self.targets[:] = reachable
+
+    def setup_session(self):
+        """
+        创建定期保存的会话文件，恢复的会话继续使用原来的会话文件。
+        """
+        session_file = options["session_file"] or FileUtils.build_path(
+            SCRIPT_PATH, "sessions", time.strftime("%y-%m-%d_%H-%M-%S") + ".pickle"
+        )
+        self.session = SessionJournal(session_file)
+
+        try:
+            self.session.open(self)
+        except OSError:
+            output.error(f"Couldn't create session file at {session_file}")
+            exit(1)
+
+        output.session_file(session_file)
+
+    def checkpoint(self, force=False):
+        """
+        按 `--checkpoint-interval` 把扫描进度追加到会话文件。
+
+        参数:
+            force (bool): 忽略保存间隔立即保存
+        """
+        if self.session:
+            self.session.checkpoint(self, force)
+
+    def scan_target(self, url, fuzzer_class, **kwargs):
+        """
+        为目标创建Fuzzer并扫描其所有目录，跳过目标的异常在此处理。
+
+        参数:
+            url (str): 目标URL
+            fuzzer_class (type): Fuzzer 或 AsyncFuzzer
+            **kwargs: 传给Fuzzer的其他参数
+        """
+        # match_callbacks and not_found_callbacks callback values:
+        #  - *args[0]: lib.connection.Response() object
+        #
+        # error_callbacks callback values:
+        #  - *args[0]: exception
+        self.fuzzer = fuzzer_class(
+            self.requester,
+            self.dictionary,
+            match_callbacks=(self.match_callback, self.reset_consecutive_errors),
+            not_found_callbacks=(self.update_progress_bar, self.reset_consecutive_errors),
+            error_callbacks=(self.raise_error, self.append_error_log),
+            **kwargs,
+        )
+
+        try:
+            self.set_target(url)
+
+            if not self.directories:
+                for subdir in options["subdirs"]:
+                    self.add_directory(self.base_path + subdir)
+
+            if not self.old_session:
+                output.target(self.url)
+
+            self.start()
+
+        except (
+            InvalidURLException,
+            RequestException,
+            SkipTargetInterrupt,
+            KeyboardInterrupt,
+        ) as e:
+            self.directories.clear()
+            self.dictionary.reset()
+
+            if e.args:
+                output.error(str(e))
+
     def start(self):
         """
         开始对当前目标的所有目录进行扫描。
@@ -286,8 +575,16 @@ class Controller:
                     output.warning(msg)
 
                 self.fuzzer.set_base_path(current_directory)
-                self.fuzzer.start()
-                self.process()
+
+                if options["engine"] == "async":
+                    self.loop.run_until_complete(self.process_async())
+                elif options["coordinator"]:
+                    self.coordinator.run(current_directory)
+                elif options["process_count"] > 1:
+                    WorkerPool(self).run(current_directory)
+                else:
+                    self.fuzzer.start()
+                    self.process()
 
             except KeyboardInterrupt:
                 pass
@@ -298,6 +595,7 @@ class Controller:
 
                 self.jobs_processed += 1
                 self.old_session = False
+                self.checkpoint(force=True)
 
     def set_target(self, url):
         """
@@ -396,7 +694,7 @@ class Controller:
         if options["output_format"] in ("plain", "simple"):
             return "txt"
 
-        return {options["output_format"]}
+        return options["output_format"]
 
     def setup_reports(self):
         """
@@ -455,6 +753,8 @@ class Controller:
             self.report = PlainTextReport(output_file)
         elif options["output_format"] == "json":
             self.report = JSONReport(output_file)
+        elif options["output_format"] == "jsonl":
+            self.report = JSONLinesReport(output_file)
         elif options["output_format"] == "xml":
             self.report = XMLReport(output_file)
         elif options["output_format"] == "md":
@@ -468,6 +768,7 @@ class Controller:
         else:
             self.report = SimpleReport(output_file)
 
+        self.report.open()
         output.output_file(output_file)
 
     def reset_consecutive_errors(self, response):
@@ -524,11 +825,19 @@ class Controller:
 
         if options["replay_proxy"]:
             # Replay the request with new proxy
-            self.requester.request(response.full_path, proxy=options["replay_proxy"])
+            if options["engine"] == "async":
+                self.loop.create_task(
+                    self.requester.request(response.full_path, proxy=options["replay_proxy"])
+                )
+            else:
+                self.requester.request(response.full_path, proxy=options["replay_proxy"])
 
         if self.report:
             self.results.append(response)
-            self.report.save(self.results)
+            self.report.add(response)
+
+            if self.session:
+                self.session.add_result(response)
 
     def update_progress_bar(self, response):
         """
@@ -539,6 +848,15 @@ class Controller:
         参数:
             response: HTTP响应对象（仅作为回调参数传递）
         """
+        self.show_progress(self.dictionary.index)
+
+    def show_progress(self, index):
+        """
+        显示当前目录的扫描进度。
+
+        参数:
+            index (int): 当前目录已扫描的路径数量
+        """
         jobs_count = (
             # Jobs left for unscanned targets
             len(options["subdirs"]) * (len(self.targets) - 1)
@@ -549,7 +867,7 @@ class Controller:
         )
 
         output.last_path(
-            self.dictionary.index,
+            index,
             len(self.dictionary),
             self.jobs_processed + 1,
             jobs_count,
@@ -595,8 +913,9 @@ class Controller:
         )
         self.fuzzer.pause()
 
+        # 异步模式下此方法运行在事件循环内部，协程在循环恢复前都不会再发出请求
         start_time = time.time()
-        while True:
+        while options["engine"] != "async":
             is_timed_out = time.time() - start_time > PAUSING_WAIT_TIMEOUT
             if self.fuzzer.is_stopped() or is_timed_out:
                 break
@@ -622,17 +941,22 @@ class Controller:
                 option = input()
 
                 if option.lower() == "s":
-                    msg = f'Save to file [{options["session_file"] or DEFAULT_SESSION_FILE}]: '
+                    default_session_file = (
+                        self.session.path if self.session
+                        else options["session_file"] or DEFAULT_SESSION_FILE
+                    )
+                    msg = f"Save to file [{default_session_file}]: "
 
                     output.in_line(msg)
 
-                    session_file = (
-                        input() or options["session_file"] or DEFAULT_SESSION_FILE
-                    )
+                    session_file = input() or default_session_file
 
                     self._export(session_file)
                     raise QuitInterrupt(f"Session saved to: {session_file}")
                 elif option.lower() == "q":
+                    if self.session:
+                        self.session.discard()
+
                     raise QuitInterrupt("Canceled by the user")
 
             elif option.lower() == "c":
@@ -646,6 +970,21 @@ class Controller:
             elif option.lower() == "s" and len(self.targets) > 1:
                 raise SkipTargetInterrupt("Target skipped by the user")
 
+    def handle_async_pause(self):
+        """
+        异步模式下的 Ctrl+C 信号处理函数。
+
+        信号回调中抛出的异常无法传递给正在运行的协程，因此将其设置到 pause_future 上，
+        由 process_async 负责重新抛出。
+        """
+        try:
+            self.handle_pause()
+        except (QuitInterrupt, SkipTargetInterrupt) as e:
+            if self.pause_future and not self.pause_future.done():
+                self.pause_future.set_exception(e)
+            else:
+                raise
+
     def is_timed_out(self):
         """
         检查是否已超出最大允许运行时间限制。
@@ -669,11 +1008,48 @@ class Controller:
                             "Runtime exceeded the maximum set by the user"
                         )
 
+                    self.checkpoint()
+
                 break
 
             except KeyboardInterrupt:
                 self.handle_pause()
 
+    async def process_async(self):
+        """
+        异步模式下运行当前Fuzzer并等待其完成。
+
+        在等待期间持续检测是否达到超时条件或用户在暂停菜单中选择了退出/跳过。
+        """
+        self.pause_future = self.loop.create_future()
+        task = self.loop.create_task(self.fuzzer.start())
+
+        try:
+            while not task.done():
+                await asyncio.wait(
+                    (task, self.pause_future),
+                    timeout=0.25,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                if self.pause_future.done():
+                    # 重新抛出暂停菜单中产生的中断异常
+                    self.pause_future.result()
+
+                if self.is_timed_out():
+                    raise SkipTargetInterrupt(
+                        "Runtime exceeded the maximum set by the user"
+                    )
+
+                self.checkpoint()
+
+            task.result()
+
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
     def add_directory(self, path):
         """
         添加一个新的目录路径进入递归扫描队列。
@@ -747,3 +1123,37 @@ class Controller:
             return self.recur(redirect_path)
 
         return []
+
+
+class TargetController(Controller):
+    """
+    同时扫描多个目标时负责单个目标的控制器，由 TargetScheduler 创建并在单独的线程中运行。
+
+    每个目标有自己的请求发送器、字典、目录队列和错误计数，与主控制器共用报告和开始时间，
+    因此 `--max-time`、`--skip-on-status` 和连续错误跳过都只作用于当前目标。
+    """
+
+    def __init__(self, scheduler, url):
+        """
+        参数:
+            scheduler (TargetScheduler): 所属的调度器
+            url (str): 要扫描的目标URL
+        """
+        parent = scheduler.controller
+
+        self.scheduler = scheduler
+        self.setup_requester(scheduler.thread_count, scheduler.rate_limiter)
+        self.requester.host_slots = scheduler.get_host_slots(url)
+        self.dictionary = Dictionary(files=options["wordlists"])
+        self.results = []
+        self.targets = [url]
+        self.start_time = parent.start_time
+        self.passed_urls = set()
+        self.directories = []
+        self.report = parent.report
+        self.batch = parent.batch
+        self.jobs_processed = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.old_session = False
+        self.session = None
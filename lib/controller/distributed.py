@@ -0,0 +1,435 @@
+import collections
+import hmac
+import json
+import os
+import queue
+import secrets
+import socket
+import threading
+import time
+import uuid
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from lib.connection.response import Response
+from lib.controller.workers import WorkerPool, scan_shard
+from lib.core.data import blacklists, options
+from lib.core.dictionary import get_blacklists
+from lib.core.exceptions import QuitInterrupt
+from lib.core.logger import logger
+from lib.core.settings import (
+    DISTRIBUTED_LEASE_TIMEOUT,
+    DISTRIBUTED_LOCAL_OPTIONS,
+    DISTRIBUTED_MAX_ATTEMPTS,
+    DISTRIBUTED_REPORT_INTERVAL,
+    DISTRIBUTED_TOKEN_HEADER,
+    DISTRIBUTED_UNIT_COUNT,
+)
+from lib.view.terminal import output
+
+
+def parse_address(address):
+    """
+    解析 `主机:端口` 形式的地址
+
+    参数:
+        address (str): 地址字符串
+
+    返回:
+        tuple: (主机, 端口)
+
+    异常:
+        ValueError: 地址格式不正确时抛出
+    """
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+class CoordinatorHandler(BaseHTTPRequestHandler):
+    """
+    协调节点的 HTTP 接口，请求和响应都是 JSON：
+
+    - POST /lease  领取工作单元，返回工作单元和扫描选项，暂时没有时返回 wait，扫描结束时返回 done
+    - POST /report 汇报一个租约的消息并续租，租约已失效时返回 cancel
+
+    所有请求都需要在 X-Cluster-Token 请求头中带上共享令牌，否则返回 401。
+    """
+
+    def do_POST(self):
+        coordinator = self.server.coordinator
+        token = self.headers.get(DISTRIBUTED_TOKEN_HEADER, "")
+
+        if not hmac.compare_digest(token.encode(), coordinator.token.encode()):
+            self.send_error(401)
+            return
+
+        length = int(self.headers.get("content-length", 0))
+        data = json.loads(self.rfile.read(length) or b"{}")
+
+        if self.path == "/lease":
+            reply = coordinator.lease(data)
+        elif self.path == "/report":
+            reply = coordinator.report(data)
+        else:
+            self.send_error(404)
+            return
+
+        body = json.dumps(reply).encode()
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.info(f"Coordinator: {self.address_string()} {format % args}")
+
+
+class Coordinator(WorkerPool):
+    """
+    分布式扫描的协调节点，持有目标和目录队列，把每个目录拆分成若干工作单元
+    (目标, 目录, 词典分片) 交给通过 HTTP 连接的工作节点扫描。
+
+    工作节点领取工作单元时得到一个租约，之后定期汇报扫描消息并续租；租约超时未续或
+    工作节点扫描失败的工作单元会被重新放回队列，交给其他工作节点重新扫描，
+    扫描失败 DISTRIBUTED_MAX_ATTEMPTS 次后跳过当前目标。工作节点发回的消息与多进程扫描相同，
+    由 WorkerPool.handle 交给控制器原有的回调处理。
+
+    扫描选项中包含认证信息，只下发给带有共享令牌的工作节点；未指定 `--cluster-token`
+    时随机生成令牌并显示。
+
+    参数:
+        controller (Controller): 控制器
+        address (str): 监听地址，`主机:端口`
+    """
+
+    def __init__(self, controller, address):
+        super().__init__(controller)
+        self.count = DISTRIBUTED_UNIT_COUNT
+        self._lock = threading.Lock()
+        self._units = collections.deque()
+        self._leases = {}
+        self._messages = queue.Queue()
+        self._is_finished = False
+        self.token = options["cluster_token"] or secrets.token_urlsafe(16)
+        # 集合、元组等无法直接转换为 JSON，工作节点按本地选项的类型还原
+        self._options = json.loads(json.dumps(
+            {key: value for key, value in options.items() if key not in DISTRIBUTED_LOCAL_OPTIONS},
+            default=list,
+        ))
+
+        if not options["cluster_token"]:
+            output.warning(f"Workers must connect with --cluster-token {self.token}")
+
+        self.server = ThreadingHTTPServer(parse_address(address), CoordinatorHandler)
+        self.server.daemon_threads = True
+        self.server.coordinator = self
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def address(self):
+        """
+        实际监听的地址，端口为 0 时由系统分配。
+
+        返回:
+            tuple: (主机, 端口)
+        """
+        return self.server.server_address
+
+    def run(self, base_path):
+        """
+        把一个目录拆分成工作单元，等待工作节点全部扫描完成。
+
+        参数:
+            base_path (str): 要扫描的目录。
+
+        异常:
+            SkipTargetInterrupt: 超出最长运行时间、目标无法访问、工作单元多次扫描失败
+                或回调要求跳过目标时抛出。
+            QuitInterrupt: 用户按下 Ctrl+C 时抛出。
+        """
+        self.index = 0
+        units = {}
+
+        for index in range(self.count):
+            unit = {
+                "id": uuid.uuid4().hex,
+                "url": self.controller.url,
+                "base_path": base_path,
+                "shard": [index, self.count],
+            }
+            units[unit["id"]] = unit
+
+        # 每个工作单元已汇报的进度，重新分配时从总进度中扣除
+        progress = dict.fromkeys(units, 0)
+        # 每个工作单元扫描失败的次数
+        failures = dict.fromkeys(units, 0)
+        # 重新分配的工作单元可能再次发现相同的路径
+        found = set()
+
+        with self._lock:
+            self._units.extend(units.values())
+
+        try:
+            while units:
+                self.expire_leases(progress)
+
+                try:
+                    unit_id, message = self._messages.get(timeout=0.25)
+                except queue.Empty:
+                    self.check(())
+                    continue
+
+                if unit_id not in units:
+                    continue
+
+                if message[0] == "match":
+                    if message[1].url in found:
+                        continue
+
+                    found.add(message[1].url)
+
+                elif message[0] == "progress":
+                    progress[unit_id] += message[1]
+
+                elif message[0] == "failed":
+                    failures[unit_id] += 1
+
+                    if failures[unit_id] < DISTRIBUTED_MAX_ATTEMPTS:
+                        logger.warning(f"Shard failed on a worker, re-queueing: {message[1]}")
+
+                        with self._lock:
+                            self.requeue(units[unit_id], progress)
+
+                        continue
+
+                    message = ("skip", f"Shard failed {failures[unit_id]} times: {message[1]}")
+
+                if self.handle(message):
+                    del units[unit_id]
+
+        except KeyboardInterrupt:
+            # 分布式模式下不提供暂停菜单
+            raise QuitInterrupt("Canceled by the user")
+
+        finally:
+            # 被跳过的目录中尚未完成的租约在下次汇报时会收到 cancel
+            with self._lock:
+                self._units.clear()
+                self._leases.clear()
+
+    def expire_leases(self, progress):
+        """
+        把租约超时的工作单元放回队列。
+
+        参数:
+            progress (dict): 每个工作单元已汇报的进度。
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            for lease_id, (unit, deadline) in list(self._leases.items()):
+                if deadline > now:
+                    continue
+
+                del self._leases[lease_id]
+                self.requeue(unit, progress)
+                logger.warning(f'Lease {lease_id} expired, re-queueing shard {unit["shard"]}')
+
+    def requeue(self, unit, progress):
+        """
+        把工作单元放回队列最前面，并从总进度中扣除它已汇报的进度，需要持有锁。
+
+        参数:
+            unit (dict): 工作单元。
+            progress (dict): 每个工作单元已汇报的进度。
+        """
+        self._units.appendleft(unit)
+        self.index -= progress[unit["id"]]
+        progress[unit["id"]] = 0
+
+    def lease(self, data):
+        """
+        处理工作节点领取工作单元的请求。
+
+        参数:
+            data (dict): 请求内容，包含工作节点名称。
+
+        返回:
+            dict: 回复内容。
+        """
+        with self._lock:
+            if self._is_finished:
+                return {"done": True}
+
+            if not self._units:
+                return {"wait": DISTRIBUTED_REPORT_INTERVAL}
+
+            unit = self._units.popleft()
+            lease_id = uuid.uuid4().hex
+            self._leases[lease_id] = (unit, time.monotonic() + DISTRIBUTED_LEASE_TIMEOUT)
+
+        logger.info(f'Leased shard {unit["shard"]} of /{unit["base_path"]} to {data.get("worker")}')
+        return {"lease": lease_id, "unit": unit, "options": self._options}
+
+    def report(self, data):
+        """
+        处理工作节点的汇报：续租并把消息转交给 run 所在的线程。
+
+        参数:
+            data (dict): 请求内容，包含租约和消息列表。
+
+        返回:
+            dict: 回复内容，租约已失效时 cancel 为 True。
+        """
+        with self._lock:
+            if data.get("lease") not in self._leases:
+                return {"cancel": True}
+
+            unit, _ = self._leases[data["lease"]]
+            self._leases[data["lease"]] = (unit, time.monotonic() + DISTRIBUTED_LEASE_TIMEOUT)
+
+            for kind, *args in data.get("messages", []):
+                if kind == "match":
+                    args = [Response.from_dict(args[0])]
+                elif kind in ("done", "skip", "failed"):
+                    del self._leases[data["lease"]]
+
+                self._messages.put((unit["id"], (kind, *args)))
+
+        return {"cancel": False}
+
+    def close(self):
+        """
+        通知工作节点扫描已结束并停止监听。
+        """
+        self._is_finished = True
+        # 等待正在询问的工作节点收到 done
+        time.sleep(DISTRIBUTED_REPORT_INTERVAL * 2)
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def run_worker(address):
+    """
+    以工作节点身份运行：不断从协调节点领取工作单元并扫描，直到协调节点通知扫描结束。
+
+    扫描使用协调节点下发的选项，线程数和每秒最大请求数使用本机的设置，
+    字典文件需要在工作节点上的相同路径存在。
+
+    参数:
+        address (str): 协调节点地址，`主机:端口`
+    """
+    host, port = parse_address(address)
+    url = f"http://{host}:{port}"
+    name = f"{socket.gethostname()}-{os.getpid()}"
+    session = requests.Session()
+    session.headers[DISTRIBUTED_TOKEN_HEADER] = options["cluster_token"]
+
+    blacklists.update(get_blacklists())
+    output.warning(f"Worker {name} connecting to coordinator {url}")
+
+    is_connected = False
+
+    while True:
+        try:
+            response = session.post(
+                f"{url}/lease", json={"worker": name}, timeout=options["timeout"]
+            )
+            if response.status_code == 401:
+                output.error(f"Coordinator at {url} rejected the cluster token")
+                return
+
+            reply = response.json()
+        except requests.RequestException:
+            # 协调节点可能还没有启动，连接成功过之后才视为协调节点已退出
+            if not is_connected:
+                time.sleep(DISTRIBUTED_REPORT_INTERVAL)
+                continue
+
+            output.error(f"Coordinator at {url} is unreachable")
+            return
+
+        is_connected = True
+
+        if reply.get("done"):
+            output.warning("Coordinator finished the scan")
+            return
+
+        if "wait" in reply:
+            time.sleep(reply["wait"])
+            continue
+
+        for key, value in reply["options"].items():
+            if key in DISTRIBUTED_LOCAL_OPTIONS:
+                continue
+
+            if isinstance(options.get(key), (set, tuple)):
+                value = type(options[key])(value)
+
+            options[key] = value
+
+        run_unit(session, url, reply["lease"], reply["unit"])
+
+
+def run_unit(session, url, lease, unit):
+    """
+    扫描一个工作单元，定期把扫描消息汇报给协调节点。
+
+    参数:
+        session (requests.Session): 与协调节点通信的会话
+        url (str): 协调节点地址
+        lease (str): 租约
+        unit (dict): 工作单元
+    """
+    buffer = []
+    lock = threading.Lock()
+    stop_event = threading.Event()
+    finished = threading.Event()
+
+    current_time = time.strftime("%H:%M:%S")
+    index, count = unit["shard"]
+    output.new_line(f'[{current_time}] Scanning {unit["url"]}{unit["base_path"]} (shard {index + 1}/{count})')
+
+    def send(message):
+        if message[0] == "match":
+            output.status_report(message[1], True)
+            message = ("match", message[1].to_dict())
+
+        with lock:
+            buffer.append(message)
+
+    def flush():
+        with lock:
+            messages = buffer[:]
+            buffer.clear()
+
+        try:
+            reply = session.post(
+                f"{url}/report",
+                json={"lease": lease, "messages": messages},
+                timeout=options["timeout"],
+            ).json()
+        except requests.RequestException:
+            # 下次汇报时重试，租约超时后工作单元会被重新分配
+            with lock:
+                buffer[:0] = messages
+            return
+
+        if reply.get("cancel"):
+            stop_event.set()
+
+    def report_periodically():
+        while not finished.wait(DISTRIBUTED_REPORT_INTERVAL):
+            flush()
+
+    reporter = threading.Thread(target=report_periodically, daemon=True)
+    reporter.start()
+
+    scan_shard(unit["shard"], unit["url"], unit["base_path"], send, stop_event)
+
+    finished.set()
+    reporter.join()
+    flush()
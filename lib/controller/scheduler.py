@@ -0,0 +1,112 @@
+import collections
+import threading
+
+from urllib.parse import urlparse
+
+from lib.connection.ratelimit import TokenBucket
+from lib.core.data import options
+from lib.core.exceptions import QuitInterrupt
+
+
+class TargetScheduler:
+    """
+    多目标调度器，同时扫描 `--parallel-targets` 个目标，每个目标在单独的线程中由一个子控制器扫描。
+
+    `thread_count` 选项是所有目标共用的并发预算，平均分配给同时扫描的目标；
+    `--max-rate` 是所有目标合计的速率，所有目标的请求发送器共用同一个限速器；
+    `--host-connections` 限制同一主机（不区分端口和协议）所有目标同时在途的请求数。
+    每个目标的进度、错误计数和结果互相独立，结果按发现的顺序写入同一份报告。
+
+    参数:
+        controller (Controller): 主控制器，提供目标列表、报告和开始时间。
+        controller_class (type): 扫描单个目标的子控制器类，构造参数为 (调度器, 目标URL)。
+    """
+
+    def __init__(self, controller, controller_class):
+        self.controller = controller
+        self.controller_class = controller_class
+        self.size = min(options["parallel_targets"], len(controller.targets))
+        self.thread_count = max(options["thread_count"] // self.size, 1)
+        self.rate_limiter = TokenBucket(options["max_rate"], options["rate_burst"])
+        self.controllers = []
+        self.exc = None
+        self._host_slots = {}
+
+    def get_host_slots(self, url):
+        """
+        获取目标所在主机共用的在途请求数限制。
+
+        参数:
+            url (str): 目标URL，可以不带协议。
+
+        返回:
+            threading.BoundedSemaphore: 同一主机的目标共用同一个信号量，未限制时返回 None。
+        """
+        if not options["host_connections"]:
+            return None
+
+        host = urlparse(url if "://" in url else f"//{url}").hostname
+
+        if host not in self._host_slots:
+            self._host_slots[host] = threading.BoundedSemaphore(options["host_connections"])
+
+        return self._host_slots[host]
+
+    def run(self, fuzzer_class, **kwargs):
+        """
+        扫描所有目标，直到全部完成或用户中断。
+
+        参数:
+            fuzzer_class (type): 使用的Fuzzer类。
+            **kwargs: 传给每个Fuzzer的其他参数。
+
+        异常:
+            QuitInterrupt: 用户按下 Ctrl+C 或某个目标要求退出时抛出。
+        """
+        # 多个目标的结果交替输出，需要显示完整URL才能区分
+        options["full_url"] = True
+
+        pending = collections.deque(self.controller.targets)
+        threads = []
+
+        try:
+            while pending or threads:
+                while pending and len(threads) < self.size:
+                    controller = self.controller_class(self, pending.popleft())
+                    self.controllers.append(controller)
+
+                    thread = threading.Thread(
+                        target=self.scan, args=(controller, fuzzer_class, kwargs)
+                    )
+                    thread.daemon = True
+                    thread.start()
+                    threads.append(thread)
+
+                threads[0].join(0.25)
+                threads = [thread for thread in threads if thread.is_alive()]
+
+                if self.exc:
+                    raise self.exc
+
+        except KeyboardInterrupt:
+            # 多目标模式下不提供暂停菜单，未完成的目标随进程退出
+            raise QuitInterrupt("Canceled by the user")
+
+    def scan(self, controller, fuzzer_class, kwargs):
+        """
+        在工作线程中扫描单个目标，并把需要终止整个扫描的异常交给主线程。
+
+        参数:
+            controller (Controller): 负责该目标的子控制器。
+            fuzzer_class (type): 使用的Fuzzer类。
+            kwargs (dict): 传给Fuzzer的其他参数。
+        """
+        try:
+            controller.scan_target(
+                controller.targets[0],
+                fuzzer_class,
+                thread_count=self.thread_count,
+                **kwargs,
+            )
+        except Exception as e:
+            self.exc = e
@@ -0,0 +1,204 @@
+import copy
+import os
+import threading
+import time
+
+from lib.connection.response import Response
+from lib.core.data import options
+from lib.core.exceptions import UnpicklingError
+from lib.core.settings import SESSION_EXCLUDED_ATTRIBUTES
+from lib.utils.file import FileUtils
+from lib.utils.pickle import pickle, unpickle
+from lib.view.terminal import output
+
+
+class SessionJournal:
+    """
+    只追加写入的会话文件，扫描过程中定期保存，程序崩溃或被强制结束后也能恢复。
+
+    文件由一串独立的 pickle 记录组成：
+
+    - ("options", 选项)          文件开头，只有一条
+    - ("result", 响应字典)        每发现一个路径立即追加，响应用 Response.to_dict 保存
+    - ("output", 文本)            上次保存后新增的终端输出
+    - ("state", 控制器状态)        定期追加，恢复时使用最后一条
+
+    控制器状态不包含词典中的路径和已发现的响应，词典只保存读取位置，
+    因此每次保存的开销与词典大小和结果数量无关。最后一条记录不完整时（写入中途崩溃）被忽略。
+
+    参数:
+        path (str): 会话文件路径
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+        self._lock = threading.Lock()
+        self._last_save = 0
+        self._output_count = 0
+
+    @staticmethod
+    def load(path):
+        """
+        读取会话文件，兼容旧版本一次性序列化的会话文件。
+
+        参数:
+            path (str): 会话文件路径
+
+        返回:
+            tuple: (控制器状态, 已发现的响应列表, 终端输出, 选项)
+
+        异常:
+            UnpicklingError: 文件格式无效或没有任何可恢复的状态时抛出
+        """
+        state = None
+        opts = None
+        results = []
+        last_output = ""
+
+        with open(path, "rb") as fd:
+            while True:
+                try:
+                    record = unpickle(fd)
+                except EOFError:
+                    break
+                except UnpicklingError:
+                    raise
+                except Exception:
+                    # 写入中途崩溃留下的不完整记录
+                    break
+
+                # 旧版本的会话文件: (控制器属性, 终端输出, 选项)
+                if len(record) == 3:
+                    state, last_output, opts = record
+                    results = state.pop("results", [])
+                    break
+
+                kind, data = record
+
+                if kind == "options":
+                    opts = data
+                elif kind == "result":
+                    results.append(Response.from_dict(data))
+                elif kind == "output":
+                    last_output += data
+                elif kind == "state":
+                    state = data
+
+        if state is None or opts is None:
+            raise UnpicklingError()
+
+        return state, results, last_output.rstrip(), opts
+
+    def open(self, controller):
+        """
+        创建会话文件并写入当前的完整状态，之后的保存都追加到该文件。
+
+        先写入临时文件再替换，恢复的会话继续写入原文件时不会在中途丢失原有内容。
+
+        参数:
+            controller (Controller): 控制器
+        """
+        FileUtils.create_dir(FileUtils.parent(FileUtils.get_abs_path(self.path)))
+        temp_path = f"{self.path}.tmp"
+
+        with self._lock:
+            self._fd = open(temp_path, "wb")
+            self._write("options", dict(options))
+
+            for response in controller.results:
+                self._write("result", response.to_dict())
+
+        self.checkpoint(controller, force=True)
+
+        with self._lock:
+            self._fd.close()
+            os.replace(temp_path, self.path)
+            self._fd = open(self.path, "ab")
+
+    def add_result(self, response):
+        """
+        追加一个发现的响应。
+
+        参数:
+            response (Response): 响应对象
+        """
+        with self._lock:
+            if self._fd:
+                self._write("result", response.to_dict())
+                self._fd.flush()
+
+    def checkpoint(self, controller, force=False):
+        """
+        追加新增的终端输出和控制器状态，距离上次保存不足 `--checkpoint-interval` 秒时跳过。
+
+        参数:
+            controller (Controller): 控制器
+            force (bool): 忽略保存间隔立即保存
+        """
+        if not force and time.time() - self._last_save < options["checkpoint_interval"]:
+            return
+
+        state = get_session_state(controller)
+
+        with self._lock:
+            if not self._fd:
+                return
+
+            # 只保存上次保存后新增的输出
+            new_output, self._output_count = output.read_buffer(self._output_count)
+
+            if new_output:
+                self._write("output", new_output)
+
+            self._write("state", state)
+            self._fd.flush()
+            os.fsync(self._fd.fileno())
+
+        self._last_save = time.time()
+
+    def close(self):
+        """
+        关闭会话文件，文件本身保留以便之后恢复。
+        """
+        with self._lock:
+            if self._fd:
+                self._fd.close()
+                self._fd = None
+
+    def discard(self):
+        """
+        关闭并删除会话文件。
+        """
+        self.close()
+
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _write(self, kind, data):
+        pickle((kind, data), self._fd)
+
+
+def get_session_state(controller):
+    """
+    获取控制器中需要保存到会话的状态。
+
+    参数:
+        controller (Controller): 控制器
+
+    返回:
+        dict: 控制器属性，词典替换为只包含读取位置的副本
+    """
+    # 目录队列等容器可能正被工作线程修改，先复制再序列化
+    state = {
+        key: copy.copy(value) if isinstance(value, (list, set, dict)) else value
+        for key, value in vars(controller).items()
+        if key not in SESSION_EXCLUDED_ATTRIBUTES
+    }
+    fuzzer = getattr(controller, "fuzzer", None)
+    state["dictionary"] = controller.dictionary.checkpoint(
+        fuzzer.get_pending_paths if fuzzer else None
+    )
+    return state
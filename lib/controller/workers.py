@@ -0,0 +1,268 @@
+import multiprocessing
+import queue
+import signal
+import threading
+
+from urllib.parse import urlparse
+
+from lib.connection.dns import cache_dns
+from lib.connection.requester import HTTP2Requester, Requester
+from lib.core.data import blacklists, options
+from lib.core.dictionary import Dictionary
+from lib.core.exceptions import QuitInterrupt, RequestException, SkipTargetInterrupt
+from lib.core.fuzzer import Fuzzer
+from lib.core.settings import STANDARD_PORTS
+
+
+class WorkerPool:
+    """
+    多进程扫描，每个目录启动 `--processes` 个工作进程，每个进程用自己的请求发送器和 Fuzzer
+    扫描词典的一个分片。比较响应、爬取页面等耗 CPU 的工作分散到多个进程，不再受 GIL 限制。
+
+    工作进程通过队列把发现的响应、扫描进度、请求错误和过滤统计发回主进程，
+    由主进程调用控制器原有的回调，终端输出和报告仍然只有一份。
+
+    参数:
+        controller (Controller): 当前目标的控制器，其 Fuzzer 提供回调和共用的过滤统计。
+    """
+
+    def __init__(self, controller):
+        self.controller = controller
+        self.count = options["process_count"]
+        self.index = 0
+
+    def run(self, base_path):
+        """
+        用多个进程扫描一个目录，直到所有进程完成。
+
+        参数:
+            base_path (str): 要扫描的目录。
+
+        异常:
+            SkipTargetInterrupt: 超出最长运行时间、目标无法访问或回调要求跳过目标时抛出。
+            QuitInterrupt: 用户按下 Ctrl+C 或工作进程异常退出时抛出。
+        """
+        results = multiprocessing.Queue()
+        stop_event = multiprocessing.Event()
+        processes = [
+            multiprocessing.Process(
+                target=worker_main,
+                args=(
+                    (index, self.count),
+                    self.controller.url,
+                    base_path,
+                    get_shard_options(options, self.count),
+                    dict(blacklists),
+                    results,
+                    stop_event,
+                ),
+                daemon=True,
+            )
+            for index in range(self.count)
+        ]
+
+        for process in processes:
+            process.start()
+
+        finished = 0
+
+        try:
+            while finished < len(processes):
+                try:
+                    message = results.get(timeout=0.25)
+                except queue.Empty:
+                    self.check(processes)
+                    continue
+
+                if self.handle(message):
+                    finished += 1
+
+        except KeyboardInterrupt:
+            # 多进程模式下不提供暂停菜单
+            raise QuitInterrupt("Canceled by the user")
+
+        finally:
+            stop_event.set()
+
+            for process in processes:
+                process.join(1)
+
+                if process.is_alive():
+                    process.terminate()
+
+    def check(self, processes):
+        """
+        没有新消息时检查运行时间和工作进程状态。
+
+        参数:
+            processes (list): 工作进程列表。
+        """
+        if self.controller.is_timed_out():
+            raise SkipTargetInterrupt("Runtime exceeded the maximum set by the user")
+
+        # 进程正常结束前一定会发出 done 消息，队列为空时说明进程异常退出
+        for process in processes:
+            if process.exitcode:
+                raise QuitInterrupt(f"Worker process exited with code {process.exitcode}")
+
+    def handle(self, message):
+        """
+        处理工作进程发来的一条消息。
+
+        参数:
+            message (tuple): (消息类型, 数据...)
+
+        返回:
+            bool: 该工作进程已完成时返回True。
+        """
+        kind, *data = message
+        fuzzer = self.controller.fuzzer
+
+        if kind == "match":
+            for callback in fuzzer.match_callbacks:
+                callback(data[0])
+
+        elif kind == "progress":
+            self.index += data[0]
+            self.controller.reset_consecutive_errors(None)
+            self.controller.show_progress(self.index)
+
+        elif kind == "error":
+            for callback in fuzzer.error_callbacks:
+                callback(RequestException(data[0]))
+
+        elif kind == "skip":
+            # 与单进程模式相同，目标无法访问时只跳过当前目标
+            raise SkipTargetInterrupt(data[0])
+
+        elif kind == "failed":
+            raise QuitInterrupt(f"Worker process failed: {data[0]}")
+
+        elif kind == "done":
+            hits, cache_hits, cache_misses = data
+            fuzzer.response_filter.hits.update(hits)
+            fuzzer.verdict_cache.hits += cache_hits
+            fuzzer.verdict_cache.misses += cache_misses
+            return True
+
+        return False
+
+
+def get_shard_options(opts, count):
+    """
+    获取一个工作进程使用的选项。`--max-rate` 和 `--threads` 是所有进程共用的预算，
+    与 TargetScheduler 分配线程数的方式相同平均分给每个进程，否则 N 个进程会以 N 倍的
+    速率和连接数扫描同一个主机。
+
+    参数:
+        opts (dict): 主进程的选项
+        count (int): 工作进程数量
+
+    返回:
+        dict: 限速和线程数为每个进程份额的选项副本
+    """
+    opts = dict(opts)
+    opts["thread_count"] = max(opts["thread_count"] // count, 1)
+
+    if opts["max_rate"]:
+        opts["max_rate"] = opts["max_rate"] / count
+
+    if opts["rate_burst"]:
+        opts["rate_burst"] = max(opts["rate_burst"] // count, 1)
+
+    return opts
+
+
+def worker_main(shard, url, base_path, opts, blacklist, results, stop_event):
+    """
+    工作进程入口，扫描词典的一个分片并把结果发回主进程。
+
+    参数:
+        shard (tuple): (分片序号, 分片数)
+        url (str): 目标URL
+        base_path (str): 要扫描的目录
+        opts (dict): 主进程的选项
+        blacklist (dict): 主进程的状态码黑名单
+        results (multiprocessing.Queue): 发回主进程的消息队列
+        stop_event (multiprocessing.Event): 主进程要求停止时被设置
+    """
+    # Ctrl+C 由主进程处理
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # 以 spawn 方式启动时全局状态不会被继承
+    options.update(opts)
+    blacklists.update(blacklist)
+
+    scan_shard(shard, url, base_path, results.put, stop_event)
+
+
+def scan_shard(shard, url, base_path, send, stop_event):
+    """
+    用一个 Fuzzer 扫描词典的一个分片，通过 send 发出 WorkerPool.handle 能处理的消息。
+    请求错误等需要跳过目标的异常发出 skip，其他异常发出 failed。
+
+    参数:
+        shard (tuple): (分片序号, 分片数)
+        url (str): 目标URL
+        base_path (str): 要扫描的目录
+        send (callable): 接收一条消息的函数
+        stop_event: 要求停止时被设置的事件对象
+    """
+    try:
+        if options["ip"]:
+            parsed = urlparse(url)
+            cache_dns(parsed.hostname, parsed.port or STANDARD_PORTS[parsed.scheme], options["ip"])
+
+        requester = HTTP2Requester() if options["http2"] else Requester()
+        requester.set_url(url)
+
+        if options["auth"]:
+            requester.set_auth(options["auth_type"], options["auth"])
+
+        if options["proxy_auth"]:
+            requester.set_proxy_auth(options["proxy_auth"])
+
+        progress = [0]
+        lock = threading.Lock()
+
+        def count(response):
+            with lock:
+                progress[0] += 1
+
+        def send_progress():
+            with lock:
+                scanned, progress[0] = progress[0], 0
+
+            if scanned:
+                send(("progress", scanned))
+
+        fuzzer = Fuzzer(
+            requester,
+            Dictionary(files=options["wordlists"], shard=tuple(shard)),
+            match_callbacks=(lambda response: send(("match", response)), count),
+            not_found_callbacks=(count,),
+            error_callbacks=(lambda e: send(("error", str(e))),),
+        )
+        fuzzer.set_base_path(base_path)
+        fuzzer.start()
+
+        while not fuzzer.wait(0.25):
+            if stop_event.is_set():
+                fuzzer.stop()
+
+            # 进度按时间间隔汇总发送，避免每个响应一条消息
+            send_progress()
+
+        send_progress()
+        send((
+            "done",
+            dict(fuzzer.response_filter.hits),
+            fuzzer.verdict_cache.hits,
+            fuzzer.verdict_cache.misses,
+        ))
+
+    except (RequestException, SkipTargetInterrupt) as e:
+        send(("skip", str(e)))
+
+    except Exception as e:
+        send(("failed", f"{type(e).__name__}: {e}"))
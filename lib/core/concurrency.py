@@ -0,0 +1,125 @@
+import threading
+
+from lib.core.logger import logger
+from lib.core.settings import (
+    ADAPTIVE_DECREASE_FACTOR,
+    ADAPTIVE_EWMA_WEIGHT,
+    ADAPTIVE_LATENCY_TOLERANCE,
+    THROTTLE_STATUS_CODES,
+)
+
+
+class AdaptiveConcurrency:
+    """
+    基于 AIMD（加性增、乘性减）的自适应并发控制器
+
+    根据每个请求的延迟、请求错误以及 429/503 等限流状态码，在 [minimum, maximum]
+    范围内动态调整允许同时工作的线程（或异步协程）数量：
+      - 起步阶段每个成功请求使并发数加一（慢启动），直到第一次出现拥塞信号；
+      - 之后每完成一轮（当前并发数个）成功请求，并发数加一；
+      - 出现错误、限流状态码或平均延迟超过基准延迟的 ADAPTIVE_LATENCY_TOLERANCE 倍时，
+        并发数乘以 ADAPTIVE_DECREASE_FACTOR，且每轮最多减少一次，避免在途请求的错误连续触发。
+
+    工作者通过 is_allowed(index) 判断自己是否在当前并发上限之内，超出上限的工作者暂停取新路径。
+
+    Args:
+        minimum (int): 最小并发数
+        maximum (int): 最大并发数
+    """
+
+    def __init__(self, minimum, maximum):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = self.minimum
+        self._slow_start = True
+        self._successes = 0
+        self._since_decrease = 0
+        self._latency = None
+        self._baseline = None
+        self._condition = threading.Condition()
+
+    def is_allowed(self, index):
+        """
+        判断编号为 index 的工作者当前是否可以继续工作
+
+        Args:
+            index (int): 工作者编号，从 0 开始
+
+        Returns:
+            bool: 编号小于当前并发上限时返回 True
+        """
+        return index < self.limit
+
+    def wait_for_slot(self, index, timeout):
+        """
+        阻塞等待直到编号为 index 的工作者被允许工作或超时（供线程引擎使用）
+
+        Args:
+            index (int): 工作者编号
+            timeout (float): 最长等待时间（秒）
+
+        Returns:
+            bool: 是否被允许工作
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self.is_allowed(index), timeout)
+
+    def record(self, latency, status=None):
+        """
+        记录一次成功请求的延迟和状态码，并据此调整并发数
+
+        Args:
+            latency (float): 请求耗时（秒）
+            status (int, optional): 响应状态码
+        """
+        with self._condition:
+            self._since_decrease += 1
+
+            if status in THROTTLE_STATUS_CODES:
+                self._decrease(f"received {status} status code")
+                return
+
+            if self._latency is None:
+                self._latency = latency
+            else:
+                self._latency += (latency - self._latency) * ADAPTIVE_EWMA_WEIGHT
+
+            if self._baseline is None or self._latency < self._baseline:
+                self._baseline = self._latency
+
+            if self._latency > self._baseline * ADAPTIVE_LATENCY_TOLERANCE:
+                self._decrease(f"average latency rose to {self._latency:.3f}s")
+                return
+
+            self._successes += 1
+
+            if self._slow_start or self._successes >= self.limit:
+                self._successes = 0
+                self._increase()
+
+    def record_error(self):
+        """记录一次请求错误（连接失败、超时等），视为拥塞信号"""
+        with self._condition:
+            self._since_decrease += 1
+            self._decrease("request error")
+
+    def _increase(self):
+        if self.limit < self.maximum:
+            self.limit += 1
+            self._condition.notify_all()
+
+    def _decrease(self, reason):
+        # 每轮最多减少一次，忽略减少之前已经发出的请求带来的信号
+        if self._since_decrease < self.limit:
+            return
+
+        self._slow_start = False
+        self._successes = 0
+        self._since_decrease = 0
+        # 延迟基准随之重置，避免目标整体变慢后持续误判
+        self._baseline = self._latency
+
+        new_limit = max(self.minimum, int(self.limit * ADAPTIVE_DECREASE_FACTOR))
+        if new_limit != self.limit:
+            logger.info(f"Adaptive concurrency: {self.limit} -> {new_limit} ({reason})")
+            self.limit = new_limit
@@ -16,6 +16,8 @@ options = {
     "raw_file": None,
     # 会话文件路径，用于恢复之前的扫描状态
     "session_file": None,
+    # 定期保存会话的间隔（秒），0 表示只在退出时手动保存
+    "checkpoint_interval": 0,
     # 配置文件路径
     "config": None,
     # 字典文件列表，用于 fuzzing 测试
@@ -40,8 +42,28 @@ options = {
     "lowercase": False,
     # 是否启用首字母大写转换
     "capitalization": False,
-    # 并发线程数
+    # 并发线程数（异步引擎下为同时在途的请求数）
     "thread_count": 25,
+    # 是否根据延迟和错误自动调整并发数
+    "adaptive_concurrency": False,
+    # 自适应并发模式下的最小并发数
+    "min_thread_count": 1,
+    # 请求引擎（thread 或 async）
+    "engine": "thread",
+    # 通配符响应相似度比较引擎（difflib 或 fast）
+    "diff_engine": "difflib",
+    # 探测模式（none、head 或 range）
+    "probe": "none",
+    # 同时扫描的目标数量
+    "parallel_targets": 1,
+    # 扫描进程数量，大于 1 时每个进程扫描词典的一个分片
+    "process_count": 1,
+    # 以协调节点身份运行时的监听地址
+    "coordinator": None,
+    # 以工作节点身份运行时连接的协调节点地址
+    "worker": None,
+    # 协调节点和工作节点共享的令牌
+    "cluster_token": None,
     # 是否递归扫描目录
     "recursive": False,
     # 是否深度递归扫描
@@ -76,6 +98,8 @@ options = {
     "minimum_response_size": 0,
     # 设置最大响应体大小阈值
     "maximum_response_size": 0,
+    # 状态码会被排除的响应最多读取的响应体大小（KB）
+    "excluded_body_size": 64,
     # 每个请求的最大执行时间限制（秒）
     "maxtime": 0,
     # HTTP 请求方法，默认是 GET
@@ -114,18 +138,30 @@ options = {
     "proxy_file": None,
     # 代理认证信息
     "proxy_auth": None,
+    # 每个代理同时在途的最大请求数，0 表示不限制
+    "proxy_connections": 0,
     # 回放代理地址（用于调试）
     "replay_proxy": None,
     # 是否通过 Tor 网络发送请求
     "tor": None,
     # URL 协议方案（http 或 https）
     "scheme": None,
-    # 最大请求速率（每秒请求数）
+    # 最大请求速率（每秒请求数，支持小数）
     "max_rate": 0,
+    # 限速时允许的最大突发请求数
+    "rate_burst": 0,
+    # 同一主机同时在途的最大请求数（0 表示不限制）
+    "host_connections": 0,
     # 失败请求最大重试次数
     "max_retries": 1,
     # 绑定使用的本地 IP 地址
     "ip": None,
+    # DNS 解析结果的缓存时间（秒），0 表示不过期
+    "dns_ttl": 300,
+    # 是否轮流使用主机解析到的多个地址
+    "dns_rotate": False,
+    # 是否使用 HTTP/2（服务器不支持时自动使用 HTTP/1.1）
+    "http2": False,
     # 出现错误是否立即退出程序
     "exit_on_error": False,
     # 是否启用爬虫模式
@@ -149,5 +185,11 @@ options = {
     # 是否自动保存报告
     "autosave_report": True,
     # 日志文件最大尺寸（单位未知，通常为字节）
-    "log_file_size": 0
+    "log_file_size": 0,
+    # 是否统计各阶段耗时等性能数据
+    "stats": False,
+    # 定期保存性能统计的 JSON 文件路径
+    "stats_file": None,
+    # 保存性能统计的间隔（秒）
+    "stats_interval": 10,
 }
@@ -3,7 +3,6 @@ import threading
 from functools import wraps
 from time import time
 
-_lock = threading.Lock()
 _cache = {}
 _cache_lock = threading.Lock()
 
@@ -65,7 +64,8 @@ def cached(timeout=100):
 
 def locked(func):
     """
-    线程锁装饰器，用于确保函数在多线程环境下的安全执行
+    线程锁装饰器，用于确保函数在多线程环境下的安全执行。
+    每个被装饰的函数拥有自己的锁，不同函数之间互不阻塞
 
     参数:
         func (function): 被装饰的函数
@@ -73,6 +73,9 @@ def locked(func):
     返回:
         function: 返回带锁机制的包装函数
     """
+    lock = threading.Lock()
+
+    @wraps(func)
     def with_locking(*args, **kwargs):
         """
         带有线程锁的包装函数
@@ -84,8 +87,8 @@ def locked(func):
         返回:
             any: 函数执行结果
         """
-        # 使用全局锁确保同一时间只有一个线程执行该函数
-        with _lock:
+        # 确保同一时间只有一个线程执行该函数
+        with lock:
             return func(*args, **kwargs)
 
     return with_locking
@@ -1,14 +1,15 @@
+import itertools
 import re
+import threading
 
 from lib.core.data import options
-from lib.core.decorators import locked
 from lib.core.settings import (
     SCRIPT_PATH,
     EXTENSION_TAG,
     EXCLUDE_OVERWRITE_EXTENSIONS,
     EXTENSION_RECOGNITION_REGEX,
 )
-from lib.core.structures import OrderedSet
+from lib.core.structures import DigestSet
 from lib.parse.url import clean_path
 from lib.utils.common import lstrip_once
 from lib.utils.file import FileUtils
@@ -49,17 +50,36 @@ class Dictionary:
     字典类，用于处理和生成扫描路径词典。
 
     支持经典模式与强制扩展模式两种方式来处理路径词典，并支持前缀、后缀等附加功能。
+
+    路径以生成器流水线的方式按需生成：逐行读取字典文件 -> 展开扩展名 -> 去重 ->
+    添加前缀/后缀 -> 去重 -> 大小写转换，不会把整个词典载入内存。去重只保存每个路径的
+    64 位哈希值。词典长度在第一次需要时通过一次计数遍历得到并缓存。
+
+    工作线程通过 take() 一次领取一批路径，减少对词典锁的争用；暂停时未处理的路径
+    通过 put_back() 归还，保证会话恢复时不会遗漏。
+
+    多进程扫描时每个进程只使用词典的一个分片：按去重后的顺序给路径编号，
+    编号除以分片数的余数等于分片序号的路径属于该分片。
     """
 
-    def __init__(self, **kwargs):
+    def __init__(self, files=[], is_blacklist=False, shard=(0, 1)):
         """
         初始化Dictionary实例。
 
         参数:
-            **kwargs: 可变关键字参数，传递给generate方法以生成路径项。
+            files (list): 字典文件路径列表，默认为空列表。
+            is_blacklist (bool): 是否为黑名单模式，默认为False。
+            shard (tuple): (分片序号, 分片数)，默认使用整个词典。
         """
-        self._index = 0
-        self._items = self.generate(**kwargs)
+        self._files = files
+        self._is_blacklist = is_blacklist
+        self._shard = shard
+        self._length = None
+        self._affixes = False
+        # 黑名单很小且每个响应都要遍历，生成一次后缓存
+        self._items = None
+        self._lock = threading.Lock()
+        self.reset()
 
     @property
     def index(self):
@@ -71,7 +91,6 @@ class Dictionary:
         """
         return self._index
 
-    @locked
     def __next__(self):
         """
         实现迭代器协议中的下一个元素获取逻辑。
@@ -82,18 +101,94 @@ class Dictionary:
         异常:
             StopIteration: 当没有更多元素时抛出。
         """
-        try:
-            path = self._items[self._index]
-        except IndexError:
-            raise StopIteration
+        with self._lock:
+            return self._next()
+
+    def take(self, count, paths=None):
+        """
+        一次领取最多 count 个路径。
+
+        参数:
+            count (int): 最多领取的路径数量。
+            paths (list): 存放路径的空容器，在词典锁内填充，默认新建列表。
+
+        返回:
+            list: 路径列表，词典剩余路径不足时可能少于 count 个。
+
+        异常:
+            StopIteration: 当没有更多元素时抛出。
+        """
+        if paths is None:
+            paths = []
+
+        with self._lock:
+            try:
+                while len(paths) < count:
+                    paths.append(self._next())
+            except StopIteration:
+                if not paths:
+                    raise
+
+        return paths
+
+    def put_back(self, paths):
+        """
+        归还已领取但尚未处理的路径，这些路径会在之后被优先取出。
+
+        参数:
+            paths (iterable): 需要归还的路径。
+        """
+        paths = list(paths)
+
+        with self._lock:
+            self._returned[:0] = paths
+            self._index -= len(paths)
+
+    def checkpoint(self, get_pending=None):
+        """
+        在扫描进行中获取当前读取位置的副本，用于定期保存会话。
+
+        领取路径和归还路径都在词典锁内完成，get_pending 也在锁内调用，
+        因此已领取但尚未扫描完的路径不会被遗漏，最多被重复扫描一次。
+
+        参数:
+            get_pending (callable): 返回已领取但尚未扫描完的路径，这些路径在副本中被归还。
+
+        返回:
+            Dictionary: 不包含任何路径的副本，序列化时只保存读取位置。
+        """
+        with self._lock:
+            state = self.__getstate__()
+            pending = list(get_pending()) if get_pending else []
+
+        dictionary = Dictionary.__new__(Dictionary)
+        dictionary.__setstate__(state)
+        dictionary._returned = pending + list(dictionary._returned)
+        dictionary._index -= len(pending)
+        return dictionary
+
+    def _next(self):
+        if self._returned:
+            self._index += 1
+            return self._returned.pop(0)
 
+        if self._iterator is None:
+            self._iterator = self._resume()
+
+        position, path = next(self._iterator)
+
+        if position != self._position:
+            self._position = position
+            self._skip = 0
+
+        self._skip += 1
         self._index += 1
 
         return path
 
     def __contains__(self, item):
         """
-        判断某个路径是否存在于当前词典中。
+        判断某个路径是否存在于当前词典中（需要遍历整个词典）。
 
         参数:
             item (str): 待检查的路径字符串。
@@ -101,138 +196,207 @@ class Dictionary:
         返回:
             bool: 存在则返回True，否则False。
         """
-        return item in self._items
+        return any(path == item for path in self)
 
     def __getstate__(self):
         """
-        序列化对象状态。
+        序列化对象状态，只保存字典文件和当前读取位置，不保存路径本身。
 
         返回:
-            tuple: 包含_items和_index的元组。
+            tuple: 包含字典文件、黑名单标志、分片、索引、所在行位置、该行已取出路径数及已归还路径的元组。
         """
-        return (self._items, self._index)
+        return (
+            self._files,
+            self._is_blacklist,
+            self._shard,
+            self._index,
+            self._position,
+            self._skip,
+            self._returned,
+        )
 
     def __setstate__(self, state):
         """
-        反序列化恢复对象状态。
+        反序列化恢复对象状态，下次取路径时从保存的文件偏移处继续。
 
         参数:
-            state (tuple): 包含_items和_index的元组。
+            state (tuple): __getstate__ 返回的元组。
         """
-        self._items, self._index = state
+        (
+            self._files,
+            self._is_blacklist,
+            self._shard,
+            self._index,
+            self._position,
+            self._skip,
+            self._returned,
+        ) = state
+        self._length = None
+        self._affixes = False
+        self._items = None
+        self._lock = threading.Lock()
+        self._iterator = None
 
     def __iter__(self):
         """
-        返回可迭代对象自身。
+        从头遍历词典中的所有路径，不影响 __next__ 的当前位置。
 
         返回:
-            iter: 自身迭代器。
+            iter: 路径迭代器。
         """
-        return iter(self._items)
+        if self._is_blacklist:
+            if self._items is None:
+                self._items = [path for _, path in self.generate()]
+
+            return iter(self._items)
+
+        len(self)
+        return (path for _, path in self.generate(affixes=self._affixes))
 
     def __len__(self):
         """
-        获取词典长度。
+        获取词典长度，第一次调用时遍历一遍词典计数。
 
         返回:
             int: 词典中路径的数量。
         """
-        return len(self._items)
+        if self._length is None:
+            self._affixes = not self._is_blacklist and bool(
+                options["prefixes"] or options["suffixes"]
+            )
+            self._length = self._count()
 
-    def generate(self, files=[], is_blacklist=False):
+            # 没有任何路径可以添加前缀/后缀时使用原始词典
+            if self._affixes and not self._length:
+                self._affixes = False
+                self._length = self._count()
+
+        return self._length
+
+    def _count(self):
+        return sum(1 for _ in self.generate(affixes=self._affixes))
+
+    def _resume(self):
+        len(self)
+        items = self.generate(self._position, affixes=self._affixes)
+        # 跳过断点所在行已经取出的路径
+        return itertools.islice(items, self._skip, None)
+
+    def generate(self, start=(0, 0), affixes=False):
         """
-        根据输入文件生成路径词典列表。
+        从指定位置开始生成路径。
 
-        处理包括替换%EXT%标签、追加扩展名、应用大小写转换等功能。
+        处理包括替换%EXT%标签、追加扩展名、添加前缀后缀、应用大小写转换等功能。
+        从中间位置开始时仍会从头读取之前的行以重建去重集合，但不输出这些行生成的路径。
 
         参数:
-            files (list): 文件路径列表，默认为空列表。
-            is_blacklist (bool): 是否为黑名单模式，默认为False。
+            start (tuple): 开始位置 (字典文件序号, 行首字节偏移)，默认为开头。
+            affixes (bool): 是否添加前缀和后缀，默认为False。
 
         返回:
-            list: 经过处理后的路径字符串列表。
+            generator: 生成 (路径来源行位置, 路径字符串) 元组的生成器。
         """
+        items = self._deduplicate(self._expand(self._read()))
 
-        wordlist = OrderedSet()
-        re_ext_tag = re.compile(EXTENSION_TAG, re.IGNORECASE)
+        if affixes:
+            items = self._deduplicate(self._add_affixes(items))
+
+        index, count = self._shard
 
-        for dict_file in files:
-            for line in FileUtils.get_lines(dict_file):
-                # 移除开头的"/"以便后续处理前缀
-                line = lstrip_once(line, "/")
-
-                if options["remove_extensions"]:
-                    line = line.split(".")[0]
-
-                if not self.is_valid(line):
-                    continue
-
-                # 经典dirsearch词典处理（含有%EXT%关键字）
-                if EXTENSION_TAG in line.lower():
-                    for extension in options["extensions"]:
-                        newline = re_ext_tag.sub(extension, line)
-                        wordlist.add(newline)
-                else:
-                    wordlist.add(line)
-
-                    # 黑名单不应使用“强制扩展”或“覆盖扩展”，避免误判
-                    if is_blacklist:
-                        continue
-
-                    # 若启用强制扩展且路径不是目录或已有扩展名，则追加扩展名
-                    if (
-                        options["force_extensions"]
-                        and "." not in line
-                        and not line.endswith("/")
-                    ):
-                        wordlist.add(line + "/")
-
-                        for extension in options["extensions"]:
-                            wordlist.add(f"{line}.{extension}")
-                    # 覆盖未知扩展名为选定扩展名（保留原始路径）
-                    elif (
-                        options["overwrite_extensions"]
-                        and not line.endswith(options["extensions"] + EXCLUDE_OVERWRITE_EXTENSIONS)
-                        # 含有查询参数的路径通常用于漏洞利用，跳过此类路径
-                        and "?" not in line
-                        and "#" not in line
-                        and re.search(EXTENSION_RECOGNITION_REGEX, line)
-                    ):
-                        base = line.split(".")[0]
-
-                        for extension in options["extensions"]:
-                            wordlist.add(f"{base}.{extension}")
-
-        if not is_blacklist:
-            # 添加前缀和后缀
-            altered_wordlist = OrderedSet()
-
-            for path in wordlist:
-                for pref in options["prefixes"]:
-                    if (
-                        not path.startswith(("/", pref))
-                    ):
-                        altered_wordlist.add(pref + path)
-                for suff in options["suffixes"]:
-                    if (
-                        not path.endswith(("/", suff))
-                        # 对URL片段添加后缀无意义
-                        and "?" not in path
-                        and "#" not in path
-                    ):
-                        altered_wordlist.add(path + suff)
-
-            if altered_wordlist:
-                wordlist = altered_wordlist
+        if count > 1:
+            items = itertools.islice(items, index, None, count)
+
+        if start != (0, 0):
+            items = itertools.dropwhile(lambda item: item[0] < start, items)
 
         if options["lowercase"]:
-            return list(map(str.lower, wordlist))
+            transform = str.lower
         elif options["uppercase"]:
-            return list(map(str.upper, wordlist))
+            transform = str.upper
         elif options["capitalization"]:
-            return list(map(str.capitalize, wordlist))
+            transform = str.capitalize
         else:
-            return list(wordlist)
+            return items
+
+        return ((position, transform(path)) for position, path in items)
+
+    def _read(self):
+        for index, dict_file in enumerate(self._files):
+            for offset, line in FileUtils.iter_lines(dict_file):
+                yield (index, offset), line
+
+    def _expand(self, lines):
+        re_ext_tag = re.compile(EXTENSION_TAG, re.IGNORECASE)
+
+        for position, line in lines:
+            # 移除开头的"/"以便后续处理前缀
+            line = lstrip_once(line, "/")
+
+            if options["remove_extensions"]:
+                line = line.split(".")[0]
+
+            if not self.is_valid(line):
+                continue
+
+            # 经典dirsearch词典处理（含有%EXT%关键字）
+            if EXTENSION_TAG in line.lower():
+                for extension in options["extensions"]:
+                    yield position, re_ext_tag.sub(extension, line)
+                continue
+
+            yield position, line
+
+            # 黑名单不应使用“强制扩展”或“覆盖扩展”，避免误判
+            if self._is_blacklist:
+                continue
+
+            # 若启用强制扩展且路径不是目录或已有扩展名，则追加扩展名
+            if (
+                options["force_extensions"]
+                and "." not in line
+                and not line.endswith("/")
+            ):
+                yield position, line + "/"
+
+                for extension in options["extensions"]:
+                    yield position, f"{line}.{extension}"
+            # 覆盖未知扩展名为选定扩展名（保留原始路径）
+            elif (
+                options["overwrite_extensions"]
+                and not line.endswith(options["extensions"] + EXCLUDE_OVERWRITE_EXTENSIONS)
+                # 含有查询参数的路径通常用于漏洞利用，跳过此类路径
+                and "?" not in line
+                and "#" not in line
+                and re.search(EXTENSION_RECOGNITION_REGEX, line)
+            ):
+                base = line.split(".")[0]
+
+                for extension in options["extensions"]:
+                    yield position, f"{base}.{extension}"
+
+    @staticmethod
+    def _add_affixes(items):
+        for position, path in items:
+            for pref in options["prefixes"]:
+                if not path.startswith(("/", pref)):
+                    yield position, pref + path
+            for suff in options["suffixes"]:
+                if (
+                    not path.endswith(("/", suff))
+                    # 对URL片段添加后缀无意义
+                    and "?" not in path
+                    and "#" not in path
+                ):
+                    yield position, path + suff
+
+    @staticmethod
+    def _deduplicate(items):
+        # 只在紧凑的哈希表中保存路径的 96 位指纹，每条路径约占 18 到 36 字节
+        seen = DigestSet()
+
+        for position, path in items:
+            if seen.add(path):
+                yield position, path
 
     def is_valid(self, path):
         """
@@ -261,7 +425,11 @@ class Dictionary:
 
     def reset(self):
         """
-        重置内部索引计数器到初始状态。
+        重置内部索引计数器到初始状态，下次取路径时从头读取。
         """
         self._index = 0
+        self._position = (0, 0)
+        self._skip = 0
+        self._returned = []
+        self._iterator = None
 
@@ -0,0 +1,172 @@
+import re
+
+from collections import Counter
+
+from lib.core.data import blacklists, options
+from lib.utils.common import human_size, lstrip_once
+
+
+class ResponseFilter:
+    """
+    响应过滤器，在扫描开始前把各项过滤选项预处理成便于快速判断的结构
+
+    过滤规则按开销从低到高依次执行：状态码集合、响应大小、黑名单后缀表、
+    排除文本、排除正则、排除重定向。每条规则排除的响应数量记录在 hits 中。
+
+    黑名单后缀按长度分组存入集合，判断时只需对每种长度做一次切片和哈希查找；
+    `--exclude-sizes` 的判断结果按响应长度缓存，相同长度的响应不会重复计算 human_size。
+
+    探测响应（HEAD 或部分内容的 GET）没有完整的响应体，只能使用状态码、黑名单和重定向这些
+    只依赖状态码、路径和响应头的规则。
+    """
+
+    def __init__(self):
+        self.hits = Counter()
+        self._exclude_status_codes = set(options["exclude_status_codes"])
+        self._include_status_codes = set(options["include_status_codes"])
+        self._exclude_sizes = set(options["exclude_sizes"])
+        self._size_cache = {}
+        self._minimum_size = options["minimum_response_size"]
+        self._maximum_size = options["maximum_response_size"]
+        # 去重后逐个做子串查找（C 实现），比合并成一个正则更快
+        self._exclude_texts = tuple(dict.fromkeys(options["exclude_texts"]))
+        self._exclude_regex = None
+        self._exclude_redirect = options["exclude_redirect"]
+        self._exclude_redirect_regex = None
+        self._blacklists = {
+            status: self.build_suffix_table(blacklist)
+            for status, blacklist in blacklists.items()
+        }
+
+        if options["exclude_regex"]:
+            self._exclude_regex = re.compile(options["exclude_regex"])
+
+        if self._exclude_redirect:
+            try:
+                self._exclude_redirect_regex = re.compile(self._exclude_redirect)
+            except re.error:
+                # 不是合法正则时只做子串匹配
+                pass
+
+    @staticmethod
+    def build_suffix_table(blacklist):
+        """
+        将黑名单路径按长度分组
+
+        Args:
+            blacklist (iterable): 黑名单路径
+
+        Returns:
+            dict: 键为后缀长度，值为该长度的后缀集合
+        """
+        table = {}
+
+        for suffix in blacklist:
+            suffix = lstrip_once(suffix, "/")
+            table.setdefault(len(suffix), set()).add(suffix)
+
+        return table
+
+    def is_excluded(self, resp, headers_only=False):
+        """
+        判断响应是否应被忽略，并记录命中的过滤规则
+
+        Args:
+            resp: HTTP 响应对象
+            headers_only (bool): 只使用不依赖响应体的规则
+
+        Returns:
+            bool: 响应应被排除时返回 True
+        """
+        name = self.match(resp, headers_only)
+
+        if name:
+            self.hits[name] += 1
+            return True
+
+        return False
+
+    def match(self, resp, headers_only=False):
+        """
+        找出第一个排除该响应的过滤规则
+
+        Args:
+            resp: HTTP 响应对象
+            headers_only (bool): 只使用不依赖响应体的规则
+
+        Returns:
+            str: 过滤规则名称，没有规则命中时返回 None
+        """
+        if resp.status in self._exclude_status_codes:
+            return "status"
+
+        if self._include_status_codes and resp.status not in self._include_status_codes:
+            return "status"
+
+        if not headers_only:
+            if resp.length < self._minimum_size:
+                return "size"
+
+            if resp.length > self._maximum_size > 0:
+                return "size"
+
+            if self._exclude_sizes and self.is_excluded_size(resp.length):
+                return "size"
+
+        if resp.status in self._blacklists and self.is_blacklisted(
+            resp.path, self._blacklists[resp.status]
+        ):
+            return "blacklist"
+
+        if not headers_only:
+            if any(text in resp.content for text in self._exclude_texts):
+                return "text"
+
+            if self._exclude_regex and self._exclude_regex.search(resp.content):
+                return "regex"
+
+        if self._exclude_redirect and (
+            self._exclude_redirect in resp.redirect
+            or (
+                self._exclude_redirect_regex
+                and self._exclude_redirect_regex.search(resp.redirect)
+            )
+        ):
+            return "redirect"
+
+        return None
+
+    def is_excluded_size(self, length):
+        """
+        判断响应大小是否在 `--exclude-sizes` 中，结果按长度缓存
+
+        Args:
+            length (int): 响应大小（字节）
+
+        Returns:
+            bool: 需要排除时返回 True
+        """
+        try:
+            return self._size_cache[length]
+        except KeyError:
+            result = human_size(length).rstrip() in self._exclude_sizes
+            self._size_cache[length] = result
+            return result
+
+    @staticmethod
+    def is_blacklisted(path, table):
+        """
+        判断路径是否以黑名单中的某个后缀结尾
+
+        Args:
+            path (str): 响应路径
+            table (dict): build_suffix_table 生成的后缀表
+
+        Returns:
+            bool: 命中黑名单时返回 True
+        """
+        for length, suffixes in table.items():
+            if not length or path[-length:] in suffixes:
+                return True
+
+        return False
@@ -1,24 +1,34 @@
-import re
+import asyncio
+import collections
 import threading
 import time
 
-from lib.core.data import blacklists, options
+from lib.core.concurrency import AdaptiveConcurrency
+from lib.core.data import options
 from lib.core.exceptions import RequestException
+from lib.core.filters import ResponseFilter
 from lib.core.logger import logger
-from lib.core.scanner import Scanner
+from lib.core.scanner import AsyncScanner, Scanner
+from lib.core.stats import stats
+from lib.core.structures import LRUCache
 from lib.core.settings import (
+    ADAPTIVE_PARK_INTERVAL,
     DEFAULT_TEST_PREFIXES,
     DEFAULT_TEST_SUFFIXES,
+    DICTIONARY_BATCH_SIZE,
+    PROBE_PARTIAL_STATUS_CODES,
+    TEST_PATH_LENGTH,
+    VERDICT_CACHE_SIZE,
     WILDCARD_TEST_POINT_MARKER,
 )
 from lib.parse.url import clean_path
-from lib.utils.common import human_size, lstrip_once
 from lib.utils.crawl import Crawler
+from lib.utils.random import rand_string
 
 
-class Fuzzer:
+class BaseFuzzer:
     """
-    模糊测试器类，用于执行路径扫描任务。
+    模糊测试器基类，包含与并发模型无关的扫描器配置、响应过滤等逻辑。
 
     参数:
         requester: 请求发送对象，负责实际的HTTP请求。
@@ -26,21 +36,338 @@ class Fuzzer:
         match_callbacks (list): 匹配回调函数列表，在发现有效路径时调用。
         not_found_callbacks (list): 未找到回调函数列表，在路径无效或被排除时调用。
         error_callbacks (list): 错误处理回调函数列表，在发生异常时调用。
+        response_filter (ResponseFilter): 响应过滤器，多个目标共用以累计命中次数，默认新建。
+        verdict_cache (LRUCache): Scanner判断结果缓存，多个目标共用以累计命中次数，默认新建。
+        thread_count (int): 线程（或协程）数量，同时扫描多个目标时由调度器分配，默认为 `thread_count` 选项。
     """
 
     def __init__(self, requester, dictionary, **kwargs):
-        self._threads = []
         self._scanned = set()
         self._requester = requester
         self._dictionary = dictionary
         self._is_running = False
-        self._play_event = threading.Event()
-        self._paused_semaphore = threading.Semaphore(0)
         self._base_path = None
         self.exc = None
         self.match_callbacks = kwargs.get("match_callbacks", [])
         self.not_found_callbacks = kwargs.get("not_found_callbacks", [])
         self.error_callbacks = kwargs.get("error_callbacks", [])
+        self.response_filter = kwargs.get("response_filter") or ResponseFilter()
+        self.verdict_cache = kwargs.get("verdict_cache")
+        self.thread_count = kwargs.get("thread_count") or options["thread_count"]
+        self.concurrency = None
+        # 当前使用的探测模式，None 表示直接发送完整请求
+        self.probe = None
+        # 目标是否支持 HEAD 请求，同一目标只检测一次
+        self._is_head_supported = None
+        # 每个工作线程（协程）已从词典领取但尚未扫描完的路径，保存会话时归还给词典
+        self._batches = {}
+        self._scanning = {}
+
+        if self.verdict_cache is None:
+            self.verdict_cache = LRUCache(VERDICT_CACHE_SIZE)
+
+        if options["adaptive_concurrency"]:
+            self.concurrency = AdaptiveConcurrency(
+                min(options["min_thread_count"], self.thread_count), self.thread_count
+            )
+
+    def get_pending_paths(self):
+        """
+        获取已从词典领取但尚未扫描完的路径。
+
+        工作线程先记录正在扫描的路径再把它移出批次，这里按相反的顺序先读批次再读正在扫描的路径，
+        两次读取之间被移出批次的路径一定已经记录在 _scanning 中，不会同时不在两处。
+
+        返回:
+            list: 路径列表，不包含基础路径。
+        """
+        paths = [path for batch in list(self._batches.values()) for path in batch]
+        paths.extend(path for path in list(self._scanning.values()) if path is not None)
+
+        return paths
+
+    def record_response(self, response):
+        """
+        将响应的延迟和状态码反馈给自适应并发控制器（如果启用）。
+
+        参数:
+            response: HTTP响应对象。
+        """
+        if self.concurrency:
+            self.concurrency.record(response.elapsed, response.status)
+
+    def record_error(self):
+        """
+        将请求错误反馈给自适应并发控制器（如果启用）。
+        """
+        if self.concurrency:
+            self.concurrency.record_error()
+
+    def get_scanner_specs(self):
+        """
+        依次生成需要创建的Scanner配置，包括默认、前缀和后缀扫描器，
+        用于检测响应中的通配符行为。
+
+        生成:
+            tuple: (类别, 名称, Scanner关键字参数)
+        """
+        # 默认扫描器（通配符测试点）
+        yield "default", "index", {"path": self._base_path}
+        yield "default", "random", {"path": self._base_path + WILDCARD_TEST_POINT_MARKER}
+
+        if options["exclude_response"]:
+            yield "default", "custom", {
+                "tested": self.scanners, "path": options["exclude_response"],
+            }
+
+        for prefix in options["prefixes"] + DEFAULT_TEST_PREFIXES:
+            yield "prefixes", prefix, {
+                "tested": self.scanners,
+                "path": f"{self._base_path}{prefix}{WILDCARD_TEST_POINT_MARKER}",
+                "context": f"/{self._base_path}{prefix}***",
+            }
+
+        for suffix in options["suffixes"] + DEFAULT_TEST_SUFFIXES:
+            yield "suffixes", suffix, {
+                "tested": self.scanners,
+                "path": f"{self._base_path}{WILDCARD_TEST_POINT_MARKER}{suffix}",
+                "context": f"/{self._base_path}***{suffix}",
+            }
+
+        for extension in options["extensions"]:
+            if "." + extension not in self.scanners["suffixes"]:
+                yield "suffixes", "." + extension, {
+                    "tested": self.scanners,
+                    "path": f"{self._base_path}{WILDCARD_TEST_POINT_MARKER}.{extension}",
+                    "context": f"/{self._base_path}***.{extension}",
+                }
+
+    def get_scanners_for(self, path):
+        """
+        获取与给定路径匹配的所有Scanner实例。
+
+        参数:
+            path (str): 待检查的路径字符串。
+
+        生成:
+            Scanner: 符合条件的Scanner对象。
+        """
+        # 清理路径以进行扩展名/后缀判断
+        path = clean_path(path)
+
+        for prefix in self.scanners["prefixes"]:
+            if path.startswith(prefix):
+                yield self.scanners["prefixes"][prefix]
+
+        for suffix in self.scanners["suffixes"]:
+            if path.endswith(suffix):
+                yield self.scanners["suffixes"][suffix]
+
+        for scanner in self.scanners["default"].values():
+            yield scanner
+
+    def is_new_path(self, path):
+        """
+        记录路径并判断其是否尚未被扫描过，防止重复扫描相同路径。
+
+        参数:
+            path (str): 待扫描的路径。
+
+        返回:
+            bool: 首次出现返回True。
+        """
+        if path in self._scanned:
+            return False
+
+        self._scanned.add(path)
+        return True
+
+    def is_found(self, path, response, scanners):
+        """
+        使用过滤规则和Scanner判断响应是否为有效发现，无效时调用未找到回调。
+
+        参数:
+            path (str): 请求的路径。
+            response: HTTP响应对象。
+            scanners (generator): 提供Scanner实例的可迭代对象。
+
+        返回:
+            bool: 有效发现返回True。
+        """
+        if self.is_excluded(response):
+            with stats.measure("callbacks"):
+                for callback in self.not_found_callbacks:
+                    callback(response)
+            return False
+
+        for tester in scanners:
+            # 判断响应是否唯一且不是通配符结果
+            if not self.check(tester, path, response):
+                with stats.measure("callbacks"):
+                    for callback in self.not_found_callbacks:
+                        callback(response)
+                return False
+
+        return True
+
+    def check(self, tester, path, response):
+        """
+        使用Scanner检查响应，同一Scanner遇到状态码和正文都相同的响应时直接复用之前的判断结果。
+
+        参数:
+            tester: Scanner实例。
+            path (str): 请求的路径。
+            response: HTTP响应对象。
+
+        返回:
+            bool: 不是通配符响应时返回True。
+        """
+        # 通配符重定向的判断与请求路径有关，不能复用
+        if response.redirect and tester.wildcard_redirect_regex:
+            with stats.measure("scanner"):
+                return tester.check(path, response)
+
+        # Response 的哈希值即正文的哈希值；缓存在多个目标间共用，只引用 Scanner 的编号，
+        # 避免已扫描完的目标的 Scanner 及其基准响应一直留在缓存中
+        key = (tester.id, response.status, hash(response))
+        verdict = self.verdict_cache.get(key)
+
+        if verdict is None:
+            with stats.measure("scanner"):
+                verdict = tester.check(path, response)
+
+            self.verdict_cache.set(key, verdict)
+
+        return verdict
+
+    def is_probe_useful(self):
+        """
+        判断当前目录是否值得先探测。随机路径的响应能被状态码、黑名单或重定向规则排除时，
+        大多数字典路径只需一次探测请求；否则几乎每个路径都要再发送完整请求，探测反而增加请求数。
+
+        返回:
+            bool: 值得探测时返回True。
+        """
+        response = self.scanners["default"]["random"].response
+
+        return response.status not in PROBE_PARTIAL_STATUS_CODES and bool(
+            self.response_filter.match(response, headers_only=True)
+        )
+
+    def get_probe_test_paths(self):
+        """
+        获取检测目标是否支持 HEAD 请求所用的路径：基础路径和一个随机路径。
+
+        返回:
+            tuple: 测试路径。
+        """
+        return self._base_path, self._base_path + rand_string(TEST_PATH_LENGTH)
+
+    @staticmethod
+    def is_probe_supported(response, probe_response):
+        """
+        比较同一路径的完整请求和探测请求，判断探测结果是否可信。
+
+        参数:
+            response: 完整请求的响应对象。
+            probe_response: 探测请求的响应对象。
+
+        返回:
+            bool: 两者状态码相同时返回True。
+        """
+        return response.status == probe_response.status
+
+    def select_probe(self, responses):
+        """
+        根据配置和检测结果选择当前目录使用的探测模式。
+
+        参数:
+            responses (list): 检测 HEAD 支持时得到的 (完整响应, HEAD 响应) 列表，已检测过时为空。
+        """
+        if responses:
+            self._is_head_supported = all(
+                self.is_probe_supported(response, probe_response)
+                for response, probe_response in responses
+            )
+
+            if not self._is_head_supported:
+                logger.info("Target does not handle HEAD like GET, probing with ranged GET instead")
+
+        if options["probe"] == "head" and not self._is_head_supported:
+            self.probe = "range"
+        else:
+            self.probe = options["probe"]
+
+    def is_probe_excluded(self, response):
+        """
+        判断探测响应是否已能被不依赖响应体的过滤规则排除。
+
+        参数:
+            response: 探测请求的响应对象。
+
+        返回:
+            bool: 可以直接排除、无需发送完整请求时返回True。
+        """
+        if response.status in PROBE_PARTIAL_STATUS_CODES:
+            return False
+
+        return self.response_filter.is_excluded(response, headers_only=True)
+
+    def get_crawled_paths(self, path, response):
+        """
+        从响应中爬取新的有效路径。
+
+        参数:
+            path (str): 被爬取响应对应的路径。
+            response: HTTP响应对象。
+
+        生成:
+            str: 新发现的路径。
+        """
+        logger.info(f'THREAD-{threading.get_ident()}: crawling "/{path}"')
+
+        with stats.measure("crawl"):
+            paths = Crawler.crawl(response)
+
+        for path_ in paths:
+            if self._dictionary.is_valid(path_):
+                logger.info(f'THREAD-{threading.get_ident()}: found new path "/{path_}" in /{path}')
+                yield path_
+
+    def is_excluded(self, resp):
+        """
+        使用多种过滤规则来判断一个响应是否应该被忽略。
+
+        参数:
+            resp: HTTP响应对象。
+
+        返回:
+            bool: 如果该响应应被排除则返回True，否则False。
+        """
+        with stats.measure("filter"):
+            return self.response_filter.is_excluded(resp)
+
+    def set_base_path(self, path):
+        """
+        设置基础路径，后续拼接字典中读取到的相对路径。
+
+        参数:
+            path (str): 基础URL路径部分。
+        """
+        self._base_path = path
+
+
+class Fuzzer(BaseFuzzer):
+    """
+    基于线程的模糊测试器类，每个工作线程独立从字典中获取路径并发送同步请求。
+    """
+
+    def __init__(self, requester, dictionary, **kwargs):
+        super().__init__(requester, dictionary, **kwargs)
+        self._threads = []
+        self._is_exhausted = False
+        self._play_event = threading.Event()
+        self._paused_semaphore = threading.Semaphore(0)
 
     def wait(self, timeout=None):
         """
@@ -68,47 +395,37 @@ class Fuzzer:
 
     def setup_scanners(self):
         """
-        初始化各种类型的Scanner实例，包括默认、前缀和后缀扫描器，
-        用于检测响应中的通配符行为。
+        初始化各种类型的Scanner实例，用于检测响应中的通配符行为。
         """
         self.scanners = {
             "default": {},
             "prefixes": {},
             "suffixes": {},
         }
+        # 判断结果缓存可能由多个目标共用，不能清空；旧Scanner的结果不会再被命中，由LRU淘汰
 
-        # 默认扫描器（通配符测试点）
-        self.scanners["default"].update({
-            "index": Scanner(self._requester, path=self._base_path),
-            "random": Scanner(self._requester, path=self._base_path + WILDCARD_TEST_POINT_MARKER),
-        })
+        for category, name, kwargs in self.get_scanner_specs():
+            self.scanners[category][name] = Scanner(self._requester, **kwargs)
 
-        if options["exclude_response"]:
-            self.scanners["default"]["custom"] = Scanner(
-                self._requester, tested=self.scanners, path=options["exclude_response"]
-            )
+    def setup_probe(self):
+        """
+        为当前目录选择探测模式，首次使用 HEAD 探测时检测目标是否支持。
+        """
+        self.probe = None
 
-        for prefix in options["prefixes"] + DEFAULT_TEST_PREFIXES:
-            self.scanners["prefixes"][prefix] = Scanner(
-                self._requester, tested=self.scanners,
-                path=f"{self._base_path}{prefix}{WILDCARD_TEST_POINT_MARKER}",
-                context=f"/{self._base_path}{prefix}***",
-            )
+        if options["probe"] == "none" or not self.is_probe_useful():
+            return
 
-        for suffix in options["suffixes"] + DEFAULT_TEST_SUFFIXES:
-            self.scanners["suffixes"][suffix] = Scanner(
-                self._requester, tested=self.scanners,
-                path=f"{self._base_path}{WILDCARD_TEST_POINT_MARKER}{suffix}",
-                context=f"/{self._base_path}***{suffix}",
-            )
+        responses = []
 
-        for extension in options["extensions"]:
-            if "." + extension not in self.scanners["suffixes"]:
-                self.scanners["suffixes"]["." + extension] = Scanner(
-                    self._requester, tested=self.scanners,
-                    path=f"{self._base_path}{WILDCARD_TEST_POINT_MARKER}.{extension}",
-                    context=f"/{self._base_path}***.{extension}",
-                )
+        if options["probe"] == "head" and self._is_head_supported is None:
+            for path in self.get_probe_test_paths():
+                responses.append((
+                    self._requester.request(path),
+                    self._requester.request(path, probe="head"),
+                ))
+
+        self.select_probe(responses)
 
     def setup_threads(self):
         """
@@ -117,44 +434,25 @@ class Fuzzer:
         if self._threads:
             self._threads = []
 
-        for _ in range(options["thread_count"]):
-            new_thread = threading.Thread(target=self.thread_proc)
+        self._batches.clear()
+        self._scanning.clear()
+
+        for index in range(self.thread_count):
+            new_thread = threading.Thread(target=self.thread_proc, args=(index,))
             new_thread.daemon = True
             self._threads.append(new_thread)
 
-    def get_scanners_for(self, path):
-        """
-        获取与给定路径匹配的所有Scanner实例。
-
-        参数:
-            path (str): 待检查的路径字符串。
-
-        生成:
-            Scanner: 符合条件的Scanner对象。
-        """
-        # 清理路径以进行扩展名/后缀判断
-        path = clean_path(path)
-
-        for prefix in self.scanners["prefixes"]:
-            if path.startswith(prefix):
-                yield self.scanners["prefixes"][prefix]
-
-        for suffix in self.scanners["suffixes"]:
-            if path.endswith(suffix):
-                yield self.scanners["suffixes"][suffix]
-
-        for scanner in self.scanners["default"].values():
-            yield scanner
-
     def start(self):
         """
         启动模糊测试流程：设置扫描器和线程，并开始执行。
         """
         self.setup_scanners()
+        self.setup_probe()
         self.setup_threads()
 
         self._running_threads_count = len(self._threads)
         self._is_running = True
+        self._is_exhausted = False
         self._play_event.clear()
 
         for thread in self._threads:
@@ -202,94 +500,35 @@ class Fuzzer:
             path (str): 需要扫描的目标路径。
             scanners (generator): 提供Scanner实例的可迭代对象。
         """
-        # 防止重复扫描相同路径
-        if path in self._scanned:
+        if not self.is_new_path(path):
             return
-        else:
-            self._scanned.add(path)
+
+        if self.probe:
+            response = self._requester.request(path, probe=self.probe)
+            self.record_response(response)
+
+            if self.is_probe_excluded(response):
+                with stats.measure("callbacks"):
+                    for callback in self.not_found_callbacks:
+                        callback(response)
+                return
 
         response = self._requester.request(path)
+        self.record_response(response)
 
-        if self.is_excluded(response):
-            for callback in self.not_found_callbacks:
-                callback(response)
+        if not self.is_found(path, response, scanners):
             return
 
-        for tester in scanners:
-            # 判断响应是否唯一且不是通配符结果
-            if not tester.check(path, response):
-                for callback in self.not_found_callbacks:
-                    callback(response)
-                return
-
         try:
-            for callback in self.match_callbacks:
-                callback(response)
+            with stats.measure("callbacks"):
+                for callback in self.match_callbacks:
+                    callback(response)
         except Exception as e:
             self.exc = e
 
         if options["crawl"]:
-            logger.info(f'THREAD-{threading.get_ident()}: crawling "/{path}"')
-            for path_ in Crawler.crawl(response):
-                if self._dictionary.is_valid(path_):
-                    logger.info(f'THREAD-{threading.get_ident()}: found new path "/{path_}" in /{path}')
-                    self.scan(path_, self.get_scanners_for(path_))
-
-    def is_excluded(self, resp):
-        """
-        使用多种过滤规则来判断一个响应是否应该被忽略。
-
-        参数:
-            resp: HTTP响应对象。
-
-        返回:
-            bool: 如果该响应应被排除则返回True，否则False。
-        """
-        """Validate the response by different filters"""
-
-        if resp.status in options["exclude_status_codes"]:
-            return True
-
-        if (
-            options["include_status_codes"]
-            and resp.status not in options["include_status_codes"]
-        ):
-            return True
-
-        if (
-            resp.status in blacklists
-            and any(
-                resp.path.endswith(lstrip_once(suffix, "/"))
-                for suffix in blacklists.get(resp.status)
-            )
-        ):
-            return True
-
-        if human_size(resp.length).rstrip() in options["exclude_sizes"]:
-            return True
-
-        if resp.length < options["minimum_response_size"]:
-            return True
-
-        if resp.length > options["maximum_response_size"] > 0:
-            return True
-
-        if any(text in resp.content for text in options["exclude_texts"]):
-            return True
-
-        if options["exclude_regex"] and re.search(options["exclude_regex"], resp.content):
-            return True
-
-        if (
-            options["exclude_redirect"]
-            and (
-                options["exclude_redirect"] in resp.redirect
-                or re.search(options["exclude_redirect"], resp.redirect)
-            )
-        ):
-            return True
-
-        return False
+            for path_ in self.get_crawled_paths(path, response):
+                self.scan(path_, self.get_scanners_for(path_))
 
     def is_stopped(self):
         """
@@ -312,39 +551,60 @@ class Fuzzer:
         """
         self._running_threads_count += 1
 
-    def set_base_path(self, path):
+    def thread_proc(self, index):
         """
-        设置基础路径，后续拼接字典中读取到的相对路径。
+        工作线程主循环逻辑。从字典批量领取路径，逐个进行扫描。
+        处理暂停、恢复以及延迟控制等操作，暂停时归还尚未扫描的路径。
 
         参数:
-            path (str): 基础URL路径部分。
-        """
-        self._base_path = path
-
-    def thread_proc(self):
-        """
-        工作线程主循环逻辑。从字典获取下一个路径，对其进行扫描。
-        处理暂停、恢复以及延迟控制等操作。
+            index (int): 线程编号，自适应并发模式下编号超出当前并发上限的线程暂不工作。
         """
         self._play_event.wait()
+        batch = self._batches[index] = collections.deque()
 
         while True:
             try:
-                path = next(self._dictionary)
+                # 字典耗尽后不再暂停，否则归还的路径可能在其他线程都退出后无人扫描
+                if (
+                    self.concurrency
+                    and not self._is_exhausted
+                    and not self.concurrency.is_allowed(index)
+                ):
+                    # 暂不工作的线程归还已领取的路径，交给其他线程扫描
+                    self._dictionary.put_back(batch)
+                    batch.clear()
+
+                    if not self.concurrency.wait_for_slot(index, ADAPTIVE_PARK_INTERVAL):
+                        continue
+
+                if not batch:
+                    self._dictionary.take(DICTIONARY_BATCH_SIZE, batch)
+
+                # 先记录再出队，保存会话时正在扫描的路径不会同时不在两处
+                self._scanning[index] = batch[0]
+                path = batch.popleft()
                 scanners = self.get_scanners_for(path)
                 self.scan(self._base_path + path, scanners)
 
             except StopIteration:
-                self._is_running = False
+                # 其他线程领取的路径扫描完后才会退出
+                self._is_exhausted = True
 
             except RequestException as e:
+                self.record_error()
+
                 for callback in self.error_callbacks:
                     callback(e)
 
                 continue
 
             finally:
+                self._scanning[index] = None
+
                 if not self._play_event.is_set():
+                    # 会话可能在暂停期间被保存，未扫描的路径需要归还给字典
+                    self._dictionary.put_back(batch)
+                    batch.clear()
                     self.decrease_threads()
                     self._paused_semaphore.release()
                     self._play_event.wait()
@@ -353,4 +613,197 @@ class Fuzzer:
                 if not self._is_running:
                     break
 
+                if self._is_exhausted and not batch:
+                    # 其他线程可能在字典耗尽后归还了路径，再次领取也没有路径时才退出
+                    try:
+                        self._dictionary.take(DICTIONARY_BATCH_SIZE, batch)
+                    except StopIteration:
+                        break
+
                 time.sleep(options["delay"])
+
+
+class AsyncFuzzer(BaseFuzzer):
+    """
+    基于 asyncio 的模糊测试器类，在单个事件循环中运行固定数量的工作协程，
+    每个协程对应一个在途请求槽位（数量由 `thread_count` 决定）。
+    """
+
+    def __init__(self, requester, dictionary, **kwargs):
+        super().__init__(requester, dictionary, **kwargs)
+        self._tasks = []
+        self._play_event = None
+
+    async def setup_scanners(self):
+        """
+        异步初始化各种类型的Scanner实例，用于检测响应中的通配符行为。
+        """
+        self.scanners = {
+            "default": {},
+            "prefixes": {},
+            "suffixes": {},
+        }
+        # 判断结果缓存可能由多个目标共用，不能清空；旧Scanner的结果不会再被命中，由LRU淘汰
+
+        for category, name, kwargs in self.get_scanner_specs():
+            self.scanners[category][name] = await AsyncScanner.create(self._requester, **kwargs)
+
+    async def setup_probe(self):
+        """
+        异步为当前目录选择探测模式，逻辑与 Fuzzer.setup_probe 相同。
+        """
+        self.probe = None
+
+        if options["probe"] == "none" or not self.is_probe_useful():
+            return
+
+        responses = []
+
+        if options["probe"] == "head" and self._is_head_supported is None:
+            for path in self.get_probe_test_paths():
+                responses.append((
+                    await self._requester.request(path),
+                    await self._requester.request(path, probe="head"),
+                ))
+
+        self.select_probe(responses)
+
+    async def start(self):
+        """
+        启动模糊测试流程：设置扫描器并运行所有工作协程直至字典耗尽或被停止。
+        工作协程中未处理的异常（如 SkipTargetInterrupt）会直接向调用方抛出。
+        """
+        # Event 需要在事件循环运行时创建
+        self._play_event = asyncio.Event()
+
+        await self.setup_scanners()
+        await self.setup_probe()
+
+        self._is_running = True
+        self._scanning.clear()
+        self._tasks = [
+            asyncio.ensure_future(self.task_proc(index))
+            for index in range(self.thread_count)
+        ]
+        self.play()
+
+        try:
+            await asyncio.gather(*self._tasks)
+        finally:
+            # 某个协程抛出异常时，取消其余协程并等待它们结束
+            self.quit()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def play(self):
+        """
+        唤醒所有暂停的工作协程继续执行。
+        """
+        self._play_event.set()
+
+    def pause(self):
+        """
+        暂停工作协程，正在进行中的请求完成后不再获取新路径。
+        """
+        self._play_event.clear()
+        self._is_running = False
+
+    def resume(self):
+        """
+        继续执行已暂停的工作协程。
+        """
+        self._is_running = True
+        self.play()
+
+    def stop(self):
+        """
+        停止整个模糊测试过程。
+        """
+        self._is_running = False
+        self.play()
+
+    def quit(self):
+        """
+        取消所有尚未结束的工作协程。
+        """
+        for task in self._tasks:
+            task.cancel()
+
+    async def scan(self, path, scanners):
+        """
+        对指定路径发起异步请求并使用提供的Scanner验证其有效性。
+
+        参数:
+            path (str): 需要扫描的目标路径。
+            scanners (generator): 提供Scanner实例的可迭代对象。
+        """
+        if not self.is_new_path(path):
+            return
+
+        if self.probe:
+            response = await self._requester.request(path, probe=self.probe)
+            self.record_response(response)
+
+            if self.is_probe_excluded(response):
+                with stats.measure("callbacks"):
+                    for callback in self.not_found_callbacks:
+                        callback(response)
+                return
+
+        response = await self._requester.request(path)
+        self.record_response(response)
+
+        if not self.is_found(path, response, scanners):
+            return
+
+        # 与 Fuzzer.scan 相同，回调中的异常不影响爬取，由 task_proc 在本次扫描完成后抛出
+        try:
+            with stats.measure("callbacks"):
+                for callback in self.match_callbacks:
+                    callback(response)
+        except Exception as e:
+            self.exc = e
+
+        if options["crawl"]:
+            for path_ in self.get_crawled_paths(path, response):
+                await self.scan(path_, self.get_scanners_for(path_))
+
+    async def task_proc(self, index):
+        """
+        工作协程主循环逻辑。从字典获取下一个路径，对其进行扫描。
+
+        参数:
+            index (int): 协程编号，自适应并发模式下编号超出当前并发上限的协程暂不工作。
+        """
+        while True:
+            await self._play_event.wait()
+
+            if not self._is_running:
+                break
+
+            if self.concurrency and not self.concurrency.is_allowed(index):
+                await asyncio.sleep(ADAPTIVE_PARK_INTERVAL)
+                continue
+
+            try:
+                path = self._scanning[index] = next(self._dictionary)
+                scanners = self.get_scanners_for(path)
+                await self.scan(self._base_path + path, scanners)
+
+                if self.exc:
+                    raise self.exc
+
+            except StopIteration:
+                # 通知其他（包括暂不工作的）协程字典已耗尽
+                self._is_running = False
+                break
+
+            except RequestException as e:
+                self.record_error()
+
+                for callback in self.error_callbacks:
+                    callback(e)
+
+            finally:
+                self._scanning[index] = None
+
+            await asyncio.sleep(options["delay"])
@@ -1,11 +1,16 @@
+import importlib.util
 import os
+import re
 import sys
 
 from lib.core.settings import (
     AUTHENTICATION_TYPES,
     COMMON_EXTENSIONS,
     DEFAULT_TOR_PROXIES,
+    DIFF_ENGINES,
+    ENGINES,
     OUTPUT_FORMATS,
+    PROBE_MODES,
     SCRIPT_PATH,
 )
 from lib.parse.cmdline import parse_arguments
@@ -51,6 +56,9 @@ def parse_options():
         opt.urls = sys.stdin.read().splitlines(0)
     elif opt.raw_file:
         _access_file(opt.raw_file)
+    elif opt.worker:
+        # 工作节点的目标由协调节点下发
+        opt.urls = []
     elif not opt.urls:
         print("缺少URL目标，请尝试使用 -u <url>")
         #opt.urls="http://www.baidu.com"
@@ -83,6 +91,83 @@ def parse_options():
         print("线程数必须大于零")
         exit(1)
 
+    if not 0 < opt.min_thread_count <= opt.thread_count:
+        print("最小线程数必须大于零且不超过线程数")
+        exit(1)
+
+    if opt.parallel_targets < 1:
+        print("同时扫描的目标数量必须大于零")
+        exit(1)
+
+    if opt.process_count < 1:
+        print("扫描进程数量必须大于零")
+        exit(1)
+
+    if opt.process_count > 1 and opt.parallel_targets > 1:
+        print("--processes 不能与 --parallel-targets 同时使用")
+        exit(1)
+
+    for address in (opt.coordinator, opt.worker):
+        if address and not re.fullmatch(r".*:\d{1,5}", address):
+            print(f"无效的地址: {address}，请使用 主机:端口 格式")
+            exit(1)
+
+    if opt.coordinator and opt.worker:
+        print("--coordinator 不能与 --worker 同时使用")
+        exit(1)
+
+    if opt.worker and not opt.cluster_token:
+        print("--worker 需要使用 --cluster-token 指定协调节点的令牌")
+        exit(1)
+
+    if opt.coordinator and (opt.process_count > 1 or opt.parallel_targets > 1):
+        print("--coordinator 不能与 --processes 或 --parallel-targets 同时使用")
+        exit(1)
+
+    if opt.dns_ttl < 0:
+        print("--dns-ttl 不能小于零")
+        exit(1)
+
+    if opt.host_connections < 0:
+        print("--host-connections 不能小于零")
+        exit(1)
+
+    if opt.proxy_connections < 0:
+        print("--proxy-connections 不能小于零")
+        exit(1)
+
+    if opt.exclude_regex:
+        try:
+            re.compile(opt.exclude_regex)
+        except re.error as e:
+            print(f"无效的排除正则表达式: {e}")
+            exit(1)
+
+    if opt.excluded_body_size < 0:
+        print("--excluded-body-size 不能小于零")
+        exit(1)
+
+    if opt.checkpoint_interval < 0:
+        print("--checkpoint-interval 不能小于零")
+        exit(1)
+
+    if opt.stats_interval <= 0:
+        print("--stats-interval 必须大于零")
+        exit(1)
+
+    # 请求引擎校验
+    if opt.engine not in ENGINES:
+        print(f"'{opt.engine}' 不在可用的请求引擎中: {', '.join(ENGINES)}")
+        exit(1)
+
+    if opt.diff_engine not in DIFF_ENGINES:
+        print(f"'{opt.diff_engine}' 不在可用的相似度比较引擎中: {', '.join(DIFF_ENGINES)}")
+        exit(1)
+
+    if opt.probe not in PROBE_MODES:
+        print(f"'{opt.probe}' 不在可用的探测模式中: {', '.join(PROBE_MODES)}")
+        exit(1)
+
     # 设置代理服务器
     if opt.tor:
         opt.proxies = list(DEFAULT_TOR_PROXIES)
@@ -179,6 +264,30 @@ def parse_options():
         print(f"'{opt.auth_type}' 不在可用的认证类型中: {', '.join(AUTHENTICATION_TYPES)}")
         exit(1)
 
+    if opt.engine == "async" and opt.parallel_targets > 1:
+        print("异步引擎不支持同时扫描多个目标，请使用 --engine thread")
+        exit(1)
+
+    if opt.engine == "async" and opt.process_count > 1:
+        print("异步引擎不支持多进程扫描，请使用 --engine thread")
+        exit(1)
+
+    if opt.engine == "async" and (opt.coordinator or opt.worker):
+        print("异步引擎不支持分布式扫描，请使用 --engine thread")
+        exit(1)
+
+    if opt.engine == "async" and opt.auth_type == "ntlm":
+        print("异步引擎不支持 NTLM 认证，请使用 --engine thread")
+        exit(1)
+
+    if opt.http2 and not importlib.util.find_spec("h2"):
+        print("--http2 需要安装 h2 模块: pip install h2")
+        exit(1)
+
+    if opt.http2 and opt.auth_type == "ntlm":
+        print("HTTP/2 不支持 NTLM 认证")
+        exit(1)
+
     # 扩展名冲突检测
     if set(opt.extensions).intersection(opt.exclude_extensions):
         print("排除扩展名列表不能包含已在扩展名列表中的任何扩展名")
@@ -190,6 +299,10 @@ def parse_options():
               f"{', '.join(OUTPUT_FORMATS)}")
         exit(1)
 
+    if opt.output_file == "-" and opt.output_format == "sqlite":
+        print("SQLite报告不能输出到标准输出")
+        exit(1)
+
     return vars(opt)
 
 
@@ -265,6 +378,24 @@ def parse_config(opt):
     opt.thread_count = opt.thread_count or config.safe_getint(
         "general", "threads", 25
     )
+    opt.engine = opt.engine or config.safe_get("general", "engine", "thread")
+    opt.parallel_targets = opt.parallel_targets or config.safe_getint(
+        "general", "parallel-targets", 1
+    )
+    opt.process_count = opt.process_count or config.safe_getint(
+        "general", "processes", 1
+    )
+    opt.coordinator = opt.coordinator or config.safe_get("general", "coordinator")
+    opt.worker = opt.worker or config.safe_get("general", "worker")
+    opt.cluster_token = opt.cluster_token or config.safe_get("general", "cluster-token")
+    opt.diff_engine = opt.diff_engine or config.safe_get("general", "diff-engine", "difflib")
+    opt.probe = opt.probe or config.safe_get("general", "probe", "none")
+    opt.adaptive_concurrency = opt.adaptive_concurrency or config.safe_getboolean(
+        "general", "adaptive-concurrency"
+    )
+    opt.min_thread_count = opt.min_thread_count or config.safe_getint(
+        "general", "min-threads", 1
+    )
     opt.include_status_codes = opt.include_status_codes or config.safe_get(
         "general", "include-status"
     )
@@ -301,6 +432,12 @@ def parse_config(opt):
         "general", "skip-on-status", ""
     )
     opt.max_time = opt.max_time or config.safe_getint("general", "max-time")
+
+    if opt.checkpoint_interval is None:
+        opt.checkpoint_interval = config.safe_getint("general", "checkpoint-interval", 0)
+
+    if opt.excluded_body_size is None:
+        opt.excluded_body_size = config.safe_getint("general", "excluded-body-size", 64)
     opt.exit_on_error = opt.exit_on_error or config.safe_getboolean(
         "general", "exit-on-error"
     )
@@ -347,14 +484,26 @@ def parse_config(opt):
     opt.delay = opt.delay or config.safe_getfloat("connection", "delay")
     opt.timeout = opt.timeout or config.safe_getfloat("connection", "timeout", 15)  # 从7.5秒增加到15秒以更好地兼容SOCKS4a
     opt.max_retries = opt.max_retries or config.safe_getint("connection", "max-retries", 1)
-    opt.max_rate = opt.max_rate or config.safe_getint("connection", "max-rate")
+    opt.max_rate = opt.max_rate or config.safe_getfloat("connection", "max-rate")
+    opt.rate_burst = opt.rate_burst or config.safe_getint("connection", "rate-burst")
+    opt.host_connections = opt.host_connections or config.safe_getint(
+        "connection", "host-connections"
+    )
     opt.proxies = opt.proxies or list(config.safe_get("connection", "proxy", []))
     opt.proxy_file = opt.proxy_file or config.safe_get("connection", "proxy-file")
+    opt.proxy_connections = opt.proxy_connections or config.safe_getint(
+        "connection", "proxy-connections"
+    )
     opt.scheme = opt.scheme or config.safe_get(
         "connection", "scheme", None, ["http", "https"]
     )
     opt.replay_proxy = opt.replay_proxy or config.safe_get("connection", "replay-proxy")
 
+    if opt.dns_ttl is None:
+        opt.dns_ttl = config.safe_getint("connection", "dns-ttl", 300)
+    opt.dns_rotate = opt.dns_rotate or config.safe_getboolean("connection", "dns-rotate")
+    opt.http2 = opt.http2 or config.safe_getboolean("connection", "http2")
+
     # 高级设置
     opt.crawl = opt.crawl or config.safe_getboolean("advanced", "crawl")
 
@@ -374,6 +523,13 @@ def parse_config(opt):
     opt.output_format = opt.output_format or config.safe_get(
         "output", "report-format", "plain", OUTPUT_FORMATS
     )
+    opt.stats_file = opt.stats_file or config.safe_get("output", "stats-file")
+    opt.stats = bool(
+        opt.stats or opt.stats_file or config.safe_getboolean("output", "stats")
+    )
+
+    if opt.stats_interval is None:
+        opt.stats_interval = config.safe_getint("output", "stats-interval", 10)
 
     return opt
 
@@ -1,21 +1,32 @@
+import itertools
 import re
 
 from urllib.parse import unquote
 
+from lib.core.data import options
 from lib.core.logger import logger
 from lib.core.settings import (
     REFLECTED_PATH_MARKER,
     TEST_PATH_LENGTH,
     WILDCARD_TEST_POINT_MARKER,
 )
+from lib.core.stats import stats
 from lib.parse.url import clean_path
-from lib.utils.diff import generate_matching_regex, DynamicContentParser
+from lib.utils.diff import (
+    generate_matching_regex,
+    DynamicContentParser,
+    FastDynamicContentParser,
+)
 from lib.utils.random import rand_string
 
 
-class Scanner:
+# 为每个 Scanner 分配递增的编号，缓存等只需引用编号而不必持有 Scanner 对象
+_scanner_ids = itertools.count()
+
+
+class BaseScanner:
     """
-    用于扫描和识别通配符响应行为的类。该类通过发送随机路径请求来构建通配符响应模型，并判断后续响应是否属于通配符类型。
+    用于扫描和识别通配符响应行为的基类。该类通过发送随机路径请求来构建通配符响应模型，并判断后续响应是否属于通配符类型。
 
     :param requester: 请求对象，负责实际发起HTTP请求
     :param path: 路径模板字符串，其中可能包含通配符测试点标记
@@ -30,35 +41,48 @@ class Scanner:
         self.requester = requester
         self.response = None
         self.wildcard_redirect_regex = None
-        self.setup()
+        self.id = next(_scanner_ids)
 
-    def setup(self):
-        """
-        初始化阶段，生成两个不同随机路径的响应作为基准，建立通配符响应的内容解析器和重定向正则表达式。
-        如果已有相同的响应存在，则复用其结果以减少网络请求次数。
+    def get_test_path(self, omit=None):
         """
+        用随机字符串替换通配符测试点，生成测试路径。
 
-        first_path = self.path.replace(
+        :param omit: 需要避开的已使用路径
+        :return: 测试路径字符串
+        """
+        return self.path.replace(
             WILDCARD_TEST_POINT_MARKER,
-            rand_string(TEST_PATH_LENGTH),
+            rand_string(TEST_PATH_LENGTH, omit=omit),
         )
-        first_response = self.requester.request(first_path)
+
+    def reuse_duplicate(self, first_response):
+        """
+        如果之前已执行另一个测试并且响应与此相同，则复用其结果。
+
+        :param first_response: 第一次测试得到的响应对象
+        :return: 复用成功返回True，否则返回False
+        """
         self.response = first_response
 
         duplicate = self.get_duplicate(first_response)
-        # 之前已执行另一个测试并且响应与此相同
         if duplicate:
             self.content_parser = duplicate.content_parser
             self.wildcard_redirect_regex = duplicate.wildcard_redirect_regex
+            stats.count("wildcard_tests_reused")
             logger.debug(f'跳过"{self.context}"的第二次测试')
-            return
+            return True
 
-        second_path = self.path.replace(
-            WILDCARD_TEST_POINT_MARKER,
-            rand_string(TEST_PATH_LENGTH, omit=first_path),
-        )
-        second_response = self.requester.request(second_path)
+        return False
 
+    def build_wildcard_model(self, first_path, first_response, second_path, second_response):
+        """
+        根据两次随机路径的响应建立通配符响应的内容解析器和重定向正则表达式。
+
+        :param first_path: 第一次使用的随机路径
+        :param first_response: 第一次测试的响应
+        :param second_path: 第二次使用的随机路径
+        :param second_response: 第二次测试的响应
+        """
         if first_response.redirect and second_response.redirect:
             self.wildcard_redirect_regex = self.generate_redirect_regex(
                 clean_path(first_response.redirect),
@@ -68,7 +92,14 @@ class Scanner:
             )
             logger.debug(f'用于检测"{self.context}"通配符重定向的模式（正则表达式）: {self.wildcard_redirect_regex}')
 
-        self.content_parser = DynamicContentParser(
+        stats.count("wildcard_tests_built")
+
+        if options["diff_engine"] == "fast":
+            parser_class = FastDynamicContentParser
+        else:
+            parser_class = DynamicContentParser
+
+        self.content_parser = parser_class(
             first_response.content, second_response.content
         )
 
@@ -154,3 +185,62 @@ class Scanner:
 
         return generate_matching_regex(first_loc, second_loc)
 
+
+
+class Scanner(BaseScanner):
+    """
+    同步通配符扫描器，创建时立即发送测试请求建立通配符响应模型。
+    """
+
+    def __init__(self, requester, **kwargs):
+        super().__init__(requester, **kwargs)
+        self.setup()
+
+    def setup(self):
+        """
+        初始化阶段，生成两个不同随机路径的响应作为基准，建立通配符响应的内容解析器和重定向正则表达式。
+        如果已有相同的响应存在，则复用其结果以减少网络请求次数。
+        """
+        first_path = self.get_test_path()
+        first_response = self.requester.request(first_path)
+
+        if self.reuse_duplicate(first_response):
+            return
+
+        second_path = self.get_test_path(omit=first_path)
+        second_response = self.requester.request(second_path)
+
+        self.build_wildcard_model(first_path, first_response, second_path, second_response)
+
+
+class AsyncScanner(BaseScanner):
+    """
+    异步通配符扫描器，需通过 AsyncScanner.create() 创建。
+    """
+
+    @classmethod
+    async def create(cls, requester, **kwargs):
+        """
+        创建扫描器实例并异步完成通配符测试。
+
+        :param requester: 异步请求对象
+        :return: 初始化完成的AsyncScanner实例
+        """
+        self = cls(requester, **kwargs)
+        await self.setup()
+        return self
+
+    async def setup(self):
+        """
+        异步版本的初始化阶段，逻辑与 Scanner.setup 相同。
+        """
+        first_path = self.get_test_path()
+        first_response = await self.requester.request(first_path)
+
+        if self.reuse_duplicate(first_response):
+            return
+
+        second_path = self.get_test_path(omit=first_path)
+        second_response = await self.requester.request(second_path)
+
+        self.build_wildcard_model(first_path, first_response, second_path, second_response)
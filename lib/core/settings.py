@@ -49,7 +49,44 @@ INVALID_CHARS_FOR_WINDOWS_FILENAME = ('"', "*", "<", ">", "?", "\\", "|", "/", "
 INVALID_FILENAME_CHAR_REPLACEMENT = "_"
 
 # 支持的输出格式列表
-OUTPUT_FORMATS = ("simple", "plain", "json", "xml", "md", "csv", "html", "sqlite")
+OUTPUT_FORMATS = ("simple", "plain", "json", "jsonl", "xml", "md", "csv", "html", "sqlite")
+
+# 支持的请求引擎（线程池 / asyncio 事件循环）
+ENGINES = ("thread", "async")
+
+# 通配符响应相似度比较引擎（difflib 为原始实现，fast 为快速实现）
+DIFF_ENGINES = ("difflib", "fast")
+
+# 探测模式（none 不探测，head 先发送 HEAD 请求，range 先发送只请求开头部分内容的 GET 请求）
+PROBE_MODES = ("none", "head", "range")
+
+# range 探测模式下请求并最多读取的响应体大小（单位：字节）
+PROBE_RANGE_SIZE = 1024
+
+# range 探测返回这些状态码时说明资源存在，状态码与完整请求不同，不能据此排除
+PROBE_PARTIAL_STATUS_CODES = (206, 416)
+
+# 分布式扫描时每个目录拆分成的工作单元数量（词典分片数）
+DISTRIBUTED_UNIT_COUNT = 8
+
+# 工作节点汇报进度的间隔，也是没有可领取的工作单元时再次询问的间隔（单位：秒）
+DISTRIBUTED_REPORT_INTERVAL = 1
+
+# 工作单元租约的超时时间，超时未汇报的工作单元会被重新分配（单位：秒）
+DISTRIBUTED_LEASE_TIMEOUT = 30
+
+# 工作节点扫描失败的工作单元最多被分配的次数，超过后跳过当前目标
+DISTRIBUTED_MAX_ATTEMPTS = 3
+
+# 工作节点保留本地值、不使用协调节点下发值的选项，协调节点下发选项时也不包含它们。
+# 线程数和限速是每个工作节点各自的设置
+DISTRIBUTED_LOCAL_OPTIONS = (
+    "coordinator", "worker", "cluster_token", "thread_count", "max_rate", "rate_burst",
+    "log_file", "quiet", "color",
+)
+
+# 协调节点和工作节点之间传递共享令牌的请求头
+DISTRIBUTED_TOKEN_HEADER = "X-Cluster-Token"
 
 # 常见网页扩展名
 COMMON_EXTENSIONS = ("php", "jsp", "asp", "aspx", "do", "action", "cgi", "html", "htm", "js", "tar.gz")
@@ -87,18 +124,34 @@ DEFAULT_TEST_SUFFIXES = ("/",)
 # Tor网络默认使用的 SOCKS5 代理地址
 DEFAULT_TOR_PROXIES = ("socks5://127.0.0.1:9050", "socks5://127.0.0.1:9150")
 
-# 默认HTTP请求头设置
+# 默认HTTP请求头设置。Accept-Encoding 和 Connection 由 HTTP 库设置：
+# 只声明能够解压的编码，并默认保持连接
 DEFAULT_HEADERS = {
     "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/87.0.4280.88 Safari/537.36",
     "accept": "*/*",
-    "accept-rncoding": "*",
-    "keep-alive": "timeout=15, max=1000",
     "cache-control": "max-age=0",
 }
 
 # 默认会话保存文件名
 DEFAULT_SESSION_FILE = "session.pickle"
 
+# 不保存到会话中的控制器属性：无法序列化或恢复时重新创建的对象，以及单独追加保存的扫描结果
+SESSION_EXCLUDED_ATTRIBUTES = (
+    "fuzzer",
+    "requester",
+    "loop",
+    "pause_future",
+    "coordinator",
+    "session",
+    "results",
+)
+
+# 终端进度条的刷新间隔（单位：秒）
+PROGRESS_REFRESH_INTERVAL = 0.1
+
+# 内存中保留的终端输出行数，更早的输出只保存在会话文件中
+OUTPUT_BUFFER_SIZE = 10000
+
 # 路径反射标记，在某些测试场景下用于标识反射点位置
 REFLECTED_PATH_MARKER = "__REFLECTED_PATH__"
 
@@ -141,8 +194,41 @@ DUMMY_WORD = "dummyasdf"
 # Socket 连接超时时间（秒）
 SOCKET_TIMEOUT = 6
 
-# 更新速率统计的时间间隔（秒）
-RATE_UPDATE_DELAY = 0.15
+# 扫描前批量检测目标协议时的连接和读取超时时间（秒）
+SCHEME_PROBE_TIMEOUT = 3
+
+# 扫描前同时检测协议的目标数量
+SCHEME_PROBE_THREADS = 100
+
+# 目标协议检测结果的缓存文件
+SCHEME_CACHE_FILE = FileUtils.build_path(SCRIPT_PATH, "cache", "schemes.json")
+
+# 目标协议检测结果的缓存时间（秒）
+SCHEME_CACHE_TTL = 7 * 24 * 3600
+
+# DNS 解析失败的结果在缓存中保存的时间（秒）
+DNS_NEGATIVE_TTL = 30
+
+# 请求速率统计的滑动窗口长度（秒）
+RATE_WINDOW = 1
+
+# 滑动窗口划分的时间槽数量
+RATE_WINDOW_SLOTS = 10
+
+# 代理连续失败多少次后暂停使用
+PROXY_FAILURE_THRESHOLD = 2
+
+# 代理第一次暂停使用的时间（秒），之后每多失败一次时间加倍
+PROXY_QUARANTINE_TIME = 5
+
+# 代理暂停使用的最长时间（秒）
+PROXY_QUARANTINE_MAX = 300
+
+# 代理延迟和成功率的指数移动平均中新数据的权重
+PROXY_EWMA_WEIGHT = 0.2
+
+# 异步引擎等待代理空闲槽位的轮询间隔（秒）
+PROXY_WAIT_INTERVAL = 0.01
 
 # 最大相似度阈值，超过该比例视为重复内容
 MAX_MATCH_RATIO = 0.98
@@ -159,6 +245,36 @@ TEST_PATH_LENGTH = 6
 # 连续请求失败最大次数上限
 MAX_CONSECUTIVE_REQUEST_ERRORS = 75
 
+# 表示目标正在限流或过载的状态码（自适应并发模式下视为拥塞信号）
+THROTTLE_STATUS_CODES = (429, 503)
+
+# 自适应并发模式下遇到拥塞信号时并发数的缩减系数
+ADAPTIVE_DECREASE_FACTOR = 0.5
+
+# 平均延迟超过基准延迟的倍数时视为拥塞
+ADAPTIVE_LATENCY_TOLERANCE = 2
+
+# 计算平均延迟（指数加权移动平均）时新样本的权重
+ADAPTIVE_EWMA_WEIGHT = 0.1
+
+# 超出并发上限的线程每次等待空闲槽位的时间（秒）
+ADAPTIVE_PARK_INTERVAL = 0.1
+
+# 工作线程每次从词典领取的路径数量
+DICTIONARY_BATCH_SIZE = 16
+
+# Scanner判断结果缓存的最大条目数
+VERDICT_CACHE_SIZE = 4096
+
+# 性能统计中各阶段的显示顺序（各阶段分别计时，互相之间可能有包含关系）
+STATS_PHASES = (
+    "dns", "connect", "tls", "ttfb", "body", "decode",
+    "filter", "scanner", "crawl", "callbacks", "report",
+)
+
+# 性能统计直方图的桶数量，第 i 个桶保存小于 2^i 微秒的耗时
+STATS_HISTOGRAM_BUCKETS = 32
+
 # 等待暂停操作完成的最长等待时间（秒）
 PAUSING_WAIT_TIMEOUT = 7
 
@@ -0,0 +1,329 @@
+import contextlib
+import json
+import os
+import threading
+import time
+
+from collections import Counter
+
+from lib.core.logger import logger
+from lib.core.settings import STATS_HISTOGRAM_BUCKETS, STATS_PHASES
+
+# 未启用统计时 measure 返回的空上下文管理器
+_NULL_TIMER = contextlib.nullcontext()
+
+
+class Histogram:
+    """
+    按 2 的幂划分桶的耗时直方图，记录一次耗时只需要计算一次 bit_length，
+    内存占用固定。分位数在所在桶的范围内按线性插值估算。
+    """
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self):
+        self.buckets = [0] * STATS_HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        """
+        记录一次耗时
+
+        Args:
+            seconds (float): 耗时（秒）
+        """
+        index = min(int(seconds * 1000000).bit_length(), STATS_HISTOGRAM_BUCKETS - 1)
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += seconds
+
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q):
+        """
+        估算分位数
+
+        Args:
+            q (float): 0 到 1 之间的分位
+
+        Returns:
+            float: 耗时（秒），没有记录时返回 0
+        """
+        if not self.count:
+            return 0
+
+        rank = q * self.count
+        seen = 0
+
+        for index, count in enumerate(self.buckets):
+            if count and seen + count >= rank:
+                # 第 index 个桶保存 [2^(index-1), 2^index) 微秒的耗时
+                lower = (1 << index) >> 1
+                value = lower + lower * (rank - seen) / count
+                return min(value / 1000000, self.max)
+
+            seen += count
+
+        return self.max
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: 次数、总耗时和平均、p50、p90、p99、最大耗时（毫秒）
+        """
+        return {
+            "count": self.count,
+            "total": round(self.total, 3),
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0,
+            "p50_ms": round(self.percentile(0.5) * 1000, 3),
+            "p90_ms": round(self.percentile(0.9) * 1000, 3),
+            "p99_ms": round(self.percentile(0.99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class _Timer:
+    """
+    记录代码块耗时的上下文管理器，由 Stats.measure 创建
+    """
+
+    __slots__ = ("_stats", "_phase", "_start")
+
+    def __init__(self, stats, phase):
+        self._stats = stats
+        self._phase = phase
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # 出错的请求等不计入耗时
+        if exc_type is None:
+            self._stats.record(self._phase, time.perf_counter() - self._start)
+
+
+class Stats:
+    """
+    扫描过程的性能统计，记录各阶段（DNS、建立连接、TLS 握手、首字节、读取响应体、解码、过滤、
+    通配符检测、爬取、回调、写入报告）的耗时直方图和请求、重试、新建连接、TLS 握手、
+    缓存命中等计数。
+
+    默认不启用，此时 measure 返回共用的空上下文管理器，record 和 count 直接返回，
+    热路径上的开销只有一次属性判断。统计只包含当前进程，`--processes` 和分布式扫描的
+    子进程不计入。
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.start_time = time.time()
+        self._histograms = {}
+        self._counters = Counter()
+        self._lock = threading.Lock()
+        self._snapshot_thread = None
+        self._snapshot_event = threading.Event()
+
+    def enable(self):
+        """开始统计"""
+        self.enabled = True
+        self.start_time = time.time()
+
+    def record(self, phase, seconds):
+        """
+        记录某个阶段的一次耗时
+
+        Args:
+            phase (str): 阶段名称，见 STATS_PHASES
+            seconds (float): 耗时（秒）
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if phase not in self._histograms:
+                self._histograms[phase] = Histogram()
+
+            self._histograms[phase].add(seconds)
+
+    def count(self, name, value=1):
+        """
+        增加计数
+
+        Args:
+            name (str): 计数名称
+            value (int): 增加的数量
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._counters[name] += value
+
+    def measure(self, phase):
+        """
+        获取记录代码块耗时的上下文管理器
+
+        Args:
+            phase (str): 阶段名称
+
+        Returns:
+            上下文管理器，未启用统计时不计时
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+
+        return _Timer(self, phase)
+
+    def get_ratios(self, counters):
+        """
+        根据计数计算连接复用率和各缓存命中率
+
+        Args:
+            counters (Counter): 计数
+
+        Returns:
+            dict: 比率名称到 0~1 之间比率的映射，缺少数据的比率不包含在内
+        """
+        ratios = {}
+
+        if counters["requests"]:
+            ratios["connection_reuse"] = max(
+                1 - counters["connections"] / counters["requests"], 0
+            )
+
+        for name, hits, misses in (
+            ("dns_cache_hit_rate", "dns_cache_hits", "dns_cache_misses"),
+            ("wildcard_test_reuse", "wildcard_tests_reused", "wildcard_tests_built"),
+        ):
+            total = counters[hits] + counters[misses]
+
+            if total:
+                ratios[name] = counters[hits] / total
+
+        return {name: round(ratio, 4) for name, ratio in ratios.items()}
+
+    def snapshot(self):
+        """
+        获取当前的统计数据
+
+        Returns:
+            dict: 可以保存为 JSON 的统计数据
+        """
+        with self._lock:
+            phases = {
+                phase: histogram.to_dict() for phase, histogram in self._histograms.items()
+            }
+            counters = Counter(self._counters)
+
+        return {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "elapsed": round(time.time() - self.start_time, 3),
+            "phases": {
+                phase: phases[phase]
+                for phase in sorted(
+                    phases,
+                    key=lambda phase: (
+                        STATS_PHASES.index(phase) if phase in STATS_PHASES else len(STATS_PHASES)
+                    ),
+                )
+            },
+            "counters": dict(counters),
+            "ratios": self.get_ratios(counters),
+        }
+
+    def summary(self):
+        """
+        生成扫描结束时在终端显示的统计信息
+
+        Returns:
+            dict: 统计项名称到显示文本的映射
+        """
+        data = self.snapshot()
+        summary = {}
+
+        for phase, histogram in data["phases"].items():
+            summary[phase] = (
+                f"{histogram['count']}x avg {histogram['mean_ms']:.2f}ms "
+                f"p50 {histogram['p50_ms']:.2f}ms p99 {histogram['p99_ms']:.2f}ms"
+            )
+
+        counters = data["counters"]
+
+        for name, label in (
+            ("requests", "Requests"),
+            ("retries", "Retries"),
+            ("connections", "New connections"),
+            ("tls_handshakes", "TLS handshakes"),
+            ("connections_discarded", "Discarded connections"),
+            ("http2_responses", "HTTP/2 responses"),
+            ("proxy_failures", "Proxy failures"),
+            ("proxy_quarantines", "Proxy quarantines"),
+        ):
+            if counters.get(name):
+                summary[label] = str(counters[name])
+
+        for name, label in (
+            ("connection_reuse", "Connection reuse"),
+            ("dns_cache_hit_rate", "DNS cache hit rate"),
+            ("wildcard_test_reuse", "Wildcard tests reused"),
+        ):
+            if name in data["ratios"]:
+                summary[label] = f"{data['ratios'][name]:.1%}"
+
+        return summary
+
+    def write_snapshot(self, path):
+        """
+        把当前的统计数据写入 JSON 文件，先写入临时文件再替换，读取方不会读到写了一半的文件
+
+        Args:
+            path (str): 文件路径
+        """
+        temp_path = f"{path}.tmp"
+
+        with open(temp_path, "w") as fd:
+            json.dump(self.snapshot(), fd, indent=4)
+
+        os.replace(temp_path, path)
+
+    def start_snapshots(self, path, interval):
+        """
+        启动后台线程，每隔 interval 秒把统计数据写入 path
+
+        Args:
+            path (str): 文件路径
+            interval (float): 写入间隔（秒）
+        """
+        self._snapshot_event.clear()
+        self._snapshot_thread = threading.Thread(
+            target=self._snapshot_loop, args=(path, interval), daemon=True
+        )
+        self._snapshot_thread.start()
+
+    def stop_snapshots(self):
+        """
+        停止后台线程，并写入最后一次统计数据
+        """
+        if self._snapshot_thread:
+            self._snapshot_event.set()
+            self._snapshot_thread.join()
+            self._snapshot_thread = None
+
+    def _snapshot_loop(self, path, interval):
+        while True:
+            is_stopped = self._snapshot_event.wait(interval)
+
+            try:
+                self.write_snapshot(path)
+            except OSError as e:
+                logger.error(f"Failed to write statistics to {path}: {e}")
+
+            if is_stopped:
+                break
+
+
+# 全局统计实例
+stats = Stats()
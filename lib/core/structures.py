@@ -1,3 +1,10 @@
+import threading
+import zlib
+
+from array import array
+from collections import OrderedDict
+
+
 class CaseInsensitiveDict(dict):
     """
     一个大小写不敏感的字典类，继承自dict
@@ -165,3 +172,182 @@ class OrderedSet():
         for item in items:
             self.add(item)
 
+
+class LRUCache:
+    """
+    线程安全的定长 LRU 缓存，超出容量时淘汰最久未使用的条目，并统计命中/未命中次数
+
+    Args:
+        maxsize (int): 最多保存的条目数量
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """
+        获取缓存中的条目数量
+
+        Returns:
+            int: 条目数量
+        """
+        return len(self._data)
+
+    def get(self, key, default=None):
+        """
+        获取缓存值，并将该条目标记为最近使用
+
+        Args:
+            key: 键
+            default: 键不存在时返回的默认值
+
+        Returns:
+            缓存值或默认值
+        """
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            return self._data[key]
+
+    def set(self, key, value):
+        """
+        写入缓存值，超出容量时淘汰最久未使用的条目
+
+        Args:
+            key: 键
+            value: 值
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """
+        清空缓存（不重置命中统计）
+        """
+        with self._lock:
+            self._data.clear()
+
+
+class DigestSet:
+    """
+    只保存字符串指纹的紧凑集合，用于对大词典去重
+
+    指纹由 64 位的 hash() 和 32 位的 CRC32 组成，分别存放在 array('Q') 和 array('I') 组成的
+    开放寻址哈希表中，负载因子不超过 2/3，每个元素约占 18 到 36 字节，不需要为每个元素
+    创建 Python 对象。两个不同字符串的指纹相同时后一个会被误判为重复，
+    n 个元素中出现这种情况的概率约为 n² / 2^97，实际可以忽略。
+
+    Args:
+        capacity (int): 哈希表的初始槽位数量，必须是 2 的幂
+    """
+
+    def __init__(self, capacity=1024):
+        self._size = 0
+        self._mask = capacity - 1
+        self._high = array("Q", bytes(8 * capacity))
+        self._low = array("I", bytes(4 * capacity))
+
+    def __len__(self):
+        """
+        获取集合中的元素数量
+
+        Returns:
+            int: 元素数量
+        """
+        return self._size
+
+    def __contains__(self, item):
+        """
+        检查字符串是否在集合中
+
+        Args:
+            item (str): 要检查的字符串
+
+        Returns:
+            bool: 字符串的指纹在集合中时返回 True
+        """
+        return self._find(item)[0] is not None
+
+    def _find(self, item):
+        """
+        线性探测查找字符串的指纹
+
+        Returns:
+            tuple: (指纹所在的槽位，不存在时为 None, 应插入的空槽位, 指纹高 64 位, 指纹低 32 位)
+        """
+        # 最低位置 1，0 表示空槽位；str 的 hash() 会被缓存，CRC32 与它相互独立
+        high = hash(item) & 0xFFFFFFFFFFFFFFFF | 1
+        low = zlib.crc32(item.encode("utf-8", "surrogatepass"))
+        table = self._high
+        mask = self._mask
+        index = high & mask
+
+        while True:
+            slot = table[index]
+
+            if not slot:
+                return None, index, high, low
+
+            if slot == high and self._low[index] == low:
+                return index, index, high, low
+
+            index = (index + 1) & mask
+
+    def _grow(self):
+        """
+        槽位数量翻倍并重新插入所有指纹
+        """
+        old_high, old_low = self._high, self._low
+        capacity = len(old_high) * 2
+        mask = self._mask = capacity - 1
+        table = self._high = array("Q", bytes(8 * capacity))
+        low_table = self._low = array("I", bytes(4 * capacity))
+
+        for old_index, high in enumerate(old_high):
+            if not high:
+                continue
+
+            index = high & mask
+
+            while table[index]:
+                index = (index + 1) & mask
+
+            table[index] = high
+            low_table[index] = old_low[old_index]
+
+    def add(self, item):
+        """
+        添加字符串
+
+        Args:
+            item (str): 要添加的字符串
+
+        Returns:
+            bool: 字符串原本不在集合中时返回 True
+        """
+        found, index, high, low = self._find(item)
+
+        if found is not None:
+            return False
+
+        self._high[index] = high
+        self._low[index] = low
+        self._size += 1
+
+        if self._size * 3 > (self._mask + 1) * 2:
+            self._grow()
+
+        return True
@@ -214,6 +214,82 @@ def parse_arguments():
         metavar="线程数",
         help="线程数量",
     )
+    general.add_option(
+        "--adaptive",
+        action="store_true",
+        dest="adaptive_concurrency",
+        help="根据请求延迟、错误和 429/503 状态码在 [--min-threads, --threads] 范围内自动调整并发数",
+    )
+    general.add_option(
+        "--min-threads",
+        action="store",
+        type="int",
+        dest="min_thread_count",
+        metavar="线程数",
+        help="自适应并发模式下的最小线程数(默认: 1)",
+    )
+    general.add_option(
+        "--engine",
+        action="store",
+        dest="engine",
+        metavar="引擎",
+        help="请求引擎(thread, async)，async 模式使用单个事件循环发送请求，线程数即同时在途的请求数(默认: thread)",
+    )
+    general.add_option(
+        "--parallel-targets",
+        action="store",
+        type="int",
+        dest="parallel_targets",
+        metavar="数量",
+        help="同时扫描的目标数量，线程数在同时扫描的目标之间平均分配，仅支持 thread 引擎(默认: 1)",
+    )
+    general.add_option(
+        "--processes",
+        action="store",
+        type="int",
+        dest="process_count",
+        metavar="数量",
+        help="扫描进程数量，每个进程使用词典的一个分片，线程数和每秒最大请求数在进程之间平均分配，"
+        "用于比较响应、爬取等耗 CPU 的扫描，仅支持 thread 引擎(默认: 1)",
+    )
+    general.add_option(
+        "--coordinator",
+        action="store",
+        dest="coordinator",
+        metavar="地址",
+        help="以分布式扫描的协调节点身份运行，在 主机:端口 上等待工作节点领取扫描任务，"
+        "省略主机时只监听 127.0.0.1",
+    )
+    general.add_option(
+        "--worker",
+        action="store",
+        dest="worker",
+        metavar="地址",
+        help="以工作节点身份运行，从 主机:端口 的协调节点领取扫描任务，"
+        "扫描选项由协调节点下发(线程数和每秒最大请求数使用本机的设置)，字典文件需要在本机的相同路径存在",
+    )
+    general.add_option(
+        "--cluster-token",
+        action="store",
+        dest="cluster_token",
+        metavar="令牌",
+        help="协调节点和工作节点共享的令牌，工作节点必须指定；协调节点未指定时随机生成并显示",
+    )
+    general.add_option(
+        "--diff-engine",
+        action="store",
+        dest="diff_engine",
+        metavar="引擎",
+        help="通配符响应相似度比较引擎(difflib, fast)，fast 跳过逐字符的差异比较以减少 CPU 开销(默认: difflib)",
+    )
+    general.add_option(
+        "--probe",
+        action="store",
+        dest="probe",
+        metavar="模式",
+        help="探测模式(none, head, range)，先用 HEAD 或只请求开头部分内容的 GET 探测，"
+        "只有未被状态码过滤规则排除的路径才发送完整请求，目标不支持 HEAD 时改用 range(默认: none)",
+    )
     general.add_option(
         "-r",
         "--recursive",
@@ -339,6 +415,14 @@ def parse_arguments():
         metavar="长度",
         default=0,
     )
+    general.add_option(
+        "--excluded-body-size",
+        action="store",
+        type="int",
+        dest="excluded_body_size",
+        metavar="KB",
+        help="状态码会被 -i/-x 排除的响应最多读取的响应体大小，超出部分不再下载(默认: 64)",
+    )
     general.add_option(
         "--max-time",
         action="store",
@@ -347,6 +431,15 @@ def parse_arguments():
         metavar="秒数",
         help="扫描的最大运行时间",
     )
+    general.add_option(
+        "--checkpoint-interval",
+        action="store",
+        type="int",
+        dest="checkpoint_interval",
+        metavar="秒数",
+        help="每隔多少秒把扫描进度追加保存到会话文件，程序意外退出后可以用 --session 恢复，"
+        "0 表示只在退出时手动保存(默认: 0)",
+    )
     general.add_option(
         "--exit-on-error",
         action="store_true",
@@ -480,6 +573,14 @@ def parse_arguments():
         metavar="凭证",
         help="代理身份验证凭据",
     )
+    connection.add_option(
+        "--proxy-connections",
+        action="store",
+        type="int",
+        dest="proxy_connections",
+        metavar="数量",
+        help="每个代理同时在途的最大请求数(默认: 不限制)",
+    )
     connection.add_option(
         "--replay-proxy",
         action="store",
@@ -503,10 +604,27 @@ def parse_arguments():
     connection.add_option(
         "--max-rate",
         action="store",
-        type="int",
+        type="float",
         dest="max_rate",
         metavar="速率",
-        help="每秒最大请求数",
+        help="每秒最大请求数，支持小数(例如 0.5)，同时扫描多个目标时为所有目标合计的限制，"
+        "分布式扫描时为每个工作节点的限制",
+    )
+    connection.add_option(
+        "--rate-burst",
+        action="store",
+        type="int",
+        dest="rate_burst",
+        metavar="数量",
+        help="限速时允许的最大突发请求数(默认: 与每秒最大请求数相同)",
+    )
+    connection.add_option(
+        "--host-connections",
+        action="store",
+        type="int",
+        dest="host_connections",
+        metavar="数量",
+        help="同时扫描多个目标时，同一主机同时在途的最大请求数(默认: 不限制)",
     )
     connection.add_option(
         "--retries",
@@ -522,6 +640,26 @@ def parse_arguments():
         dest="ip",
         help="服务器IP地址"
     )
+    connection.add_option(
+        "--dns-ttl",
+        action="store",
+        type="int",
+        dest="dns_ttl",
+        metavar="秒数",
+        help="DNS 解析结果的缓存时间，0 表示不过期(默认: 300)",
+    )
+    connection.add_option(
+        "--dns-rotate",
+        action="store_true",
+        dest="dns_rotate",
+        help="主机解析到多个地址时轮流使用，把连接分散到负载均衡后面的各个服务器",
+    )
+    connection.add_option(
+        "--http2",
+        action="store_true",
+        dest="http2",
+        help="服务器支持时使用 HTTP/2，在少量连接上同时发送多个请求，不支持时自动使用 HTTP/1.1(需要安装 h2)",
+    )
 
     # === 高级设置组 ===
     advanced = OptionGroup(parser, "高级设置")
@@ -568,14 +706,14 @@ def parse_arguments():
         action="store",
         dest="output_file",
         metavar="路径",
-        help="输出文件",
+        help="输出文件，为 - 时写到标准输出(终端输出改为标准错误)",
     )
     output.add_option(
         "--format",
         action="store",
         dest="output_format",
         metavar="格式",
-        help="报告格式(可用: simple, plain, json, xml, md, csv, html, sqlite)",
+        help="报告格式(可用: simple, plain, json, jsonl, xml, md, csv, html, sqlite)",
     )
     output.add_option(
         "--log",
@@ -584,6 +722,27 @@ def parse_arguments():
         metavar="路径",
         help="日志文件"
     )
+    output.add_option(
+        "--stats",
+        action="store_true",
+        dest="stats",
+        help="统计各阶段的耗时、连接复用率和缓存命中率，扫描结束时显示",
+    )
+    output.add_option(
+        "--stats-file",
+        action="store",
+        dest="stats_file",
+        metavar="路径",
+        help="定期把性能统计保存为 JSON 文件(会同时启用 --stats)",
+    )
+    output.add_option(
+        "--stats-interval",
+        action="store",
+        type="int",
+        dest="stats_interval",
+        metavar="秒数",
+        help="保存 --stats-file 的间隔(默认: 10)",
+    )
 
     # 将各个选项组加入主解析器
     parser.add_option_group(mandatory)
@@ -1,15 +1,29 @@
-from lib.core.decorators import locked
+import queue
+import sys
+import threading
+
+from lib.core.logger import logger
 from lib.core.settings import IS_WINDOWS
+from lib.core.stats import stats
 
 
 class FileBaseReport:
     """
     文件基础报告类，用于生成和保存报告到文件
 
+    报告由头部、条目和尾部组成。扫描时发现的条目通过 add 放入队列，由单独的写入线程
+    追加到文件中：每次写入从上次尾部的位置开始，写入新条目后重新写入尾部，
+    因此每个条目只写一次，JSON、XML 等结构化格式的文件在任何时候也都是完整的。
+
+    输出文件为 `-` 时写到标准输出，标准输出、命名管道等不能定位的文件在关闭时才写入尾部。
+
     Args:
         output_file (str): 输出文件路径
     """
 
+    # 条目之间的分隔符
+    separator = ""
+
     def __init__(self, output_file):
         # 如果是Windows系统，规范化文件路径
         if IS_WINDOWS:
@@ -18,39 +32,199 @@ class FileBaseReport:
             output_file = normpath(output_file)
 
         self.output_file = output_file
+        self._queue = queue.Queue()
+        self._thread = None
+        self._fd = None
+        self._footer_position = 0
+        self._is_seekable = False
+        self._is_failed = False
+
+    def __getstate__(self):
+        # 写入线程和队列不保存到会话中
+        return {"output_file": self.output_file}
+
+    def __setstate__(self, state):
+        self.__init__(state["output_file"])
+
+    def open(self, entries=()):
+        """
+        启动写入线程，文件在写入第一个条目时才创建
+
+        Args:
+            entries (list): 已有的条目（恢复会话时），会在新条目之前写入
+        """
+        self._thread = threading.Thread(
+            target=self._write_loop, args=(list(entries),), daemon=True
+        )
+        self._thread.start()
+
+    def add(self, entry):
+        """
+        把一个条目交给写入线程，不等待写入完成
+
+        Args:
+            entry: 要保存的条目
+        """
+        # 写入失败后写入线程已经退出，不再积压条目
+        if not self._is_failed:
+            self._queue.put(entry)
 
-    @locked
-    def save(self, entries):
+    def close(self):
         """
-        保存条目到输出文件
+        等待队列中的条目全部写入后关闭文件
+        """
+        if self._thread:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _write_loop(self, entries):
+        """
+        写入线程，每次取出队列中积压的所有条目一起写入
 
         Args:
-            entries (list): 要保存的条目列表
+            entries (list): 需要先写入的条目
+        """
+        is_closed = False
+
+        try:
+            while not is_closed:
+                items = [] if entries else [self._queue.get()]
+
+                while True:
+                    try:
+                        items.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                for item in items:
+                    if item is None:
+                        is_closed = True
+                    else:
+                        entries.append(item)
+
+                if entries:
+                    with stats.measure("report"):
+                        self.write(entries)
+
+                    entries.clear()
+
+        except Exception as e:
+            # 写入失败不影响扫描，之后的结果不再写入，已在队列中的条目也一并丢弃
+            self._is_failed = True
+            logger.error(f"Failed to write report {self.output_file}: {e}")
+
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+        finally:
+            self.close_file()
+
+    def open_file(self):
+        """
+        在写入线程中打开输出文件
 
         Returns:
-            None
+            file: 文件对象，输出文件为 `-` 时为标准输出
+        """
+        if self.output_file == "-":
+            return sys.__stdout__
+
+        return open(self.output_file, "w")
+
+    def write(self, entries):
+        """
+        在写入线程中把一批条目追加到文件
+
+        Args:
+            entries (list): 要写入的条目
+        """
+        footer = self.get_footer()
+
+        if not self._fd:
+            self._fd = self.open_file()
+            self._is_seekable = self._fd.seekable()
+            self._fd.write(self.get_header())
+        else:
+            if footer and self._is_seekable:
+                # 覆盖上次写入的尾部
+                self._fd.seek(self._footer_position)
+
+            self._fd.write(self.separator)
+
+        self._fd.write(self.separator.join(map(self.format_entry, entries)))
+
+        if footer and self._is_seekable:
+            self._footer_position = self._fd.tell()
+            self._fd.write(footer)
+            self._fd.truncate()
+
+        self._fd.flush()
+
+    def close_file(self):
+        """
+        在写入线程结束时关闭文件
         """
-        # 如果没有条目则直接返回
-        if not entries:
+        if not self._fd:
             return
 
-        # 打开文件并写入生成的内容
-        with open(self.output_file, "w") as fd:
-            fd.writelines(self.generate(entries))
-            fd.flush()
+        if not self._is_seekable:
+            self._fd.write(self.get_footer())
+            self._fd.flush()
+
+        if self._fd is not sys.__stdout__:
+            self._fd.close()
+
+        self._fd = None
 
     def generate(self, entries):
         """
-        生成报告内容的抽象方法，需要子类实现
+        生成包含所有条目的完整报告内容
 
         Args:
             entries (list): 要生成报告的条目列表
 
         Returns:
             str: 生成的报告内容
+        """
+        return (
+            self.get_header()
+            + self.separator.join(map(self.format_entry, entries))
+            + self.get_footer()
+        )
+
+    def get_header(self):
+        """
+        获取报告头部
+
+        Returns:
+            str: 报告头部，默认为空
+        """
+        return ""
+
+    def get_footer(self):
+        """
+        获取报告尾部，每次写入新条目后都会重新写入
+
+        Returns:
+            str: 报告尾部，默认为空
+        """
+        return ""
+
+    def format_entry(self, entry):
+        """
+        生成单个条目内容的抽象方法，需要子类实现
+
+        Args:
+            entry: 要生成的条目
+
+        Returns:
+            str: 条目内容
 
         Raises:
             NotImplementedError: 当子类没有实现此方法时抛出
         """
         raise NotImplementedError
-
@@ -19,27 +19,20 @@ class CSVReport(FileBaseReport):
         """
         return "URL,Status,Size,Content Type,Redirection" + NEW_LINE
 
-    def generate(self, entries):
+    def format_entry(self, entry):
         """
-        生成CSV格式的报告内容
+        生成一个扫描结果的CSV行
 
         参数:
-            entries: 扫描结果条目列表，每个条目应包含url、status、length、type和redirect属性
+            entry: 扫描结果条目，应包含url、status、length、type和redirect属性
 
         返回值:
-            str: 完整的CSV格式报告字符串
+            str: 以换行符结尾的CSV行
         """
-        output = self.get_header()
+        output = f"{entry.url},{entry.status},{entry.length},{entry.type},"
 
-        # 遍历所有扫描结果条目，生成CSV行数据
-        for entry in entries:
-            output += f"{entry.url},{entry.status},{entry.length},{entry.type},"
-
-            # 如果存在重定向信息，则对其进行CSV转义处理后添加到输出
-            if entry.redirect:
-                output += f'"{escape_csv(entry.redirect)}"'
-
-            output += NEW_LINE
-
-        return output
+        # 如果存在重定向信息，则对其进行CSV转义处理后添加到输出
+        if entry.redirect:
+            output += f'"{escape_csv(entry.redirect)}"'
 
+        return output + NEW_LINE
@@ -3,61 +3,82 @@ import sys
 import time
 
 from jinja2 import Environment, FileSystemLoader
+from jinja2.utils import htmlsafe_json_dumps
 
 from lib.reports.base import FileBaseReport
 from lib.utils.common import human_size
 
+# 模板中结果数组内容的占位符，渲染后在此处分成报告的头部和尾部
+RESULTS_PLACEHOLDER = "\x00"
+
 
 class HTMLReport(FileBaseReport):
     """
     HTML报告生成器类
 
-    该类继承自FileBaseReport，用于生成HTML格式的扫描结果报告
+    该类继承自FileBaseReport，用于生成HTML格式的扫描结果报告。
+    模板只渲染一次，结果数组之后的部分作为报告尾部，新的结果写在它之前
     """
 
-    def generate(self, entries):
-        """
-        生成HTML格式的报告
+    separator = ", "
 
-        Args:
-            entries: 扫描结果条目列表，每个条目包含URL、状态码、内容长度等信息
+    def __init__(self, output_file):
+        super().__init__(output_file)
+        self._layout = None
+
+    def get_layout(self):
+        """
+        渲染报告模板，得到结果数组前后的两部分
 
         Returns:
-            str: 渲染后的HTML报告字符串
+            tuple: (头部, 尾部)
         """
-        # 配置Jinja2模板环境，加载报告模板
-        file_loader = FileSystemLoader(
-            os.path.dirname(os.path.realpath(__file__)) + "/templates/"
-        )
-        env = Environment(loader=file_loader)
-        template = env.get_template("html_report_template.html")
-
-        # 准备报告元数据，包括命令行参数和生成时间
-        metadata = {"command": " ".join(sys.argv), "date": time.ctime()}
-        results = []
-
-        # 处理每个扫描结果条目，根据状态码设置相应的CSS样式类
-        for entry in entries:
-            status_color_class = ""
-            if entry.status >= 200 and entry.status <= 299:
-                status_color_class = "text-success"
-            elif entry.status >= 300 and entry.status <= 399:
-                status_color_class = "text-warning"
-            elif entry.status >= 400 and entry.status <= 599:
-                status_color_class = "text-danger"
-
-            # 将处理后的结果添加到结果列表中
-            results.append(
-                {
-                    "url": entry.url,
-                    "status": entry.status,
-                    "statusColorClass": status_color_class,
-                    "contentLength": human_size(entry.length),
-                    "contentType": entry.type,
-                    "redirect": entry.redirect,
-                }
+        if self._layout is None:
+            # 配置Jinja2模板环境，加载报告模板
+            file_loader = FileSystemLoader(
+                os.path.dirname(os.path.realpath(__file__)) + "/templates/"
             )
+            env = Environment(loader=file_loader)
+            template = env.get_template("html_report_template.html")
+
+            # 准备报告元数据，包括命令行参数和生成时间
+            metadata = {"command": " ".join(sys.argv), "date": time.ctime()}
+            html = template.render(metadata=metadata, results=RESULTS_PLACEHOLDER)
+            self._layout = tuple(html.split(RESULTS_PLACEHOLDER, 1))
+
+        return self._layout
+
+    def get_header(self):
+        return self.get_layout()[0]
 
-        # 使用模板渲染最终的HTML报告
-        return template.render(metadata=metadata, results=results)
+    def get_footer(self):
+        return self.get_layout()[1]
+
+    def format_entry(self, entry):
+        """
+        生成结果数组中的一个元素
+
+        Args:
+            entry: 扫描结果条目，包含URL、状态码、内容长度等信息
+
+        Returns:
+            str: 可以直接嵌入HTML的JSON对象字符串
+        """
+        # 根据状态码设置相应的CSS样式类
+        status_color_class = ""
+        if entry.status >= 200 and entry.status <= 299:
+            status_color_class = "text-success"
+        elif entry.status >= 300 and entry.status <= 399:
+            status_color_class = "text-warning"
+        elif entry.status >= 400 and entry.status <= 599:
+            status_color_class = "text-danger"
 
+        result = {
+            "url": entry.url,
+            "status": entry.status,
+            "statusColorClass": status_color_class,
+            "contentLength": human_size(entry.length),
+            "contentType": entry.type,
+            "redirect": entry.redirect,
+        }
+        return htmlsafe_json_dumps(result, sort_keys=True)
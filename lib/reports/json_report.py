@@ -2,6 +2,8 @@ import json
 import time
 import sys
 
+from textwrap import indent
+
 from lib.reports.base import FileBaseReport
 
 
@@ -9,36 +11,47 @@ class JSONReport(FileBaseReport):
     """
     JSON格式报告生成器类
 
-    该类继承自FileBaseReport，用于将扫描结果生成JSON格式的报告
+    该类继承自FileBaseReport，用于将扫描结果生成JSON格式的报告。
+    results 数组的结尾作为报告尾部，新的结果写在它之前
     """
 
-    def generate(self, entries):
+    separator = ",\n"
+
+    def get_header(self):
         """
-        生成JSON格式的报告
+        生成报告开头，包含扫描信息和 results 数组的开始
 
-        Args:
-            entries: 扫描结果条目列表，每个条目包含URL、状态码等信息
+        Returns:
+            str: JSON报告的开头部分
+        """
+        info = {"args": " ".join(sys.argv), "time": time.ctime()}
+        info = indent(json.dumps(info, sort_keys=True, indent=4), " " * 4).lstrip()
+        return f'{{\n    "info": {info},\n    "results": [\n'
+
+    def get_footer(self):
+        """
+        生成报告结尾，闭合 results 数组和整个对象
 
         Returns:
-            str: 格式化后的JSON字符串报告，包含扫描信息和结果详情
+            str: JSON报告的结尾部分
         """
-        # 初始化报告结构，包含基本信息和结果列表
-        report = {
-            "info": {"args": " ".join(sys.argv), "time": time.ctime()},
-            "results": [],
-        }
+        return "\n    ]\n}"
 
-        # 遍历所有扫描结果条目，提取关键信息并添加到报告中
-        for entry in entries:
-            result = {
-                "url": entry.url,
-                "status": entry.status,
-                "content-length": entry.length,
-                "content-type": entry.type,
-                "redirect": entry.redirect,
-            }
-            report["results"].append(result)
+    def format_entry(self, entry):
+        """
+        生成 results 数组中的一个元素
 
-        # 将报告转换为格式化的JSON字符串并返回
-        return json.dumps(report, sort_keys=True, indent=4)
+        Args:
+            entry: 扫描结果条目，包含URL、状态码等信息
 
+        Returns:
+            str: 格式化后的JSON对象字符串
+        """
+        result = {
+            "url": entry.url,
+            "status": entry.status,
+            "content-length": entry.length,
+            "content-type": entry.type,
+            "redirect": entry.redirect,
+        }
+        return indent(json.dumps(result, sort_keys=True, indent=4), " " * 8)
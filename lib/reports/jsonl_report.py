@@ -0,0 +1,37 @@
+import hashlib
+import json
+
+from lib.reports.base import FileBaseReport
+
+
+class JSONLinesReport(FileBaseReport):
+    """
+    JSON Lines格式报告生成器类
+
+    每个结果一行紧凑的JSON对象，发现后立即追加，没有头部和尾部。
+    输出到标准输出（`-o -`）或命名管道时，其他工具可以边扫描边逐行读取结果
+    """
+
+    def format_entry(self, entry):
+        """
+        生成一个结果的JSON行
+
+        Args:
+            entry: 扫描结果条目
+
+        Returns:
+            str: 以换行符结尾的JSON对象，有响应体时包含响应体的 SHA-256
+        """
+        record = {
+            "url": entry.url,
+            "status": entry.status,
+            "content-length": entry.length,
+            "content-type": entry.type,
+            "redirect": entry.redirect,
+            "elapsed": round(entry.elapsed, 3),
+        }
+
+        if entry.body:
+            record["body-sha256"] = hashlib.sha256(entry.body).hexdigest()
+
+        return json.dumps(record, separators=(",", ":")) + "\n"
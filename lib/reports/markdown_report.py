@@ -33,24 +33,14 @@ class MarkdownReport(FileBaseReport):
         header += "----|--------|------|--------------|------------" + NEW_LINE
         return header
 
-    def generate(self, entries):
+    def format_entry(self, entry):
         """
-        生成完整的Markdown格式报告
-
-        将扫描结果条目转换为Markdown表格格式的报告内容
+        生成一个扫描结果的Markdown表格行
 
         Args:
-            entries (list): 扫描结果条目列表，每个条目应包含url、status、length、type、redirect属性
+            entry: 扫描结果条目，应包含url、status、length、type、redirect属性
 
         Returns:
-            str: 完整的Markdown格式报告内容
+            str: 以换行符结尾的表格行
         """
-        # 初始化输出内容并添加报告头部
-        output = self.get_header()
-
-        # 遍历所有条目，将每个条目的信息添加到输出中
-        for entry in entries:
-            output += f"{entry.url} | {entry.status} | {entry.length} | {entry.type} | {entry.redirect}" + NEW_LINE
-
-        return output
-
+        return f"{entry.url} | {entry.status} | {entry.length} | {entry.type} | {entry.redirect}" + NEW_LINE
@@ -25,35 +25,23 @@ class PlainTextReport(FileBaseReport):
         # 构造包含启动时间和命令行参数的头部信息
         return f"# Dirsearch started {time.ctime()} as: {chr(32).join(sys.argv)}" + NEW_LINE * 2
 
-    def generate(self, entries):
+    def format_entry(self, entry):
         """
-        生成纯文本格式的报告内容
-
-        遍历所有扫描结果条目，格式化每个条目的状态码、大小和URL信息，
-        并处理重定向信息，最终生成完整的报告文本
+        生成一个扫描结果的纯文本行，包含状态码、大小、URL和重定向信息
 
         Args:
-            entries: 扫描结果条目列表，每个条目包含status、length、url和redirect等属性
+            entry: 扫描结果条目，包含status、length、url和redirect等属性
 
         Returns:
-            str: 完整的纯文本格式报告内容
+            str: 以换行符结尾的报告行
         """
-        # 初始化输出内容，添加报告头部
-        output = self.get_header()
-
-        # 遍历所有扫描结果条目并格式化输出
-        for entry in entries:
-            # 将字节大小转换为人类可读格式
-            readable_size = human_size(entry.length)
-            # 格式化状态码、大小和URL信息
-            output += f"{entry.status}  {readable_size.rjust(6, chr(32))}  {entry.url}"
-
-            # 如果存在重定向，则添加重定向信息
-            if entry.redirect:
-                output += f"    -> REDIRECTS TO: {entry.redirect}"
-
-            # 添加换行符
-            output += NEW_LINE
+        # 将字节大小转换为人类可读格式
+        readable_size = human_size(entry.length)
+        # 格式化状态码、大小和URL信息
+        output = f"{entry.status}  {readable_size.rjust(6, chr(32))}  {entry.url}"
 
-        return output
+        # 如果存在重定向，则添加重定向信息
+        if entry.redirect:
+            output += f"    -> REDIRECTS TO: {entry.redirect}"
 
+        return output + NEW_LINE
@@ -1,78 +1,144 @@
 import sqlite3
+import sys
 import time
 
-from lib.core.decorators import locked
+from urllib.parse import urlparse
+
 from lib.reports.base import FileBaseReport
 
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scan (
+    id INTEGER PRIMARY KEY,
+    args TEXT,
+    started TEXT
+);
+CREATE TABLE IF NOT EXISTS target (
+    id INTEGER PRIMARY KEY,
+    scan_id INTEGER NOT NULL REFERENCES scan(id),
+    url TEXT NOT NULL,
+    host TEXT NOT NULL,
+    UNIQUE (scan_id, url)
+);
+CREATE TABLE IF NOT EXISTS result (
+    id INTEGER PRIMARY KEY,
+    target_id INTEGER NOT NULL REFERENCES target(id),
+    time TEXT,
+    url TEXT NOT NULL,
+    path TEXT,
+    status INTEGER,
+    content_length INTEGER,
+    content_type TEXT,
+    redirect TEXT,
+    elapsed REAL,
+    UNIQUE (target_id, url)
+);
+CREATE INDEX IF NOT EXISTS target_host ON target(host);
+CREATE INDEX IF NOT EXISTS result_status ON result(status);
+"""
+
 
 class SQLiteReport(FileBaseReport):
     """
     SQLite报告生成器类
 
-    该类用于将扫描结果保存到SQLite数据库中，每个主机创建一个独立的数据表
+    所有扫描写入同一个数据库，每次运行在 scan 表中新增一行，结果按目标保存在 result 表中，
+    可以按主机、状态码查询，或比较不同扫描的结果。数据库使用 WAL 模式，
+    写入线程把每批结果用一次 executemany 插入并提交。
+
+    恢复会话时继续写入原来的扫描，已写入的结果不会重复插入。
     """
 
-    def generate(self, entries):
+    def __init__(self, output_file, scan_id=None):
+        super().__init__(output_file)
+        self.scan_id = scan_id
+        self._target_ids = {}
+
+    def __getstate__(self):
+        return {"output_file": self.output_file, "scan_id": self.scan_id}
+
+    def __setstate__(self, state):
+        self.__init__(state["output_file"], state.get("scan_id"))
+
+    def connect(self):
+        """
+        在写入线程中打开数据库，创建表结构并记录本次扫描
         """
-        生成SQL命令列表用于创建表和插入数据
+        self._fd = sqlite3.connect(self.output_file)
+        self._fd.execute("PRAGMA journal_mode=WAL")
+        # WAL 模式下只在检查点同步磁盘，程序崩溃时不会损坏数据库
+        self._fd.execute("PRAGMA synchronous=NORMAL")
+        self._fd.executescript(SCHEMA)
+
+        if self.scan_id is None:
+            cursor = self._fd.execute(
+                "INSERT INTO scan (args, started) VALUES (?, ?)",
+                (" ".join(sys.argv), time.strftime("%Y-%m-%d %H:%M:%S")),
+            )
+            self.scan_id = cursor.lastrowid
+
+    def get_target_id(self, url):
+        """
+        获取结果所属目标的编号，目标不存在时新建
 
         Args:
-            entries: 包含扫描结果条目的列表，每个条目应包含url、status、length、type、redirect等属性
+            url (str): 结果的URL
 
         Returns:
-            list: 包含SQL命令及其参数的列表，每个元素为一个包含命令和可选参数的列表
+            int: 目标编号
         """
-        commands = []
-        created_tables = []
-
-        for entry in entries:
-            # 从URL中提取主机名作为表名
-            host = entry.url.split("/")[2]
-            if host not in created_tables:
-                # 如果该主机的表还未创建，则先删除可能存在的同名表，然后创建新表
-                commands.append([f"DROP TABLE IF EXISTS `{host}`"])
-                commands.append(
-                    [
-                        f"""CREATE TABLE `{host}`
-                        ([time] TEXT, [url] TEXT, [status_code] INTEGER, [content_length] INTEGER, [content_type] TEXT, [redirect] TEXT)"""
-                    ]
-                )
-                created_tables.append(host)
-
-            # 为当前条目生成插入语句，使用参数化查询防止SQL注入
-            commands.append(
-                [
-                    f"""INSERT INTO `{host}` (time, url, status_code, content_length, content_type, redirect)
-                    VALUES
-                    (?, ?, ?, ?, ?, ?)""",
-                    (
-                        time.ctime(),
-                        entry.url,
-                        entry.status,
-                        entry.length,
-                        entry.type,
-                        entry.redirect,
-                    ),
-                ]
+        parsed = urlparse(url)
+        target = f"{parsed.scheme}://{parsed.netloc}/"
+
+        if target not in self._target_ids:
+            self._fd.execute(
+                "INSERT OR IGNORE INTO target (scan_id, url, host) VALUES (?, ?, ?)",
+                (self.scan_id, target, parsed.hostname),
             )
+            self._target_ids[target] = self._fd.execute(
+                "SELECT id FROM target WHERE scan_id = ? AND url = ?",
+                (self.scan_id, target),
+            ).fetchone()[0]
 
-        return commands
+        return self._target_ids[target]
 
-    def open(self):
-        """
-        打开SQLite数据库连接并创建游标对象
+    def write(self, entries):
         """
-        self.file = sqlite3.connect(self.output, check_same_thread=False)
-        self.cursor = self.file.cursor()
+        在写入线程中插入一批结果并提交
 
-    @locked
-    def save(self):
-        """
-        执行所有SQL命令并将结果保存到数据库中
-        使用装饰器确保线程安全
+        Args:
+            entries (list): 要写入的结果
         """
-        for command in self.generate():
-            self.cursor.execute(*command)
+        if not self._fd:
+            self.connect()
 
-        self.file.commit()
+        now = time.strftime("%Y-%m-%d %H:%M:%S")
+        rows = [
+            (
+                self.get_target_id(entry.url),
+                now,
+                entry.url,
+                entry.path,
+                entry.status,
+                entry.length,
+                entry.type,
+                entry.redirect,
+                entry.elapsed,
+            )
+            for entry in entries
+        ]
+
+        self._fd.executemany(
+            """INSERT OR IGNORE INTO result
+            (target_id, time, url, path, status, content_length, content_type, redirect, elapsed)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            rows,
+        )
+        self._fd.commit()
 
+    def close_file(self):
+        """
+        在写入线程结束时关闭数据库
+        """
+        if self._fd:
+            self._fd.close()
+            self._fd = None
@@ -1,10 +1,8 @@
 import time
 import sys
 
-from xml.dom import minidom
-from xml.etree import ElementTree as ET
+from xml.sax.saxutils import escape, quoteattr
 
-from lib.core.settings import DEFAULT_ENCODING
 from lib.reports.base import FileBaseReport
 
 
@@ -12,38 +10,48 @@ class XMLReport(FileBaseReport):
     """
     XML报告生成器类
 
-    该类继承自FileBaseReport，用于将扫描结果生成XML格式的报告
+    该类继承自FileBaseReport，用于将扫描结果生成XML格式的报告。
+    根元素的结束标签作为报告尾部，新的结果写在它之前
     """
 
-    def generate(self, entries):
+    def get_header(self):
         """
-        生成XML格式的扫描报告
+        生成XML声明和根元素的开始标签，包含命令行参数和扫描时间属性
+
+        Returns:
+            str: XML报告的开头部分
+        """
+        return (
+            '<?xml version="1.0" ?>\n'
+            f'<dirsearchscan args={quoteattr(" ".join(sys.argv))} time={quoteattr(time.ctime())}>\n'
+        )
+
+    def get_footer(self):
+        """
+        生成根元素的结束标签
+
+        Returns:
+            str: XML报告的结尾部分
+        """
+        return "</dirsearchscan>\n"
+
+    def format_entry(self, entry):
+        """
+        生成一个扫描结果的 target 节点
 
         Args:
-            entries: 扫描结果条目列表，每个条目包含url、status、length、type和redirect等信息
+            entry: 扫描结果条目，包含url、status、length、type和redirect等信息
 
         Returns:
-            str: 格式化后的XML字符串，包含所有扫描结果信息
+            str: 缩进格式化后的 target 节点
         """
-        # 创建根元素，包含命令行参数和扫描时间属性
-        tree = ET.Element("dirsearchscan", args=" ".join(sys.argv), time=time.ctime())
-
-        # 遍历所有扫描结果条目，为每个条目创建XML节点
-        for entry in entries:
-            # 创建目标节点，包含URL属性
-            target = ET.SubElement(tree, "target", url=entry.url)
-            # 添加状态码子节点
-            ET.SubElement(target, "status").text = str(entry.status)
-            # 添加内容长度子节点
-            ET.SubElement(target, "contentLength").text = str(entry.length)
-            # 添加内容类型子节点
-            ET.SubElement(target, "contentType").text = entry.type
-            # 如果存在重定向信息，则添加重定向子节点
-            if entry.redirect:
-                ET.SubElement(target, "redirect").text = entry.redirect
-
-        # 将XML树转换为字符串
-        output = ET.tostring(tree, encoding=DEFAULT_ENCODING, method="xml")
-        # 美化XML输出格式
-        return minidom.parseString(output).toprettyxml()
+        output = f"\t<target url={quoteattr(entry.url)}>\n"
+        output += f"\t\t<status>{entry.status}</status>\n"
+        output += f"\t\t<contentLength>{entry.length}</contentLength>\n"
+        output += f"\t\t<contentType>{escape(entry.type)}</contentType>\n"
+
+        # 如果存在重定向信息，则添加重定向子节点
+        if entry.redirect:
+            output += f"\t\t<redirect>{escape(entry.redirect)}</redirect>\n"
 
+        return output + "\t</target>\n"
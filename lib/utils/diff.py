@@ -1,6 +1,8 @@
 import difflib
 import re
 
+from collections import Counter
+
 from lib.core.settings import MAX_MATCH_RATIO
 
 
@@ -63,6 +65,94 @@ class DynamicContentParser:
         return [pattern for pattern in patterns if pattern.startswith("  ")]
 
 
+class FastDynamicContentParser:
+    """
+    DynamicContentParser 的快速版本，目标是判断结果与其保持一致（只在生成的通配符页面样本上验证过）。
+
+    与 DynamicContentParser 的区别：
+      - 稳定模式只取单词级 SequenceMatcher 中相同的片段，不再做 difflib.Differ 中
+        针对替换片段的逐字符相似度比较（主要的二次方开销）；
+      - 稳定模式中的任一单词不在待比较内容中时跳过单词级比较，直接进入字符级相似度检查；
+      - 计算字符级相似度前先用长度比例和字符频率两个上界提前排除，
+        只有上界超过 MAX_MATCH_RATIO 时才计算完整的相似度。
+
+    :param content1: 基准内容字符串
+    :param content2: 对比内容字符串
+    """
+
+    def __init__(self, content1, content2):
+        self._static_patterns = None
+        self._is_static = content1 == content2
+        self._base_content = content1
+        self._base_tokens = content1.split()
+
+        if not self._is_static:
+            self._static_patterns = self.get_static_patterns(
+                self._base_tokens, content2.split()
+            )
+            self._static_tokens = set(self._static_patterns)
+            self._base_chars = Counter(content1)
+
+    def compare_to(self, content):
+        """
+        将给定的内容与初始化时提供的基准内容进行对比，判断它们是否足够相似。
+
+        :param content: 待比较的内容字符串
+        :return: bool - 表示内容是否足够相似
+        """
+        if self._is_static or content == self._base_content:
+            return content == self._base_content
+
+        tokens = content.split()
+
+        if (
+            self._static_tokens.issubset(tokens)
+            and self.get_static_patterns(self._base_tokens, tokens) == self._static_patterns
+        ):
+            return True
+
+        return self.get_match_ratio(content) > MAX_MATCH_RATIO
+
+    def get_match_ratio(self, content):
+        """
+        计算与基准内容的相似度，上界不超过 MAX_MATCH_RATIO 时直接返回上界。
+
+        :param content: 待比较的内容字符串
+        :return: float - 相似度（或其上界）
+        """
+        length = len(self._base_content) + len(content)
+        # 长度比例上界，等同于 SequenceMatcher.real_quick_ratio()
+        ratio = 2 * min(len(self._base_content), len(content)) / length
+
+        if ratio <= MAX_MATCH_RATIO:
+            return ratio
+
+        # 字符频率上界，等同于 SequenceMatcher.quick_ratio()
+        ratio = 2 * sum((Counter(content) & self._base_chars).values()) / length
+
+        if ratio <= MAX_MATCH_RATIO:
+            return ratio
+
+        return difflib.SequenceMatcher(None, self._base_content, content).ratio()
+
+    @staticmethod
+    def get_static_patterns(tokens1, tokens2):
+        """
+        找出两个单词列表中按顺序相同的单词。
+
+        :param tokens1: 第一个单词列表
+        :param tokens2: 第二个单词列表
+        :return: list[str] - 相同的单词组成的列表
+        """
+        matcher = difflib.SequenceMatcher(None, tokens1, tokens2)
+
+        return [
+            token
+            for start, _, size in matcher.get_matching_blocks()
+            for token in tokens1[start:start + size]
+        ]
+
+
 def generate_matching_regex(string1, string2):
     """
     根据两个字符串生成一个能同时匹配两者的正则表达式。
@@ -202,6 +202,21 @@ class FileUtils:
         with open(file_name, "r", errors="replace") as fd:
             return fd.read().splitlines()
 
+    @staticmethod
+    def iter_lines(file_name):
+        """
+        逐行读取文件，不将整个文件载入内存，忽略编码错误。
+
+        :param file_name: 文件路径。
+        :return: 生成 (行首字节偏移, 行内容) 元组的生成器。
+        """
+        offset = 0
+
+        with open(file_name, "rb") as fd:
+            for raw in fd:
+                yield offset, raw.rstrip(b"\r\n").decode("utf-8", errors="replace")
+                offset += len(raw)
+
     @staticmethod
     def is_dir(path):
         """
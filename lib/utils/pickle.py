@@ -17,6 +17,8 @@ ALLOWED_PICKLE_CLASSES = (
     "lib.connection.requester.Requester",
     "lib.connection.response.Response",
     "lib.connection.requester.Session",
+    "lib.connection.ratelimit.RateMeter",
+    "lib.connection.ratelimit.TokenBucket",
     "lib.core.dictionary.Dictionary",
     "lib.core.report_manager.Report",
     "lib.core.report_manager.ReportManager",
@@ -27,6 +29,7 @@ ALLOWED_PICKLE_CLASSES = (
     "lib.reports.csv_report.CSVReport",
     "lib.reports.html_report.HTMLReport",
     "lib.reports.json_report.JSONReport",
+    "lib.reports.jsonl_report.JSONLinesReport",
     "lib.reports.markdown_report.MarkdownReport",
     "lib.reports.plain_text_report.PlainTextReport",
     "lib.reports.simple_report.SimpleReport",
@@ -1,7 +1,64 @@
-import ssl
+import json
+import os
 import socket
+import ssl
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from lib.core.logger import logger
+from lib.core.settings import SCHEME_CACHE_TTL, SCHEME_PROBE_TIMEOUT, SOCKET_TIMEOUT, UNKNOWN
+from lib.utils.file import FileUtils
+
+
+def get_client_hello(host):
+    """
+    生成发往指定主机的 TLS ClientHello 报文
+
+    :param host: 主机名或IP地址，用于 SNI
+    :return: ClientHello 的字节内容
+    """
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    outgoing = ssl.MemoryBIO()
+    tls = context.wrap_bio(ssl.MemoryBIO(), outgoing, server_hostname=host)
+
+    try:
+        tls.do_handshake()
+    except ssl.SSLWantReadError:
+        # 没有服务器的响应，握手停在发送 ClientHello 之后
+        pass
+
+    return outgoing.read()
+
 
-from lib.core.settings import SOCKET_TIMEOUT
+def probe_scheme(host, port, timeout=SCHEME_PROBE_TIMEOUT):
+    """
+    连接指定主机和端口，发送 TLS ClientHello 并根据响应的第一个字节判断协议，
+    不需要完成 TLS 握手：TLS 服务器的响应以握手（0x16）或告警（0x15）记录开头，
+    HTTP 服务器会返回 400 等明文响应。超时没有响应时可能是在等待请求行结束的 HTTP 服务器，
+    也可能是响应较慢的 TLS 服务器，无法判断。
+
+    :param host: 主机名或IP地址
+    :param port: 端口号
+    :param timeout: 连接和读取响应的超时时间（秒）
+    :return: "https"、"http"，超时没有响应时返回 UNKNOWN，无法连接时返回 None
+    """
+    try:
+        with socket.create_connection((host, port), timeout) as sock:
+            sock.sendall(get_client_hello(host))
+
+            try:
+                data = sock.recv(1)
+            except socket.timeout:
+                return UNKNOWN
+
+    except OSError as e:
+        logger.info(f"{host}:{port} is unreachable: {e}")
+        return None
+
+    return "https" if data and data[0] in (0x15, 0x16) else "http"
 
 
 def detect_scheme(host, port):
@@ -16,17 +73,93 @@ def detect_scheme(host, port):
     if not port:
         raise ValueError
 
-    # 创建socket连接并设置超时时间
-    s = socket.socket()
-    s.settimeout(SOCKET_TIMEOUT)
-    conn = ssl.SSLContext().wrap_socket(s)
+    return "https" if probe_scheme(host, port, SOCKET_TIMEOUT) == "https" else "http"
+
+
+def get_cache_key(host, port):
+    """
+    获取协议缓存的键
+
+    :param host: 主机名或IP地址
+    :param port: 端口号
+    :return: host:port 格式的字符串，IPv6 地址加上方括号
+    """
+    return f"[{host}]:{port}" if ":" in host else f"{host}:{port}"
+
 
+def load_scheme_cache(path):
+    """
+    读取协议缓存文件，忽略已过期的条目
+
+    :param path: 缓存文件路径
+    :return: host:port 到 (协议, 检测时间) 的字典，文件不存在或无效时为空
+    """
     try:
-        # 尝试建立SSL连接来检测是否支持HTTPS
-        conn.connect((host, port))
-        conn.close()
-        return "https"
-    except Exception:
-        # SSL连接失败，返回HTTP协议
-        return "http"
+        with open(path) as fd:
+            cache = json.load(fd)
+    except (OSError, ValueError):
+        return {}
+
+    now = time.time()
+    return {
+        key: (scheme, detected)
+        for key, (scheme, detected) in cache.items()
+        if now - detected < SCHEME_CACHE_TTL
+    }
+
+
+def save_scheme_cache(path, cache):
+    """
+    保存协议缓存文件，先写入临时文件再替换
+
+    :param path: 缓存文件路径
+    :param cache: host:port 到 (协议, 检测时间) 的字典
+    """
+    FileUtils.create_dir(FileUtils.parent(path))
+    temp_path = f"{path}.tmp"
+
+    with open(temp_path, "w") as fd:
+        json.dump(cache, fd)
+
+    os.replace(temp_path, path)
+
+
+def detect_schemes(addresses, workers, cache_file=None):
+    """
+    并行检测多个地址的协议，检测成功的结果保存到缓存文件中，
+    之后的扫描不再重新检测；无法连接或无法判断协议的地址不缓存。
+
+    :param addresses: (主机, 端口) 的列表
+    :param workers: 同时检测的数量
+    :param cache_file: 协议缓存文件路径，为 None 时不使用缓存
+    :return: (主机, 端口) 到 "https"、"http"、UNKNOWN（无法判断）或 None（无法连接）的字典
+    """
+    cache = load_scheme_cache(cache_file) if cache_file else {}
+    results = {}
+    pending = []
+
+    for host, port in dict.fromkeys(addresses):
+        entry = cache.get(get_cache_key(host, port))
+
+        if entry:
+            results[host, port] = entry[0]
+        else:
+            pending.append((host, port))
+
+    if not pending:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max(min(workers, len(pending)), 1)) as executor:
+        for address, scheme in zip(pending, executor.map(lambda args: probe_scheme(*args), pending)):
+            results[address] = scheme
+
+            if scheme in ("http", "https"):
+                cache[get_cache_key(*address)] = (scheme, time.time())
+
+    if cache_file:
+        try:
+            save_scheme_cache(cache_file, cache)
+        except OSError as e:
+            logger.error(f"Failed to save the scheme cache to {cache_file}: {e}")
 
+    return results
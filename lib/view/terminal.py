@@ -1,10 +1,13 @@
+import atexit
+import collections
+import queue
 import sys
 import time
 import shutil
+import threading
 
 from lib.core.data import options
-from lib.core.decorators import locked
-from lib.core.settings import IS_WINDOWS
+from lib.core.settings import IS_WINDOWS, OUTPUT_BUFFER_SIZE, PROGRESS_REFRESH_INTERVAL
 from lib.utils.common import human_size
 from lib.view.colors import set_color, clean_color, disable_color
 
@@ -20,19 +23,66 @@ class Output:
     """
     输出管理类，用于处理控制台输出、状态报告、进度条显示等功能。
 
+    扫描线程不直接写终端：new_line 把输出放入队列，last_path 只记录最新的进度，
+    由单独的渲染线程写出队列中的输出，并按 PROGRESS_REFRESH_INTERVAL 的间隔重绘进度条。
+    in_line 用于交互提示，会等待队列写完后直接输出。
+
     属性:
         last_in_line (bool): 标记上一次是否使用了行内输出。
-        buffer (str): 存储所有输出内容的缓冲区。
+        lines (collections.deque): 最近保存的输出行，最多 OUTPUT_BUFFER_SIZE 行。
+        line_count (int): 保存过的输出行总数。
     """
 
     def __init__(self):
         """初始化输出对象，并根据配置决定是否启用颜色。"""
         self.last_in_line = False
-        self.buffer = ""
+        self.lines = collections.deque(maxlen=OUTPUT_BUFFER_SIZE)
+        self.line_count = 0
+        self._events = queue.Queue()
+        self._renderer = None
+        # 最新的进度和已经绘制的进度，进度没有变化时不重绘
+        self._progress = None
+        self._drawn_progress = None
+        # 渲染线程与 in_line 都会改写当前行，需要共用同一把锁
+        self._lock = threading.Lock()
 
         if not options["color"]:
             disable_color()
 
+    @property
+    def buffer(self):
+        """
+        内存中保留的输出文本。
+
+        返回:
+            str: 最近保存的输出，每行以换行符结尾
+        """
+        return "".join(line + "\n" for line in list(self.lines))
+
+    @buffer.setter
+    def buffer(self, text):
+        """恢复会话时用之前的输出替换缓冲区。"""
+        with self._lock:
+            self.lines.clear()
+            self.lines.extend(text.splitlines())
+            self.line_count = len(self.lines)
+
+    def read_buffer(self, start):
+        """
+        读取第 start 行之后保存的输出。
+
+        参数:
+            start (int): 已经读取过的行数
+
+        返回:
+            tuple: (输出文本, 保存过的输出行总数)，已经移出缓冲区的行被跳过
+        """
+        with self._lock:
+            count = self.line_count
+            lines = list(self.lines)[max(start - count, -len(self.lines)):] if count > start else []
+
+        return "".join(line + "\n" for line in lines), count
+
     @staticmethod
     def erase():
         """
@@ -55,28 +105,95 @@ class Output:
             sys.stdout.write("\033[1K")
             sys.stdout.write("\033[0G")
 
-    @locked
     def in_line(self, string):
         """
-        行内输出字符串（覆盖当前行）。
+        行内输出字符串（覆盖当前行），等待队列中的输出写完后立即输出。
 
         参数:
             string (str): 需要输出到终端的文本。
         """
-        self.erase()
-        sys.stdout.write(string)
-        sys.stdout.flush()
-        self.last_in_line = True
+        self.flush()
+
+        with self._lock:
+            # 交互提示不能被之后重绘的进度条覆盖
+            self._drawn_progress = self._progress
+            self._write_in_line(string)
 
-    @locked
     def new_line(self, string="", do_save=True):
         """
-        换行输出字符串并保存至缓冲区。
+        换行输出字符串并保存至缓冲区，由渲染线程写到终端。
 
         参数:
             string (str): 需要输出的文本，默认为空字符串。
             do_save (bool): 是否将输出内容保存进缓冲区，默认为 True。
         """
+        if do_save:
+            with self._lock:
+                self.lines.append(string)
+                self.line_count += 1
+
+        self._events.put(string)
+        self._start_renderer()
+
+    def flush(self):
+        """
+        等待渲染线程写完队列中的所有输出。
+        """
+        if self._renderer:
+            self._events.join()
+
+    def _start_renderer(self):
+        if self._renderer:
+            return
+
+        with self._lock:
+            if not self._renderer:
+                self._renderer = threading.Thread(target=self._render_loop, daemon=True)
+                self._renderer.start()
+                # 程序退出前写完剩余的输出
+                atexit.register(self.flush)
+
+    def _render_loop(self):
+        """
+        渲染线程：写出队列中的输出，并定期重绘进度条。
+        """
+        next_frame = 0
+
+        while True:
+            try:
+                lines = [self._events.get(timeout=PROGRESS_REFRESH_INTERVAL)]
+            except queue.Empty:
+                lines = []
+
+            while True:
+                try:
+                    lines.append(self._events.get_nowait())
+                except queue.Empty:
+                    break
+
+            with self._lock:
+                for line in lines:
+                    self._write_line(line)
+
+                if time.monotonic() >= next_frame and self._progress is not self._drawn_progress:
+                    self._drawn_progress = self._progress
+                    progress_bar = self.format_progress(*self._progress)
+
+                    if progress_bar:
+                        self._write_in_line(progress_bar)
+
+                    next_frame = time.monotonic() + PROGRESS_REFRESH_INTERVAL
+
+            for _ in lines:
+                self._events.task_done()
+
+    def _write_in_line(self, string):
+        self.erase()
+        sys.stdout.write(string)
+        sys.stdout.flush()
+        self.last_in_line = True
+
+    def _write_line(self, string):
         if self.last_in_line:
             self.erase()
 
@@ -91,11 +208,6 @@ class Output:
 
         sys.stdout.flush()
         self.last_in_line = False
-        sys.stdout.flush()
-
-        if do_save:
-            self.buffer += string
-            self.buffer += "\n"
 
     def status_report(self, response, full_url):
         """
@@ -136,7 +248,7 @@ class Output:
 
     def last_path(self, index, length, current_job, all_jobs, rate, errors):
         """
-        显示扫描任务的进度条和相关信息。
+        记录扫描任务的进度，由渲染线程按固定间隔绘制进度条。
 
         参数:
             index (int): 当前已完成的任务数。
@@ -146,6 +258,17 @@ class Output:
             rate (float): 当前扫描速率（每秒请求数）。
             errors (int): 错误计数。
         """
+        self._progress = (index, length, current_job, all_jobs, rate, errors)
+        self._start_renderer()
+
+    @staticmethod
+    def format_progress(index, length, current_job, all_jobs, rate, errors):
+        """
+        生成进度条文本，参数与 last_path 相同。
+
+        返回:
+            str: 进度条，超过终端宽度时返回 None
+        """
         percentage = int(index / length * 100)
         task = set_color("#", fore="cyan", style="bright") * int(percentage / 5)
         task += " " * (20 - int(percentage / 5))
@@ -164,9 +287,9 @@ class Output:
 
         # 如果进度条长度超过终端宽度则跳过显示
         if len(clean_color(progress_bar)) >= shutil.get_terminal_size()[0]:
-            return
+            return None
 
-        self.in_line(progress_bar)
+        return progress_bar
 
     def new_directories(self, directories):
         """
@@ -263,6 +386,16 @@ class Output:
 
         self.print_header(config)
 
+    def statistics(self, stats):
+        """
+        显示扫描结束后的统计信息。
+
+        参数:
+            stats (dict): 统计项名称到统计值的映射。
+        """
+        self.new_line()
+        self.print_header(stats)
+
     def target(self, target):
         """
         显示目标地址信息。
@@ -291,6 +424,15 @@ class Output:
         """
         self.new_line(f"\nLog File: {file}")
 
+    def session_file(self, file):
+        """
+        显示定期保存的会话文件路径。
+
+        参数:
+            file (str): 会话文件路径。
+        """
+        self.new_line(f"\nSession File: {file}")
+
 
 class QuietOutput(Output):
     """
@@ -329,6 +471,10 @@ class QuietOutput(Output):
         """忽略配置信息。"""
         pass
 
+    def statistics(*args):
+        """忽略统计信息。"""
+        pass
+
     def target(*args):
         """忽略目标信息。"""
         pass
@@ -341,6 +487,10 @@ class QuietOutput(Output):
         """忽略日志文件信息。"""
         pass
 
+    def session_file(*args):
+        """忽略会话文件信息。"""
+        pass
+
 
 # 初始化全局输出实例
 output = QuietOutput() if options["quiet"] else Output()
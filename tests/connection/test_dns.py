@@ -16,18 +16,116 @@
 #
 #  Author: Mauro Soria
 
+import socket
+import threading
+import time
+
 from unittest import TestCase
+from unittest.mock import patch
 from socket import getaddrinfo
 
-from lib.connection.dns import cache_dns, cached_getaddrinfo
+from lib.connection.dns import DNSCache, cache_dns, cached_getaddrinfo
+from lib.core.data import options
 from lib.core.settings import DUMMY_DOMAIN
 
+ADDRESSES = ("10.0.0.1", "10.0.0.2", "10.0.0.3")
+
+
+class FakeResolver:
+    def __init__(self, error=None, delay=0):
+        self.calls = 0
+        self.error = error
+        self.delay = delay
+
+    def __call__(self, host, port, family=0, type=0, proto=0, flags=0):
+        self.calls += 1
+        time.sleep(self.delay)
+
+        if self.error:
+            raise self.error
+
+        return [
+            (socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", (address, port))
+            for address in ADDRESSES
+        ]
+
 
 class TestDNS(TestCase):
     def test_cache_dns(self):
         cache_dns(DUMMY_DOMAIN, 80, "127.0.0.1")
         self.assertEqual(
             cached_getaddrinfo(DUMMY_DOMAIN, 80),
-            getaddrinfo("127.0.0.1", 80),
+            getaddrinfo("127.0.0.1", 80, 0, socket.SOCK_STREAM),
             "Adding DNS cache doesn't work",
         )
+        self.assertEqual(cached_getaddrinfo(DUMMY_DOMAIN, "80", socket.AF_INET6), [])
+
+    def test_override_socket_type(self):
+        cache = DNSCache()
+        cache.override(DUMMY_DOMAIN, 80, "127.0.0.1")
+
+        with patch("lib.connection.dns.getaddrinfo", FakeResolver()):
+            result = cache.getaddrinfo(DUMMY_DOMAIN, 80, 0, socket.SOCK_STREAM)
+            self.assertEqual([info[4] for info in result], [("127.0.0.1", 80)])
+            # UDP 查询不使用固定的地址
+            result = cache.getaddrinfo(DUMMY_DOMAIN, 80, 0, socket.SOCK_DGRAM)
+            self.assertEqual([info[4][0] for info in result], list(ADDRESSES))
+
+    def test_ttl(self):
+        cache = DNSCache()
+        resolver = FakeResolver()
+
+        with patch("lib.connection.dns.getaddrinfo", resolver), \
+                patch.dict(options, {"dns_ttl": 300}):
+            result = cache.getaddrinfo(DUMMY_DOMAIN, 8080, 0, socket.SOCK_STREAM)
+            self.assertEqual(
+                [info[4] for info in result], [(address, 8080) for address in ADDRESSES]
+            )
+            cache.getaddrinfo(DUMMY_DOMAIN, 443)
+            self.assertEqual(resolver.calls, 1, "Cached answer isn't reused for other ports")
+
+            cache._entries[DUMMY_DOMAIN] = (time.monotonic() - 1, result)
+            cache.getaddrinfo(DUMMY_DOMAIN, 443)
+            self.assertEqual(resolver.calls, 2, "Expired answer is reused")
+
+    def test_negative_cache(self):
+        cache = DNSCache()
+        resolver = FakeResolver(socket.gaierror(socket.EAI_NONAME, "Name or service not known"))
+
+        with patch("lib.connection.dns.getaddrinfo", resolver):
+            for _ in range(3):
+                with self.assertRaises(socket.gaierror):
+                    cache.getaddrinfo(DUMMY_DOMAIN, 80)
+
+        self.assertEqual(resolver.calls, 1, "Failed lookup isn't cached")
+
+    def test_concurrent_lookups(self):
+        cache = DNSCache()
+        resolver = FakeResolver(delay=0.1)
+
+        with patch("lib.connection.dns.getaddrinfo", resolver):
+            threads = [
+                threading.Thread(target=cache.getaddrinfo, args=(DUMMY_DOMAIN, 80))
+                for _ in range(10)
+            ]
+
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join()
+
+            cache.resolve_all(["a.example.com", "b.example.com", DUMMY_DOMAIN], 4)
+
+        self.assertEqual(resolver.calls, 3, "Concurrent lookups of the same host aren't merged")
+
+    def test_rotate(self):
+        cache = DNSCache()
+
+        with patch("lib.connection.dns.getaddrinfo", FakeResolver()), \
+                patch.dict(options, {"dns_rotate": True}):
+            first_addresses = [
+                cache.getaddrinfo(DUMMY_DOMAIN, 80)[0][4][0] for _ in ADDRESSES
+            ]
+
+        self.assertEqual(sorted(first_addresses), list(ADDRESSES), "Addresses aren't rotated")
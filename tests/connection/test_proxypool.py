@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#  Author: Mauro Soria
+
+import asyncio
+import threading
+import time
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from lib.connection.proxypool import ProxyPool
+from lib.core.settings import PROXY_QUARANTINE_TIME
+
+
+class TestProxyPool(TestCase):
+    def test_empty(self):
+        pool = ProxyPool()
+        self.assertIsNone(pool.acquire())
+        self.assertIsNone(asyncio.run(pool.acquire_async()))
+
+    def test_weighted_selection(self):
+        pool = ProxyPool(["fast", "slow"])
+
+        for proxy, elapsed in (("fast", 0.01), ("slow", 1)):
+            with patch("random.choices", lambda states, weights: [s for s in states if s.proxy == proxy]):
+                pool.release(pool.acquire(), elapsed)
+
+        chosen = [pool.acquire() for _ in range(1000)]
+        # 权重与延迟成反比，延迟相差 100 倍
+        self.assertGreater(chosen.count("fast"), 900)
+        self.assertGreater(chosen.count("slow"), 0)
+
+    def test_quarantine(self):
+        pool = ProxyPool(["bad", "good"])
+
+        with patch("random.choices", lambda states, weights: [s for s in states if s.proxy == "bad"]):
+            pool.release(pool.acquire())
+            # 第一次失败不暂停
+            self.assertEqual(pool.acquire(), "bad")
+            pool.release("bad")
+
+        self.assertEqual({pool.acquire() for _ in range(100)}, {"good"})
+
+        state = pool._states["bad"]
+        self.assertAlmostEqual(
+            state.quarantined_until - time.monotonic(), PROXY_QUARANTINE_TIME, delta=1
+        )
+
+        # 恢复后继续失败，暂停时间加倍
+        state.quarantined_until = 0
+        state.in_flight += 1
+        pool.release("bad")
+        self.assertAlmostEqual(
+            state.quarantined_until - time.monotonic(), PROXY_QUARANTINE_TIME * 2, delta=1
+        )
+
+        # 一次成功后重新计数
+        state.in_flight += 1
+        pool.release("bad", 0.1)
+        self.assertEqual((state.failures, state.quarantined_until), (0, 0))
+
+    def test_all_quarantined(self):
+        pool = ProxyPool(["a", "b"])
+
+        for proxy in ("a", "a", "b", "b", "b"):
+            pool._states[proxy].in_flight += 1
+            pool.release(proxy)
+
+        # 所有代理都在暂停时选择最早恢复的代理
+        self.assertEqual(pool.acquire(), "a")
+
+    def test_max_in_flight(self):
+        pool = ProxyPool(["a", "b"], max_in_flight=1)
+        first = pool.acquire()
+        second = pool.acquire()
+        self.assertEqual({first, second}, {"a", "b"})
+
+        acquired = []
+        thread = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+        thread.start()
+        thread.join(0.2)
+        # 所有代理都已满，等待其他请求完成
+        self.assertEqual(acquired, [])
+
+        pool.release(first, 0.1)
+        thread.join(1)
+        self.assertEqual(acquired, [first])
+
+    def test_set_proxies(self):
+        pool = ProxyPool(["a", "b"])
+        pool.release(pool.acquire(), 0.5)
+        states = dict(pool._states)
+
+        pool.set_proxies(["b", "a", "c"])
+        self.assertEqual(list(pool._states), ["b", "a", "c"])
+        self.assertIs(pool._states["a"], states["a"])
+        self.assertIs(pool._states["b"], states["b"])
+
+    def test_wait_for_healthy_proxy(self):
+        pool = ProxyPool(["good", "bad"], max_in_flight=1)
+
+        for _ in range(2):
+            pool._states["bad"].in_flight += 1
+            pool.release("bad")
+
+        self.assertEqual(pool.acquire(), "good")
+        # 正常的代理已满时不使用暂停中的代理
+        self.assertIsNone(pool._choose())
+
+    def test_exclude(self):
+        pool = ProxyPool(["a", "b"])
+        self.assertEqual({pool.acquire(exclude="a") for _ in range(50)}, {"b"})
+        # 只有一个代理时仍然使用它
+        self.assertEqual(ProxyPool(["a"]).acquire(exclude="a"), "a")
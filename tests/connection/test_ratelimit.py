@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#  Author: Mauro Soria
+
+from unittest import TestCase
+
+from lib.connection.ratelimit import RateMeter, TokenBucket
+
+
+class TestRateLimit(TestCase):
+    def test_token_bucket(self):
+        self.assertEqual(TokenBucket(0).reserve(), 0, "Unlimited bucket shouldn't wait")
+
+        bucket = TokenBucket(10, burst=2)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1, delta=0.01, msg="Burst isn't respected")
+        self.assertAlmostEqual(bucket.reserve(), 0.2, delta=0.01, msg="Reservations aren't queued")
+
+    def test_fractional_rate(self):
+        bucket = TokenBucket(0.5)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 2, delta=0.01)
+
+    def test_rate_meter(self):
+        meter = RateMeter(window=1, slots=10)
+        self.assertEqual(meter.rate, 0)
+
+        for _ in range(5):
+            meter.hit()
+
+        meter._ticks = [tick - 1 for tick in meter._ticks]
+        self.assertEqual(meter.rate, 5, "Finished slots aren't counted")
+
+        meter._ticks = [tick - 20 for tick in meter._ticks]
+        self.assertEqual(meter.rate, 0, "Expired slots are counted")
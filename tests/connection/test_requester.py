@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#  Author: Mauro Soria
+
+import asyncio
+import importlib.util
+import os
+import shutil
+import socket
+import ssl
+import subprocess
+import tempfile
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+
+from lib.connection.ratelimit import TokenBucket
+from lib.connection.requester import AsyncRequester, HTTP2Requester, Requester
+from lib.connection.response import Response
+from lib.core.data import options
+from lib.core.exceptions import RequestException
+
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    """
+    记录收到的请求目标并返回 200 的测试代理
+    """
+
+    def do_GET(self):
+        self.server.targets.append(self.path)
+        self.send_response(200)
+        self.send_header("content-length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TargetHandler(BaseHTTPRequestHandler):
+    """
+    测试目标，/found 返回 200，其他路径返回 404，响应体包含请求路径
+    """
+
+    def do_GET(self):
+        body = f"path: {self.path}".encode()
+        self.send_response(200 if self.path == "/found" else 404)
+        self.send_header("content-type", "text/plain")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestRequester(TestCase):
+    def setUp(self):
+        self._options = dict(options)
+        options.update(headers={"user-agent": "dirsearchX"}, http_method="GET", data=None)
+
+    def tearDown(self):
+        options.clear()
+        options.update(self._options)
+
+    def test_build_request(self):
+        requester = Requester()
+        requester.set_url("http://example.com/")
+        method, first, limit = requester.build_request("http://example.com/a/../b")
+
+        self.assertEqual(method, "GET")
+        self.assertIsNone(limit)
+        # URL 原样使用，不会被标准化
+        self.assertEqual(first.url, "http://example.com/a/../b")
+        self.assertEqual(first.headers["User-Agent"], "dirsearchX")
+
+        _, second, _ = requester.build_request("http://example.com/c")
+        self.assertEqual(second.url, "http://example.com/c")
+        self.assertEqual(first.url, "http://example.com/a/../b")
+        self.assertEqual(len(requester._templates), 1)
+
+        method, head, limit = requester.build_request("http://example.com/c", probe="head")
+        self.assertEqual((method, limit), ("HEAD", 0))
+        self.assertEqual(len(requester._templates), 2)
+
+    def test_template_invalidation(self):
+        requester = Requester()
+        requester.set_url("http://example.com/")
+        requester.build_request("http://example.com/a")
+
+        requester.set_header("x-test", "1")
+        self.assertEqual(requester._templates, {})
+        _, prepped, _ = requester.build_request("http://example.com/a")
+        self.assertEqual(prepped.headers["X-Test"], "1")
+
+        requester.set_auth("basic", "user:pass")
+        _, prepped, _ = requester.build_request("http://example.com/a")
+        self.assertTrue(prepped.headers["Authorization"].startswith("Basic "))
+
+    def test_cookies(self):
+        requester = Requester()
+        requester.set_url("http://example.com/")
+        requester.build_request("http://example.com/a")
+
+        # 响应设置的 Cookie 在模板构建之后同样会被发送
+        requester.session.cookies.set("session", "1", domain="example.com")
+        _, prepped, _ = requester.build_request("http://example.com/a")
+        self.assertEqual(prepped.headers["Cookie"], "session=1")
+
+    def test_cookie_path(self):
+        requester = Requester()
+        requester.set_url("http://example.com/")
+        requester.build_request("http://example.com/admin/login")
+        requester.session.cookies.set("admin", "1", domain="example.com", path="/admin")
+
+        _, prepped, _ = requester.build_request("http://example.com/admin/login")
+        self.assertEqual(prepped.headers["Cookie"], "admin=1")
+        _, prepped, _ = requester.build_request("http://example.com/public/index")
+        self.assertNotIn("Cookie", prepped.headers)
+
+    def test_digest_auth(self):
+        requester = Requester()
+        requester.set_auth("digest", "user:pass")
+        requester.set_url("http://example.com/")
+        _, prepped, _ = requester.build_request("http://example.com/a")
+
+        self.assertEqual(prepped.url, "http://example.com/a")
+        self.assertEqual(requester._templates, {})
+
+    def test_environment_proxy(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), ProxyHandler)
+        server.targets = []
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        proxy = "http://127.0.0.1:{}".format(server.server_address[1])
+        options.update(proxies=[], max_retries=0)
+
+        # 代理池为空时使用环境变量中的代理
+        with patch.dict(os.environ, {"HTTP_PROXY": proxy, "http_proxy": proxy, "NO_PROXY": "", "no_proxy": ""}):
+            requester = Requester()
+            requester.set_url("http://example.invalid/")
+            response = requester.request("admin")
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(server.targets, ["http://example.invalid/admin"])
+
+    def test_pool_size(self):
+        options.update(thread_count=30, host_connections=0)
+        self.assertEqual(Requester().pool_size, 30)
+        self.assertEqual(Requester(10).pool_size, 10)
+
+        options["host_connections"] = 5
+        self.assertEqual(Requester(10).pool_size, 5)
+
+    def test_shared_rate_limiter(self):
+        options.update(max_rate=5, rate_burst=None)
+        rate_limiter = TokenBucket(5)
+
+        self.assertIs(Requester(rate_limiter=rate_limiter)._rate_limiter, rate_limiter)
+        self.assertIsNot(Requester()._rate_limiter, rate_limiter)
+
+
+class TestAsyncRequester(TestCase):
+    def setUp(self):
+        self._options = dict(options)
+        options.update(
+            headers={"user-agent": "dirsearchX"}, http_method="GET", data=None, proxies=[],
+            max_retries=0, thread_count=10,
+        )
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), TargetHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = "http://127.0.0.1:{}/".format(self.server.server_address[1])
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        options.clear()
+        options.update(self._options)
+
+    def test_request(self):
+        async def run():
+            requester = AsyncRequester()
+            requester.set_url(self.url)
+
+            try:
+                return await asyncio.gather(
+                    requester.request("found"), *(requester.request(f"missing{i}") for i in range(20))
+                )
+            finally:
+                await requester.close()
+
+        found, *missing = asyncio.run(run())
+
+        self.assertEqual(found.status, 200)
+        self.assertEqual(found.content, "path: /found")
+        self.assertEqual({response.status for response in missing}, {404})
+
+    def test_unreachable(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+        async def run():
+            requester = AsyncRequester()
+            requester.set_url(self.url)
+
+            try:
+                await requester.request("found")
+            finally:
+                await requester.close()
+
+        with self.assertRaises(RequestException):
+            asyncio.run(run())
+
+
+def serve_h2(sock, context, connections):
+    """
+    处理 HTTP/2 连接的测试服务器，/found 返回 200，其他路径返回 404，
+    每个连接一个线程，连接数量记录在 connections[0] 中
+    """
+    import h2.config
+    import h2.connection
+    import h2.events
+
+    def handle(conn):
+        with conn:
+            h2conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+            h2conn.initiate_connection()
+            conn.sendall(h2conn.data_to_send())
+            paths = {}
+
+            while data := conn.recv(65535):
+                for event in h2conn.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        paths[event.stream_id] = dict(event.headers)[b":path"].decode()
+                    elif isinstance(event, h2.events.StreamEnded):
+                        path = paths.pop(event.stream_id)
+                        body = f"path: {path}".encode()
+                        h2conn.send_headers(event.stream_id, [
+                            (":status", "200" if path == "/found" else "404"),
+                            ("content-type", "text/plain"),
+                            ("content-length", str(len(body))),
+                        ])
+                        h2conn.send_data(event.stream_id, body, end_stream=True)
+
+                conn.sendall(h2conn.data_to_send())
+
+    while True:
+        try:
+            conn, _ = sock.accept()
+            conn = context.wrap_socket(conn, server_side=True)
+        except OSError:
+            return
+
+        connections[0] += 1
+        threading.Thread(target=handle, args=(conn,), daemon=True).start()
+
+
+@skipUnless(importlib.util.find_spec("h2") and shutil.which("openssl"), "h2 or openssl is not installed")
+class TestHTTP2Requester(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cert_file = os.path.join(cls.directory.name, "cert.pem")
+        key_file = os.path.join(cls.directory.name, "key.pem")
+        subprocess.run(
+            [
+                "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                "-subj", "/CN=localhost", "-keyout", key_file, "-out", cert_file,
+            ],
+            check=True,
+            capture_output=True,
+        )
+
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert_file, key_file)
+        context.set_alpn_protocols(["h2"])
+
+        cls.server = socket.socket()
+        cls.server.bind(("127.0.0.1", 0))
+        cls.server.listen(16)
+        cls.connections = [0]
+        cls.url = f"https://127.0.0.1:{cls.server.getsockname()[1]}/"
+        threading.Thread(target=serve_h2, args=(cls.server, context, cls.connections), daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.close()
+        cls.directory.cleanup()
+
+    def setUp(self):
+        self._options = dict(options)
+        options.update(
+            headers={"user-agent": "dirsearchX"}, http_method="GET", data=None, http2=True,
+            thread_count=10, exclude_status_codes=set(), include_status_codes=set(),
+        )
+
+    def tearDown(self):
+        options.clear()
+        options.update(self._options)
+
+    def test_random_agents(self):
+        requester = HTTP2Requester()
+        requester.set_url(self.url)
+        self.addCleanup(requester.close)
+        requester.agents = ["agent-1", "agent-2"]
+
+        _, request, _ = requester.build_request(requester._get_session(), self.url + "a")
+        self.assertIn(request.headers["user-agent"], requester.agents)
+        # 共用的请求头不会被修改
+        self.assertEqual(requester.headers["user-agent"], "dirsearchX")
+
+    def test_request(self):
+        requester = HTTP2Requester()
+        requester.set_url(self.url)
+        self.addCleanup(requester.close)
+
+        response = requester.request("found")
+        self.assertIsInstance(response, Response)
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.url, f"{self.url}found")
+        self.assertEqual(response.path, "found")
+        self.assertEqual(response.body, b"path: /found")
+        self.assertEqual(response.content, "path: /found")
+        self.assertEqual(response.type, "text/plain")
+        self.assertEqual(response.length, 12)
+
+        # 路径不会被标准化
+        self.assertEqual(requester.request("a/../b").body, b"path: /a/../b")
+
+    def test_multiplexing(self):
+        requester = HTTP2Requester()
+        requester.set_url(self.url)
+        self.addCleanup(requester.close)
+        connections = self.connections[0]
+
+        with ThreadPoolExecutor(10) as executor:
+            statuses = list(executor.map(
+                lambda path: requester.request(path).status, [f"path{i}" for i in range(50)]
+            ))
+
+        self.assertEqual(statuses, [404] * 50)
+        # 所有线程的请求复用同一个连接
+        self.assertEqual(self.connections[0] - connections, 1)
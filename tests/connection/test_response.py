@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#  Author: Mauro Soria
+
+import pickle
+from types import SimpleNamespace
+from unittest import TestCase
+
+from requests.structures import CaseInsensitiveDict
+
+from lib.connection.response import Response
+from lib.core.data import options
+
+
+class FakeResponse(SimpleNamespace):
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.data), chunk_size):
+            yield self.data[i:i + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+class TestResponse(TestCase):
+    def setUp(self):
+        self._options = dict(options)
+
+    def tearDown(self):
+        options.clear()
+        options.update(self._options)
+
+    def fake_response(self, data, status=200, headers={}):
+        return FakeResponse(
+            url="http://example.com/admin",
+            status_code=status,
+            headers=CaseInsensitiveDict(headers),
+            history=[],
+            encoding="utf-8",
+            data=data,
+            closed=False,
+        )
+
+    def test_body(self):
+        raw = self.fake_response("héllo".encode() * 1000)
+        response = Response(raw)
+
+        self.assertEqual(response.body, "héllo".encode() * 1000)
+        self.assertEqual(response.content, "héllo" * 1000)
+        self.assertTrue(raw.closed)
+        self.assertEqual(pickle.loads(pickle.dumps(response)), response)
+
+    def test_excluded_body_size(self):
+        options.update(exclude_status_codes={404}, include_status_codes=set(), excluded_body_size=1)
+
+        self.assertEqual(len(Response(self.fake_response(b"a" * 5000, status=404)).body), 1024)
+        self.assertEqual(len(Response(self.fake_response(b"a" * 5000)).body), 5000)
+
+        options["excluded_body_size"] = 0
+        self.assertEqual(Response(self.fake_response(b"a" * 5000, status=404)).body, b"")
+
+    def test_binary(self):
+        response = Response(self.fake_response(b"\x00\x01" * 10, headers={"content-length": "20"}))
+
+        self.assertEqual(response.content, "")
+        self.assertEqual(response.length, 20)
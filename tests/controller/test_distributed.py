@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#  Author: Mauro Soria
+import os
+import tempfile
+import threading
+
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest import TestCase
+
+import requests
+
+from lib.connection.response import Response
+from lib.controller.distributed import Coordinator, parse_address, run_worker
+from lib.core.data import options
+from lib.core.exceptions import SkipTargetInterrupt
+from lib.core.settings import (
+    DISTRIBUTED_LOCAL_OPTIONS,
+    DISTRIBUTED_MAX_ATTEMPTS,
+    DISTRIBUTED_TOKEN_HEADER,
+)
+from lib.core.structures import CaseInsensitiveDict
+
+
+class FakeController:
+    url = "http://example.com/"
+
+    def __init__(self):
+        self.matches = []
+        self.progress = []
+        self.fuzzer = SimpleNamespace(
+            match_callbacks=(self.matches.append,),
+            error_callbacks=(),
+            response_filter=SimpleNamespace(hits=Counter()),
+            verdict_cache=SimpleNamespace(hits=0, misses=0),
+        )
+
+    def is_timed_out(self):
+        return False
+
+    def reset_consecutive_errors(self, response):
+        pass
+
+    def show_progress(self, index):
+        self.progress.append(index)
+
+
+def make_response(path):
+    return Response(SimpleNamespace(
+        url=f"http://example.com/{path}",
+        status_code=200,
+        headers=CaseInsensitiveDict({"content-type": "text/html"}),
+        history=[],
+        encoding="utf-8",
+        iter_content=lambda chunk_size: iter([b"<html>admin</html>"]),
+        close=lambda: None,
+    ), limit=1024)
+
+
+class TargetHandler(BaseHTTPRequestHandler):
+    """
+    测试目标，/admin 返回 200，其他路径返回 404
+    """
+
+    def do_GET(self):
+        body = b"<html>admin</html>" if self.path == "/admin" else b"not found"
+        self.send_response(200 if self.path == "/admin" else 404)
+        self.send_header("content-type", "text/html")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestCoordinator(TestCase):
+    def setUp(self):
+        self.controller = FakeController()
+        self.coordinator = Coordinator(self.controller, "127.0.0.1:0")
+        self.coordinator.count = 2
+        self.url = "http://{}:{}".format(*self.coordinator.address)
+
+    def tearDown(self):
+        self.coordinator.server.shutdown()
+        self.coordinator.server.server_close()
+
+    def post(self, path, data):
+        return requests.post(
+            self.url + path,
+            json=data,
+            headers={DISTRIBUTED_TOKEN_HEADER: self.coordinator.token},
+            timeout=5,
+        ).json()
+
+    def start(self):
+        thread = threading.Thread(target=self.coordinator.run, args=("admin/",), daemon=True)
+        thread.start()
+        return thread
+
+    def lease(self):
+        while True:
+            reply = self.post("/lease", {"worker": "test"})
+            if "lease" in reply:
+                return reply
+
+    def finish(self, lease):
+        return self.post("/report", {"lease": lease, "messages": [["done", {}, 0, 0]]})
+
+    def test_parse_address(self):
+        self.assertEqual(parse_address("0.0.0.0:8585"), ("0.0.0.0", 8585))
+        self.assertEqual(parse_address(":8585"), ("127.0.0.1", 8585))
+        self.assertRaises(ValueError, parse_address, "localhost")
+
+    def test_token(self):
+        thread = self.start()
+
+        for token in (None, "wrong"):
+            headers = {DISTRIBUTED_TOKEN_HEADER: token} if token else {}
+            response = requests.post(self.url + "/lease", json={}, headers=headers, timeout=5)
+            self.assertEqual(response.status_code, 401)
+
+        leases = [self.lease(), self.lease()]
+        self.assertFalse(set(leases[0]["options"]) & set(DISTRIBUTED_LOCAL_OPTIONS))
+
+        for reply in leases:
+            self.finish(reply["lease"])
+
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+    def test_lease(self):
+        thread = self.start()
+        leases = [self.lease(), self.lease()]
+
+        self.assertEqual(
+            sorted(reply["unit"]["shard"] for reply in leases), [[0, 2], [1, 2]]
+        )
+        self.assertEqual(leases[0]["unit"]["base_path"], "admin/")
+        self.assertIn("extensions", leases[0]["options"])
+        self.assertIn("wait", self.post("/lease", {}))
+
+        match = ["match", make_response("admin/index.php").to_dict()]
+
+        for reply in leases:
+            self.assertFalse(self.post("/report", {
+                "lease": reply["lease"],
+                "messages": [match, ["progress", 5], ["done", {"size": 1}, 2, 3]],
+            })["cancel"])
+
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        # 两个分片发现的相同路径只报告一次
+        self.assertEqual([r.url for r in self.controller.matches], ["http://example.com/admin/index.php"])
+        self.assertEqual(self.controller.progress[-1], 10)
+        self.assertEqual(self.controller.fuzzer.response_filter.hits["size"], 2)
+        self.assertEqual(self.controller.fuzzer.verdict_cache.misses, 6)
+        self.assertTrue(self.post("/report", {"lease": leases[0]["lease"]})["cancel"])
+
+        self.coordinator._is_finished = True
+        self.assertTrue(self.post("/lease", {})["done"])
+
+    def test_expired_lease(self):
+        thread = self.start()
+        reply = self.lease()
+        self.post("/report", {"lease": reply["lease"], "messages": [["progress", 4]]})
+
+        while self.coordinator.index != 4:
+            thread.join(0.05)
+
+        # 让租约立即过期，工作单元应回到队列开头并扣除已汇报的进度
+        with self.coordinator._lock:
+            unit, _ = self.coordinator._leases[reply["lease"]]
+            self.coordinator._leases[reply["lease"]] = (unit, 0)
+
+        while reply["lease"] in self.coordinator._leases:
+            thread.join(0.05)
+
+        self.assertEqual(self.coordinator.index, 0)
+        self.assertTrue(self.post("/report", {"lease": reply["lease"]})["cancel"])
+
+        retry = self.lease()
+        self.assertEqual(retry["unit"], reply["unit"])
+
+        self.finish(retry["lease"])
+        self.finish(self.lease()["lease"])
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+    def test_failed_unit(self):
+        self.coordinator.count = 1
+        errors = []
+
+        def run():
+            try:
+                self.coordinator.run("admin/")
+            except SkipTargetInterrupt as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+
+        # 扫描失败的工作单元重新分配，多次失败后跳过目标而不是退出整个扫描
+        for _ in range(DISTRIBUTED_MAX_ATTEMPTS):
+            reply = self.lease()
+            self.assertEqual(reply["unit"]["shard"], [0, 1])
+            self.post("/report", {"lease": reply["lease"], "messages": [["failed", "OSError: test"]]})
+
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(len(errors), 1)
+
+    def test_worker(self):
+        target = ThreadingHTTPServer(("127.0.0.1", 0), TargetHandler)
+        self.addCleanup(target.server_close)
+        threading.Thread(target=target.serve_forever, daemon=True).start()
+        self.addCleanup(target.shutdown)
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        wordlist = os.path.join(directory.name, "wordlist.txt")
+
+        with open(wordlist, "w") as fd:
+            fd.write("admin\nbackup\nlogin\n")
+
+        saved = dict(options)
+        self.addCleanup(options.update, saved)
+        options.update(
+            wordlists=[wordlist], exclude_texts=[], http_method="GET", thread_count=2,
+            max_retries=0, timeout=5, cluster_token="secret",
+        )
+        # 下发给工作节点的是创建协调节点时的选项
+        self.tearDown()
+        self.setUp()
+        self.controller.url = "http://127.0.0.1:{}/".format(target.server_address[1])
+
+        thread = threading.Thread(target=self.coordinator.run, args=("",), daemon=True)
+        thread.start()
+        worker = threading.Thread(
+            target=run_worker, args=("127.0.0.1:{}".format(self.coordinator.address[1]),), daemon=True
+        )
+        worker.start()
+
+        thread.join(30)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual([r.path for r in self.controller.matches], ["admin"])
+
+        self.coordinator._is_finished = True
+        worker.join(10)
+        self.assertFalse(worker.is_alive())
+
+    def test_response_round_trip(self):
+        response = make_response("admin/")
+        restored = Response.from_dict(response.to_dict())
+
+        self.assertEqual(restored, response)
+        self.assertEqual(restored.path, response.path)
+        self.assertEqual(restored.content, "<html>admin</html>")
+        self.assertEqual(restored.headers["Content-Type"], "text/html")
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#  Author: Mauro Soria
+import threading
+
+from types import SimpleNamespace
+from unittest import TestCase
+
+from lib.controller.scheduler import TargetScheduler
+from lib.core.data import options
+from lib.core.exceptions import QuitInterrupt
+
+
+class FakeController:
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+
+    def __init__(self, scheduler, url):
+        self.scheduler = scheduler
+        self.targets = [url]
+        self.results = []
+
+    def scan_target(self, url, fuzzer_class, **kwargs):
+        with self.lock:
+            FakeController.running += 1
+            FakeController.max_running = max(FakeController.max_running, FakeController.running)
+
+        if url == "quit":
+            raise QuitInterrupt("Canceled due to an error")
+
+        threading.Event().wait(0.05)
+        self.thread_count = kwargs["thread_count"]
+        self.results.append(url)
+        self.scheduler.controller.report.add(url)
+
+        with self.lock:
+            FakeController.running -= 1
+
+
+class TestTargetScheduler(TestCase):
+    def setUp(self):
+        self._options = dict(options)
+        options.update(
+            parallel_targets=2, thread_count=25, host_connections=0, full_url=False,
+            max_rate=5, rate_burst=None,
+        )
+        FakeController.running = FakeController.max_running = 0
+
+    def tearDown(self):
+        options.clear()
+        options.update(self._options)
+
+    def controller(self, targets):
+        report = SimpleNamespace(saved=[])
+        report.add = report.saved.append
+        return SimpleNamespace(targets=targets, report=report)
+
+    def test_run(self):
+        controller = self.controller(["a", "b", "c", "d", "e"])
+        scheduler = TargetScheduler(controller, FakeController)
+        scheduler.run(None)
+
+        self.assertEqual(FakeController.max_running, 2)
+        self.assertEqual({child.thread_count for child in scheduler.controllers}, {12})
+        # 所有目标共用同一个限速器
+        self.assertEqual(scheduler.rate_limiter.rate, 5)
+        # 所有目标的结果写入同一份报告
+        self.assertEqual(sorted(controller.report.saved), ["a", "b", "c", "d", "e"])
+        self.assertTrue(options["full_url"])
+
+    def test_quit(self):
+        scheduler = TargetScheduler(self.controller(["a", "quit", "b"]), FakeController)
+
+        with self.assertRaises(QuitInterrupt):
+            scheduler.run(None)
+
+    def test_host_slots(self):
+        scheduler = TargetScheduler(self.controller(["a", "b"]), FakeController)
+        self.assertIsNone(scheduler.get_host_slots("example.com"))
+
+        options["host_connections"] = 4
+        slots = scheduler.get_host_slots("http://example.com:8080/")
+        self.assertIs(slots, scheduler.get_host_slots("example.com/admin/"))
+        self.assertIsNot(slots, scheduler.get_host_slots("https://other.com/"))
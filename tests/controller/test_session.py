@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#  Author: Mauro Soria
+import os
+import tempfile
+
+from types import SimpleNamespace
+from unittest import TestCase
+
+from lib.connection.response import Response
+from lib.controller.session import SessionJournal
+from lib.core.data import options
+from lib.core.dictionary import Dictionary
+from lib.core.exceptions import UnpicklingError
+from lib.core.structures import CaseInsensitiveDict
+from lib.view.terminal import output
+
+
+class FakeController:
+    def __init__(self, wordlist):
+        self.dictionary = Dictionary(files=[wordlist])
+        self.results = []
+        self.directories = ["", "admin/"]
+        self.passed_urls = {"http://example.com/"}
+        self.fuzzer = SimpleNamespace(get_pending_paths=lambda: ["pending"])
+        self.session = None
+
+
+def make_response(path):
+    return Response(SimpleNamespace(
+        url=f"http://example.com/{path}",
+        status_code=200,
+        headers=CaseInsensitiveDict({"content-type": "text/html"}),
+        history=[],
+        encoding="utf-8",
+        iter_content=lambda chunk_size: iter([b"found"]),
+        close=lambda: None,
+    ), limit=1024)
+
+
+class TestSessionJournal(TestCase):
+    def setUp(self):
+        self._options = dict(options)
+        self._buffer = output.buffer
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "session.pickle")
+        wordlist = os.path.join(self.directory.name, "wordlist.txt")
+
+        with open(wordlist, "w") as fd:
+            fd.write("a\nb\nc\nd\n")
+
+        options.update(checkpoint_interval=60, extensions=(), capitalization=False)
+        output.buffer = "Target: http://example.com/\n"
+        self.controller = FakeController(wordlist)
+
+    def tearDown(self):
+        options.clear()
+        options.update(self._options)
+        output.buffer = self._buffer
+        self.directory.cleanup()
+
+    def test_checkpoint(self):
+        self.controller.results.append(make_response("a"))
+        self.controller.dictionary.take(3)
+
+        journal = SessionJournal(self.path)
+        journal.open(self.controller)
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+        journal.add_result(make_response("b"))
+        self.controller.directories.pop(0)
+        output.buffer += "[00:00:00] 200 - 5B - /b\n"
+
+        size = os.path.getsize(self.path)
+        # 距离上次保存不足间隔时不写入
+        journal.checkpoint(self.controller)
+        self.assertEqual(os.path.getsize(self.path), size)
+
+        journal.checkpoint(self.controller, force=True)
+        journal.close()
+
+        state, results, last_output, opts = SessionJournal.load(self.path)
+
+        self.assertEqual([response.path for response in results], ["a", "b"])
+        self.assertEqual(state["directories"], ["admin/"])
+        self.assertEqual(state["passed_urls"], {"http://example.com/"})
+        self.assertNotIn("fuzzer", state)
+        self.assertNotIn("results", state)
+        self.assertEqual(opts["checkpoint_interval"], 60)
+        self.assertEqual(last_output, output.buffer.rstrip())
+
+        # 已领取但未扫描完的路径优先扫描
+        self.assertEqual(state["dictionary"].index, 2)
+        self.assertEqual(state["dictionary"].take(100), ["pending", "d"])
+
+    def test_truncated(self):
+        journal = SessionJournal(self.path)
+        journal.open(self.controller)
+        journal.add_result(make_response("a"))
+        journal.close()
+
+        # 模拟写入最后一条记录时崩溃
+        with open(self.path, "ab") as fd:
+            fd.write(b"\x80\x04\x95\xff")
+
+        state, results, _, _ = SessionJournal.load(self.path)
+        self.assertEqual(state["directories"], ["", "admin/"])
+        self.assertEqual(len(results), 1)
+
+        with open(self.path, "wb") as fd:
+            fd.write(b"not a session")
+
+        self.assertRaises(UnpicklingError, SessionJournal.load, self.path)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#  Author: Mauro Soria
+import os
+import socket
+import tempfile
+import threading
+
+from types import SimpleNamespace
+from unittest import TestCase
+
+from lib.controller.workers import WorkerPool, get_shard_options, scan_shard
+from lib.core.data import options
+from lib.core.exceptions import QuitInterrupt, SkipTargetInterrupt
+
+
+class TestWorkers(TestCase):
+    def test_shard_options(self):
+        opts = {"thread_count": 25, "max_rate": 100, "rate_burst": 10, "timeout": 5}
+        shard_opts = get_shard_options(opts, 4)
+
+        self.assertEqual(shard_opts["thread_count"], 6)
+        self.assertEqual(shard_opts["max_rate"], 25)
+        self.assertEqual(shard_opts["rate_burst"], 2)
+        self.assertEqual(shard_opts["timeout"], 5)
+        # 主进程的选项不变
+        self.assertEqual(opts["thread_count"], 25)
+
+    def test_shard_options_minimum(self):
+        opts = {"thread_count": 2, "max_rate": 0, "rate_burst": 0}
+        shard_opts = get_shard_options(opts, 4)
+
+        self.assertEqual(shard_opts["thread_count"], 1)
+        # 0 表示不限速
+        self.assertEqual(shard_opts["max_rate"], 0)
+        self.assertEqual(shard_opts["rate_burst"], 0)
+
+    def test_unreachable_target(self):
+        server = socket.socket()
+        server.bind(("127.0.0.1", 0))
+        port = server.getsockname()[1]
+        server.close()
+
+        with tempfile.TemporaryDirectory() as directory:
+            wordlist = os.path.join(directory, "wordlist.txt")
+
+            with open(wordlist, "w") as fd:
+                fd.write("admin\n")
+
+            saved = dict(options)
+            self.addCleanup(options.update, saved)
+            options.update(
+                wordlists=[wordlist], max_retries=0, timeout=1, thread_count=1,
+                exclude_texts=[], http_method="GET",
+            )
+            messages = []
+            scan_shard((0, 1), f"http://127.0.0.1:{port}/", "", messages.append, threading.Event())
+
+        self.assertEqual([message[0] for message in messages], ["skip"])
+
+        # 无法访问的目标只跳过当前目标，工作进程崩溃时才退出整个扫描
+        pool = WorkerPool(SimpleNamespace(fuzzer=None))
+        self.assertRaises(SkipTargetInterrupt, pool.handle, messages[0])
+        self.assertRaises(QuitInterrupt, pool.handle, ("failed", "ValueError: test"))
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#  Author: Mauro Soria
+
+from unittest import TestCase
+
+from lib.core.concurrency import AdaptiveConcurrency
+
+
+class TestAdaptiveConcurrency(TestCase):
+    def test_slow_start(self):
+        concurrency = AdaptiveConcurrency(1, 8)
+
+        for _ in range(20):
+            concurrency.record(0.1, 200)
+
+        self.assertEqual(concurrency.limit, 8, "Concurrency doesn't grow up to the maximum")
+        self.assertTrue(concurrency.is_allowed(7))
+        self.assertFalse(concurrency.is_allowed(8))
+
+    def test_throttling(self):
+        concurrency = AdaptiveConcurrency(2, 8)
+        concurrency.limit = 8
+        concurrency._since_decrease = 8
+
+        concurrency.record(0.1, 429)
+        self.assertEqual(concurrency.limit, 4, "429 doesn't halve the concurrency")
+
+        # Responses to requests sent before the decrease are ignored
+        concurrency.record(0.1, 503)
+        self.assertEqual(concurrency.limit, 4)
+
+        for _ in range(4):
+            concurrency.record_error()
+        self.assertEqual(concurrency.limit, 2)
+
+        for _ in range(2):
+            concurrency.record_error()
+        self.assertEqual(concurrency.limit, 2, "Concurrency goes below the minimum")
+
+    def test_additive_increase(self):
+        concurrency = AdaptiveConcurrency(1, 8)
+        concurrency.limit = 4
+        concurrency._slow_start = False
+
+        for _ in range(4):
+            concurrency.record(0.1, 200)
+
+        self.assertEqual(concurrency.limit, 5, "Concurrency should grow by one per round")
+
+    def test_latency(self):
+        concurrency = AdaptiveConcurrency(1, 8)
+
+        for _ in range(10):
+            concurrency.record(0.1, 200)
+
+        for _ in range(20):
+            concurrency.record(1, 200)
+
+        self.assertLess(concurrency.limit, 8, "High latency doesn't decrease the concurrency")
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#  Author: Mauro Soria
+
+import os
+import pickle
+import tempfile
+from unittest import TestCase
+
+from lib.core.data import options
+from lib.core.dictionary import Dictionary
+
+
+class TestDictionary(TestCase):
+    def setUp(self):
+        self._options = dict(options)
+        options.update(
+            extensions=("php", "html"),
+            exclude_extensions=(),
+            prefixes=(),
+            suffixes=(),
+            force_extensions=True,
+            overwrite_extensions=False,
+            remove_extensions=False,
+            lowercase=False,
+            uppercase=False,
+            capitalization=False,
+        )
+
+        fd, self.wordlist = tempfile.mkstemp()
+        with os.fdopen(fd, "w") as f:
+            f.write("a\nb/\n%EXT%x\nadmin\na\n")
+
+    def tearDown(self):
+        options.clear()
+        options.update(self._options)
+        os.remove(self.wordlist)
+
+    def test_generate(self):
+        dictionary = Dictionary(files=[self.wordlist])
+        paths = [
+            "a", "a/", "a.php", "a.html", "b/", "phpx", "htmlx",
+            "admin", "admin/", "admin.php", "admin.html",
+        ]
+
+        self.assertEqual(list(dictionary), paths)
+        self.assertEqual(len(dictionary), len(paths))
+
+        options["prefixes"] = ("~",)
+        self.assertEqual(list(Dictionary(files=[self.wordlist])), ["~" + path for path in paths])
+
+    def test_resume(self):
+        dictionary = Dictionary(files=[self.wordlist])
+        first = [next(dictionary) for _ in range(6)]
+
+        dictionary = pickle.loads(pickle.dumps(dictionary))
+        self.assertEqual(dictionary.index, 6)
+        self.assertEqual(first + list(iter(lambda: next(dictionary, None), None)), list(dictionary))
+
+        dictionary.reset()
+        self.assertEqual(next(dictionary), "a")
+
+    def test_batches(self):
+        dictionary = Dictionary(files=[self.wordlist])
+        paths = list(dictionary)
+
+        batch = dictionary.take(4)
+        self.assertEqual(batch, paths[:4])
+
+        dictionary.put_back(batch[2:])
+        self.assertEqual(dictionary.index, 2)
+
+        dictionary = pickle.loads(pickle.dumps(dictionary))
+        self.assertEqual(dictionary.take(100), paths[2:], "Returned paths are lost or out of order")
+
+        with self.assertRaises(StopIteration):
+            dictionary.take(4)
+
+    def test_shards(self):
+        paths = list(Dictionary(files=[self.wordlist]))
+        shards = [Dictionary(files=[self.wordlist], shard=(index, 3)) for index in range(3)]
+
+        self.assertEqual(sum(len(shard) for shard in shards), len(paths))
+        self.assertEqual(sorted(path for shard in shards for path in shard), sorted(paths))
+        self.assertEqual(list(shards[1]), paths[1::3])
+
+        dictionary = shards[2]
+        first = next(dictionary)
+        dictionary = pickle.loads(pickle.dumps(dictionary))
+        self.assertEqual([first] + list(iter(lambda: next(dictionary, None), None)), paths[2::3])
+
+    def test_checkpoint(self):
+        dictionary = Dictionary(files=[self.wordlist])
+        paths = list(dictionary)
+
+        batch = dictionary.take(5)
+        # 前两个路径已经扫描完，其余三个仍在工作线程手中
+        checkpoint = dictionary.checkpoint(lambda: batch[2:])
+
+        self.assertEqual(dictionary.index, 5)
+        self.assertEqual(checkpoint.index, 2)
+        self.assertEqual(dictionary.take(100), paths[5:])
+
+        checkpoint = pickle.loads(pickle.dumps(checkpoint))
+        self.assertEqual(checkpoint.take(100), paths[2:])
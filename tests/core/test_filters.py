@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#  Author: Mauro Soria
+
+from types import SimpleNamespace
+from unittest import TestCase
+
+from lib.core.data import blacklists, options
+from lib.core.filters import ResponseFilter
+
+
+class TestResponseFilter(TestCase):
+    def setUp(self):
+        self._options = dict(options)
+        options.update(
+            exclude_status_codes={404},
+            include_status_codes=set(),
+            exclude_sizes={"0B", "2KB"},
+            minimum_response_size=0,
+            maximum_response_size=0,
+            exclude_texts=["Not found"],
+            exclude_regex="^Error [0-9]+",
+            exclude_redirect="/login",
+        )
+        blacklists[403] = ["/.htaccess", "server-status"]
+
+    def tearDown(self):
+        options.clear()
+        options.update(self._options)
+        blacklists.clear()
+
+    def response(self, **kwargs):
+        attrs = {"status": 200, "length": 10, "path": "admin", "content": "", "redirect": "", **kwargs}
+        return SimpleNamespace(**attrs)
+
+    def test_filters(self):
+        response_filter = ResponseFilter()
+
+        self.assertEqual(response_filter.match(self.response(status=404)), "status")
+        self.assertEqual(response_filter.match(self.response(length=0)), "size")
+        self.assertEqual(response_filter.match(self.response(length=2100)), "size")
+        self.assertEqual(response_filter.match(self.response(status=403, path="a/.htaccess")), "blacklist")
+        self.assertEqual(response_filter.match(self.response(status=403, path="foo/server-status")), "blacklist")
+        self.assertEqual(response_filter.match(self.response(content="Page Not found")), "text")
+        self.assertEqual(response_filter.match(self.response(content="Error 500")), "regex")
+        self.assertEqual(response_filter.match(self.response(redirect="https://a.com/login?next=/")), "redirect")
+
+        self.assertIsNone(response_filter.match(self.response(status=403, path="htaccess")))
+        self.assertIsNone(response_filter.match(self.response(length=1024 * 3)))
+        self.assertIsNone(response_filter.match(self.response(content="An Error 500")))
+
+    def test_hits(self):
+        response_filter = ResponseFilter()
+
+        for status in (200, 404, 404):
+            response_filter.is_excluded(self.response(status=status))
+
+        self.assertEqual(dict(response_filter.hits), {"status": 2})
+
+    def test_headers_only(self):
+        response_filter = ResponseFilter()
+
+        self.assertEqual(response_filter.match(self.response(status=404), headers_only=True), "status")
+        self.assertEqual(
+            response_filter.match(self.response(status=403, path="a/.htaccess"), headers_only=True),
+            "blacklist",
+        )
+        self.assertEqual(response_filter.match(self.response(redirect="/login"), headers_only=True), "redirect")
+
+        # 依赖响应体的规则不适用于探测响应
+        self.assertIsNone(response_filter.match(self.response(length=0), headers_only=True))
+        self.assertIsNone(response_filter.match(self.response(content="Not found"), headers_only=True))
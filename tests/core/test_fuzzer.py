@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#  Author: Mauro Soria
+
+import asyncio
+import collections
+import os
+import tempfile
+import threading
+import weakref
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest import TestCase
+
+from lib.connection.requester import AsyncRequester
+from lib.core.data import options
+from lib.core.dictionary import Dictionary
+from lib.core.exceptions import SkipTargetInterrupt
+from lib.core.fuzzer import AsyncFuzzer, Fuzzer
+from lib.core.scanner import BaseScanner
+
+
+class InterleavedDict(dict):
+    """
+    读取 values() 之后执行一次 step，模拟保存会话的两次读取之间工作线程向前推进
+    """
+
+    def __init__(self, state, *args):
+        super().__init__(*args)
+        self.state = state
+
+    def values(self):
+        values = list(super().values())
+
+        if "step" in self.state:
+            self.state.pop("step")()
+
+        return values
+
+
+class FakeDictionary:
+    def __init__(self, paths):
+        self.paths = list(paths)
+        self.lock = threading.Lock()
+
+    def take(self, count, paths):
+        with self.lock:
+            if not self.paths:
+                raise StopIteration
+
+            paths.extend(self.paths[:2])
+            del self.paths[:2]
+
+    def put_back(self, paths):
+        with self.lock:
+            self.paths[:0] = paths
+
+
+class FakeConcurrency:
+    """
+    线程 1 第二次检查时等待线程 0 因字典耗尽退出，然后被暂停
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.taken = threading.Event()
+        self.release = threading.Event()
+
+    def is_allowed(self, index):
+        if index == 0:
+            return True
+
+        self.calls += 1
+
+        if self.calls == 1:
+            return True
+
+        self.taken.set()
+        self.release.wait(5)
+        return False
+
+    def wait_for_slot(self, index, timeout):
+        return False
+
+
+class FakeResponse:
+    """
+    正文哈希值固定的 404 响应
+    """
+
+    redirect = ""
+    status = 404
+
+    def __hash__(self):
+        return 1
+
+
+class TestFuzzer(TestCase):
+    def test_pending_paths_interleaved(self):
+        fuzzer = Fuzzer(None, None, response_filter=SimpleNamespace())
+        batch = collections.deque(["a", "b"])
+        state = {}
+
+        def step():
+            # 与 thread_proc 相同：先记录再出队
+            fuzzer._scanning[0] = batch[0]
+            batch.popleft()
+
+        state["step"] = step
+        fuzzer._batches = InterleavedDict(state, {0: batch})
+        fuzzer._scanning = InterleavedDict(state, {0: None})
+
+        self.assertEqual(sorted(fuzzer.get_pending_paths()), ["a", "b"])
+
+    def test_parked_thread_after_exhaustion(self):
+        scanned = []
+        fuzzer = Fuzzer(None, FakeDictionary(["a", "b", "c"]), response_filter=SimpleNamespace())
+        fuzzer.concurrency = FakeConcurrency()
+        fuzzer.get_scanners_for = lambda path: None
+        fuzzer.scan = lambda path, scanners: scanned.append(path)
+        fuzzer._base_path = ""
+        fuzzer._is_running = True
+        fuzzer._play_event.set()
+
+        parked = threading.Thread(target=fuzzer.thread_proc, args=(1,))
+        parked.start()
+        fuzzer.concurrency.taken.wait(5)
+
+        # 线程 0 扫描剩下的路径后字典耗尽，此时线程 1 才归还它领取的路径
+        active = threading.Thread(target=fuzzer.thread_proc, args=(0,))
+        active.start()
+        active.join(5)
+        fuzzer.concurrency.release.set()
+        parked.join(5)
+
+        self.assertFalse(parked.is_alive())
+        self.assertEqual(sorted(scanned), ["a", "b", "c"])
+
+
+    def test_verdict_cache(self):
+        fuzzer = Fuzzer(None, None, response_filter=SimpleNamespace())
+        checked = []
+        tester = BaseScanner(None)
+        tester.check = lambda path, response: checked.append(path) or False
+        response = FakeResponse()
+
+        self.assertFalse(fuzzer.check(tester, "a", response))
+        self.assertFalse(fuzzer.check(tester, "b", response))
+        self.assertEqual(checked, ["a"])
+        self.assertEqual((fuzzer.verdict_cache.hits, fuzzer.verdict_cache.misses), (1, 1))
+
+        # 缓存不应持有 Scanner，目标扫描完后 Scanner 及其基准响应可以被回收
+        ref = weakref.ref(tester)
+        del tester
+        self.assertIsNone(ref())
+
+
+class TargetHandler(BaseHTTPRequestHandler):
+    """
+    测试目标，/admin 和 /login 返回 200，其他路径返回 404
+    """
+
+    def do_GET(self):
+        is_found = self.path in ("/admin", "/login")
+        body = f"<html>{self.path}</html>".encode() if is_found else b"not found"
+        self.send_response(200 if is_found else 404)
+        self.send_header("content-type", "text/html")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestAsyncFuzzer(TestCase):
+    def setUp(self):
+        self._options = dict(options)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), TargetHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.directory = tempfile.TemporaryDirectory()
+        wordlist = os.path.join(self.directory.name, "wordlist.txt")
+
+        with open(wordlist, "w") as fd:
+            fd.write("\n".join(["admin", "backup", "login", "test", "old"]))
+
+        options.update(
+            wordlists=[wordlist], exclude_texts=[], http_method="GET", headers={}, data=None,
+            proxies=[], max_retries=0, thread_count=3,
+        )
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.directory.cleanup()
+        options.clear()
+        options.update(self._options)
+
+    def run_fuzzer(self, callback):
+        async def run():
+            requester = AsyncRequester()
+            requester.set_url("http://127.0.0.1:{}/".format(self.server.server_address[1]))
+            fuzzer = AsyncFuzzer(
+                requester,
+                Dictionary(files=options["wordlists"]),
+                match_callbacks=(callback,),
+            )
+            fuzzer.set_base_path("")
+
+            try:
+                await fuzzer.start()
+            finally:
+                await requester.close()
+
+        asyncio.run(run())
+
+    def test_scan(self):
+        matches = []
+        self.run_fuzzer(lambda response: matches.append(response.path))
+
+        self.assertEqual(sorted(matches), ["admin", "login"])
+
+    def test_callback_error(self):
+        def callback(response):
+            raise SkipTargetInterrupt("Skipped")
+
+        # 回调中的异常由 start 抛出，交给控制器处理
+        with self.assertRaises(SkipTargetInterrupt):
+            self.run_fuzzer(callback)
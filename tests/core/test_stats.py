@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#  Author: Mauro Soria
+
+import json
+import os
+import tempfile
+
+from unittest import TestCase
+
+from lib.core.stats import Histogram, Stats
+
+
+class TestHistogram(TestCase):
+    def test_percentile(self):
+        histogram = Histogram()
+
+        for ms in range(1, 101):
+            histogram.add(ms / 1000)
+
+        self.assertEqual(histogram.count, 100)
+        self.assertAlmostEqual(histogram.total, 5.05)
+        self.assertEqual(histogram.max, 0.1)
+        # 分位数是桶内插值的估算值，误差不超过所在桶的宽度
+        self.assertAlmostEqual(histogram.percentile(0.5), 0.05, delta=0.02)
+        self.assertAlmostEqual(histogram.percentile(0.99), 0.1, delta=0.04)
+        self.assertLessEqual(histogram.percentile(1), histogram.max)
+        self.assertEqual(Histogram().percentile(0.5), 0, "Empty histogram has a percentile")
+
+
+class TestStats(TestCase):
+    def test_disabled(self):
+        stats = Stats()
+        stats.count("requests")
+
+        with stats.measure("ttfb"):
+            pass
+
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["phases"], {}, "Disabled statistics record timings")
+        self.assertEqual(snapshot["counters"], {}, "Disabled statistics record counters")
+
+    def test_summary(self):
+        stats = Stats()
+        stats.enable()
+        stats.count("requests", 10)
+        stats.count("connections", 2)
+        stats.count("dns_cache_hits", 3)
+        stats.count("dns_cache_misses", 1)
+        stats.record("report", 0.002)
+        stats.record("ttfb", 0.01)
+
+        with self.assertRaises(ValueError):
+            with stats.measure("body"):
+                raise ValueError
+
+        snapshot = stats.snapshot()
+        self.assertEqual(list(snapshot["phases"]), ["ttfb", "report"], "Phases are not ordered")
+        self.assertEqual(
+            snapshot["ratios"], {"connection_reuse": 0.8, "dns_cache_hit_rate": 0.75}
+        )
+
+        summary = stats.summary()
+        self.assertEqual(summary["Requests"], "10")
+        self.assertEqual(summary["Connection reuse"], "80.0%")
+        self.assertNotIn("body", summary, "Failed operations are timed")
+
+    def test_snapshots(self):
+        stats = Stats()
+        stats.enable()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stats.json")
+            stats.start_snapshots(path, 60)
+            stats.count("requests")
+            stats.stop_snapshots()
+
+            with open(path) as fd:
+                self.assertEqual(json.load(fd)["counters"], {"requests": 1})
+
+            self.assertEqual(os.listdir(directory), ["stats.json"])
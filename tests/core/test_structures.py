@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#  Author: Mauro Soria
+
+from unittest import TestCase
+
+from lib.core.structures import DigestSet, LRUCache
+
+
+class TestLRUCache(TestCase):
+    def test_lru_cache(self):
+        cache = LRUCache(2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+
+        self.assertIsNone(cache.get("b"), "Least recently used entry isn't evicted")
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+
+class TestDigestSet(TestCase):
+    def test_digest_set(self):
+        digests = DigestSet(capacity=4)
+        paths = [f"path{i}" for i in range(100)]
+
+        self.assertTrue(all(digests.add(path) for path in paths))
+        # 超过负载因子时扩容，已有元素仍然可以找到
+        self.assertFalse(any(digests.add(path) for path in paths))
+        self.assertEqual(len(digests), 100)
+        self.assertIn("path42", digests)
+        self.assertNotIn("path100", digests)
+        self.assertTrue(digests.add("\udce9"))
@@ -17,17 +17,23 @@
 #  Author: Mauro Soria
 
 import json
+import os
+import sqlite3
 
 from unittest import TestCase
+from xml.etree import ElementTree as ET
 
 from lib.connection.requester import Requester
 from lib.core.settings import DUMMY_URL, DUMMY_WORD, NEW_LINE, TMP_PATH
 from lib.reports.csv_report import CSVReport
 from lib.reports.json_report import JSONReport
+from lib.reports.jsonl_report import JSONLinesReport
 from lib.reports.markdown_report import MarkdownReport
 from lib.reports.plain_text_report import PlainTextReport
 from lib.reports.simple_report import SimpleReport
+from lib.reports.sqlite_report import SQLiteReport
 from lib.reports.xml_report import XMLReport
+from lib.utils.file import FileUtils
 
 requester = Requester()
 test_entries = [requester.request(DUMMY_URL + DUMMY_WORD)]
@@ -51,6 +57,14 @@ class TestReports(TestCase):
         }]
         self.assertEqual(json.loads(output)["results"], expected_results, "JSON report is unintended")
 
+    def test_jsonl_report(self):
+        output = JSONLinesReport(TMP_PATH).generate(test_entries * 2)
+        records = [json.loads(line) for line in output.splitlines()]
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]["url"], DUMMY_URL + DUMMY_WORD)
+        self.assertEqual(records[0]["status"], 404)
+        self.assertEqual(len(records[0]["body-sha256"]), 64)
+
     def test_markdown_report(self):
         expected_table = "URL | Status | Size | Content Type | Redirection" + NEW_LINE
         expected_table += "----|--------|------|--------------|------------" + NEW_LINE
@@ -71,3 +85,53 @@ class TestReports(TestCase):
         expected_result += "\t\t<contentType>text/html</contentType>\n"
         expected_result += "\t</target>"
         self.assertTrue(expected_result in XMLReport(TMP_PATH).generate(test_entries))
+
+    def test_streaming_reports(self):
+        FileUtils.create_dir(TMP_PATH)
+        json_file = FileUtils.build_path(TMP_PATH, "report.json")
+        xml_file = FileUtils.build_path(TMP_PATH, "report.xml")
+
+        for report in (JSONReport(json_file), XMLReport(xml_file)):
+            # 恢复会话时已有的结果和之后逐个加入的结果都写入同一份报告
+            report.open(test_entries)
+            report.add(test_entries[0])
+            report.add(test_entries[0])
+            report.close()
+
+        with open(json_file) as fd:
+            self.assertEqual(len(json.load(fd)["results"]), 3)
+
+        self.assertEqual(len(ET.parse(xml_file).getroot()), 3)
+
+    def test_failed_report(self):
+        class FailingReport(PlainTextReport):
+            def write(self, entries):
+                raise OSError("No space left on device")
+
+        report = FailingReport(FileUtils.build_path(TMP_PATH, "report.txt"))
+        report.open(test_entries)
+        report._thread.join()
+        # 写入失败后新的结果直接丢弃，队列不会在剩下的扫描中一直增长
+        report.add(test_entries[0])
+        self.assertTrue(report._queue.empty())
+        report.close()
+
+    def test_sqlite_report(self):
+        FileUtils.create_dir(TMP_PATH)
+        output_file = FileUtils.build_path(TMP_PATH, "report.sqlite")
+
+        if FileUtils.exists(output_file):
+            os.remove(output_file)
+
+        for _ in range(2):
+            report = SQLiteReport(output_file)
+            report.open(test_entries)
+            # 同一次扫描中重复的结果只保存一次
+            report.add(test_entries[0])
+            report.close()
+
+        conn = sqlite3.connect(output_file)
+        rows = conn.execute(
+            "SELECT scan_id, host, status FROM result JOIN target ON target.id = result.target_id"
+        ).fetchall()
+        self.assertEqual(rows, [(1, "example.com", 404), (2, "example.com", 404)])
@@ -18,7 +18,7 @@
 
 from unittest import TestCase
 
-from lib.utils.diff import DynamicContentParser, generate_matching_regex
+from lib.utils.diff import DynamicContentParser, FastDynamicContentParser, generate_matching_regex
 
 
 class TestDiff(TestCase):
@@ -28,3 +28,34 @@ class TestDiff(TestCase):
     def test_dynamic_content_parser(self):
         self.assertEqual(DynamicContentParser("a b c", "a b d")._static_patterns, ["  a", "  b"], "Static patterns are not right")
         self.assertTrue(DynamicContentParser("a b c", "a b d").compare_to("a b ef"))
+
+    def test_fast_dynamic_content_parser(self):
+        self.assertEqual(FastDynamicContentParser("a b c", "a b d")._static_patterns, ["a", "b"], "Static patterns are not right")
+        self.assertTrue(FastDynamicContentParser("a b c", "a b d").compare_to("a b ef"))
+        self.assertFalse(FastDynamicContentParser("a b c", "a b d").compare_to("a x ef"))
+
+    def test_fast_dynamic_content_parser_decisions(self):
+        # Generated wildcard pages with a reflected path, a token and a timestamp, compared
+        # against other wildcard pages, modified templates and unrelated pages. This is a
+        # synthetic sample, not a corpus of real pages
+        template = "<html><title>404 Not Found</title><p>The URL /{} was not found. token={} {}</p>{}</html>"
+        body = " ".join(f"word{i}" for i in range(200))
+        first = template.format("abcdef", "a1b2c3", "1700000000.123", body)
+        second = template.format("ghijkl", "d4e5f6", "1700000001.456", body)
+        contents = [
+            first,
+            template.format("admin", "g7h8i9", "1700000002.789", body),
+            template.format("a/b/c.php", "x", "1", body),
+            template.format("admin", "g7h8i9", "1700000002.789", body).replace("Not Found", "Forbidden"),
+            template.format("admin", "g7h8i9", "1700000002.789", body + " extra"),
+            template.format("admin", "g7h8i9", "1700000002.789", body[:500]),
+            template.format("admin", "g7h8i9", "1700000002.789", body.replace("word1 ", "")),
+            " ".join(f"other{i}" for i in range(200)),
+            "",
+        ]
+
+        parser = DynamicContentParser(first, second)
+        fast_parser = FastDynamicContentParser(first, second)
+
+        for content in contents:
+            self.assertEqual(parser.compare_to(content), fast_parser.compare_to(content), content[:80])
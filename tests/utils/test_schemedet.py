@@ -15,10 +15,17 @@
 #
 #  Author: Mauro Soria
 
+import os
+import socket
+import tempfile
+import threading
+import time
+
 from unittest import TestCase
+from unittest.mock import patch
 
-from lib.core.settings import DUMMY_DOMAIN
-from lib.utils.schemedet import detect_scheme
+from lib.core.settings import DUMMY_DOMAIN, UNKNOWN
+from lib.utils.schemedet import detect_scheme, detect_schemes, load_scheme_cache, probe_scheme
 
 
 class TestSchemedet(TestCase):
@@ -26,3 +33,77 @@ class TestSchemedet(TestCase):
         self.assertEqual(detect_scheme(DUMMY_DOMAIN, 443), "https", "Incorrect scheme detected")
         self.assertEqual(detect_scheme(DUMMY_DOMAIN, 80), "http", "Incorrect scheme detected")
         self.assertEqual(detect_scheme(DUMMY_DOMAIN, 1234), "http", "Incorrect scheme detected")
+
+
+class TestProbeScheme(TestCase):
+    def serve(self, response):
+        """
+        启动只处理一个连接的本地服务器，收到数据后返回 response（为 None 时不响应）
+        """
+        server = socket.socket()
+        server.bind(("127.0.0.1", 0))
+        server.listen(1)
+        self.addCleanup(server.close)
+
+        def handle():
+            conn, _ = server.accept()
+
+            with conn:
+                conn.recv(4096)
+
+                if response is not None:
+                    conn.sendall(response)
+                else:
+                    time.sleep(1)
+
+        threading.Thread(target=handle, daemon=True).start()
+        return server.getsockname()[1]
+
+    def test_probe_scheme(self):
+        port = self.serve(b"\x15\x03\x01\x00\x02\x02\x46")
+        self.assertEqual(probe_scheme("127.0.0.1", port, 0.5), "https")
+
+        port = self.serve(b"HTTP/1.1 400 Bad Request\r\n\r\n")
+        self.assertEqual(probe_scheme("127.0.0.1", port, 0.5), "http")
+
+        # 没有响应时无法判断是 HTTP 还是较慢的 TLS 服务器
+        port = self.serve(None)
+        self.assertEqual(probe_scheme("127.0.0.1", port, 0.2), UNKNOWN)
+
+    def test_unreachable(self):
+        server = socket.socket()
+        server.bind(("127.0.0.1", 0))
+        port = server.getsockname()[1]
+        server.close()
+
+        self.assertIsNone(probe_scheme("127.0.0.1", port, 0.5))
+
+    def test_detect_schemes_cache(self):
+        https_port = self.serve(b"\x16\x03\x03\x00\x00")
+        server = socket.socket()
+        server.bind(("127.0.0.1", 0))
+        closed_port = server.getsockname()[1]
+        server.close()
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache_file = os.path.join(directory, "schemes.json")
+            addresses = [("127.0.0.1", https_port), ("127.0.0.1", closed_port)]
+
+            self.assertEqual(
+                detect_schemes(addresses, 2, cache_file),
+                {("127.0.0.1", https_port): "https", ("127.0.0.1", closed_port): None},
+            )
+            # 无法连接的地址不缓存
+            self.assertEqual(list(load_scheme_cache(cache_file)), [f"127.0.0.1:{https_port}"])
+            # 无法判断协议的地址不缓存
+            with patch("lib.utils.schemedet.probe_scheme", return_value=UNKNOWN):
+                self.assertEqual(
+                    detect_schemes([("127.0.0.1", 1)], 1, cache_file),
+                    {("127.0.0.1", 1): UNKNOWN},
+                )
+            self.assertEqual(list(load_scheme_cache(cache_file)), [f"127.0.0.1:{https_port}"])
+            # 服务器只处理一个连接，第二次检测的结果来自缓存
+            self.assertEqual(
+                detect_schemes(addresses[:1], 2, cache_file),
+                {("127.0.0.1", https_port): "https"},
+            )
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+#  Author: Mauro Soria
+
+import io
+import sys
+import time
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from lib.core.settings import PROGRESS_REFRESH_INTERVAL
+from lib.view.terminal import Output
+
+
+class TestOutput(TestCase):
+    def test_buffer(self):
+        with patch("lib.view.terminal.OUTPUT_BUFFER_SIZE", 3):
+            output = Output()
+
+        for i in range(5):
+            output.new_line(f"line {i}")
+
+        output.flush()
+        self.assertEqual(output.buffer, "line 2\nline 3\nline 4\n")
+        # 已经移出缓冲区的行被跳过
+        self.assertEqual(output.read_buffer(0), ("line 2\nline 3\nline 4\n", 5))
+        self.assertEqual(output.read_buffer(4), ("line 4\n", 5))
+        self.assertEqual(output.read_buffer(5), ("", 5))
+
+        output.buffer = "restored\n"
+        self.assertEqual(output.read_buffer(0), ("restored\n", 1))
+
+    def test_progress(self):
+        output = Output()
+        stdout = io.StringIO()
+
+        with patch.object(sys, "stdout", stdout):
+            output.new_line("found")
+
+            # 扫描线程只记录进度，渲染线程按固定间隔只绘制最新的进度
+            for index in range(1, 1001):
+                output.last_path(index, 1000, 1, 1, 0, 0)
+
+            time.sleep(PROGRESS_REFRESH_INTERVAL * 3)
+            output.flush()
+
+        text = stdout.getvalue()
+        self.assertTrue(text.startswith("found\n"))
+        self.assertIn("1000/1000", text)
+        self.assertLess(text.count("/1000"), 5)